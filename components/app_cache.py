@@ -0,0 +1,15 @@
+import os
+import sys
+from pathlib import Path
+
+def cache_dir(*parts):
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or str(Path.home() / 'AppData' / 'Local')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or str(Path.home() / '.cache')
+    path = os.path.join(base, 'automate', *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def cache_path(name):
+    return os.path.join(cache_dir(), name)
@@ -1,15 +1,129 @@
 import sys
 import os
+import re
 from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout, 
-                             QLabel, QLineEdit, QPushButton, QCheckBox, 
-                             QScrollArea, QFrame, QGridLayout, QFileDialog, QMessageBox)
-from PyQt5.QtCore import Qt
+                             QLabel, QLineEdit, QPushButton, QTreeView, QStyledItemDelegate, QCheckBox,
+                             QScrollArea, QFrame, QGridLayout, QFileDialog, QMessageBox, QProgressBar, QListWidget)
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QTimer, QEvent, pyqtSignal
+
+from components.media_tags import MetadataCache, MetadataWorker
+from components.rename_planner import plan_renames, RenameJournal, RenameExecutor, interrupted_journals, recover_journal
+from components.rename_template import RenameTemplate, RenameColumns, TemplateError
+from components.tree_walk import compile_globs, walk_files, TreeWalkWorker
+
+class RenamePreviewModel(QAbstractListModel):
+    checkedCountChanged = pyqtSignal(int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.old_names = []
+        self.new_names = []
+        self.checked = bytearray()
+        self.checked_count = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.old_names)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if role == Qt.DisplayRole:
+            return f"{self.old_names[row]}  →  {self.new_names[row]}"
+        if role == Qt.CheckStateRole:
+            return Qt.Checked if self.checked[row] else Qt.Unchecked
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.CheckStateRole or not index.isValid():
+            return False
+        row = index.row()
+        state = 1 if value == Qt.Checked else 0
+        if self.checked[row] != state:
+            self.checked[row] = state
+            self.checked_count += 1 if state else -1
+            self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+            self.checkedCountChanged.emit(self.checked_count)
+        return True
+
+    def toggle(self, index):
+        self.setData(index, Qt.Unchecked if self.checked[index.row()] else Qt.Checked, Qt.CheckStateRole)
+
+    def set_listing(self, old_names, new_names):
+        self.beginResetModel()
+        self.old_names = list(old_names)
+        self.new_names = new_names
+        self.checked = bytearray(b'\x01') * len(old_names)
+        self.checked_count = len(old_names)
+        self.endResetModel()
+        self.checkedCountChanged.emit(self.checked_count)
+
+    def set_new_names(self, new_names):
+        # Same files, new preview: keep the check marks and repaint in place
+        self.new_names = new_names
+        if new_names:
+            self.dataChanged.emit(self.index(0), self.index(len(new_names) - 1), [Qt.DisplayRole])
+
+    def append_rows(self, old_names, new_names):
+        first = len(self.old_names)
+        self.beginInsertRows(QModelIndex(), first, first + len(old_names) - 1)
+        self.old_names.extend(old_names)
+        self.new_names.extend(new_names)
+        self.checked.extend(b'\x01' * len(old_names))
+        self.checked_count += len(old_names)
+        self.endInsertRows()
+        self.checkedCountChanged.emit(self.checked_count)
+
+    def update_rows(self, rows, old_names, new_names):
+        for row, old, new in zip(rows, old_names, new_names):
+            self.old_names[row] = old
+            self.new_names[row] = new
+        if rows:
+            self.dataChanged.emit(self.index(min(rows)), self.index(max(rows)), [Qt.DisplayRole])
+
+class CheckToggleDelegate(QStyledItemDelegate):
+    # Toggles the check mark itself so the model can keep Qt's C++ flags(); a Python flags()
+    # override is called once per row on every relayout, which dominates with 100k rows.
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            if event.pos().x() - option.rect.left() < 32:
+                model.toggle(index)
+                return True
+        elif event.type() == QEvent.KeyPress and event.key() == Qt.Key_Space:
+            model.toggle(index)
+            return True
+        return False
 
 class BatchRenameUI(QWidget):
+    PREVIEW_DEBOUNCE_MS = 120
+    MAX_FAILURES_SHOWN = 1000
+    PATTERN_HINT = ("{n} {n:4} {name} {ext} {parent} {date:%Y%m%d} {taken} {exif:Model} {id3:artist} {1}"
+                    "  •  transforms: |upper |lower |title")
+
     def __init__(self):
         super().__init__()
-        self.all_rows = [] 
+        self.preview_model = RenamePreviewModel(self)
+        # Folder listing reused across keystrokes until the folder, its mtime or the walk settings change.
+        # Names are relative to the folder; listing_positions holds each file's index within its own subfolder.
+        self.listing_key = None
+        self.listing = []
+        # Bumped whenever the listing is replaced, so the preview knows when its rows are still the same files
+        self.listing_generation = 0
+        self.preview_generation = None
+        self.listing_parts = ([], [], [])
+        self.listing_positions = []
+        self.walker = None
+        self.numbers_key = None
+        self.numbers = []
+        self.listing_stats = None
+        self.template = None
+        self.preview_error = ""
+        self.metadata = MetadataCache()
+        self.metadata_worker = None
+        self.rename_executor = None
+        self.rename_rows = {}
         self.initUI()
+        QTimer.singleShot(0, self.recover_interrupted_renames)
 
     def initUI(self):
         self.setWindowTitle('Batch Rename Files')
@@ -77,10 +191,32 @@ class BatchRenameUI(QWidget):
         folder_hbox.addWidget(self.browse_btn)
         left_vbox.addLayout(folder_hbox)
 
+        walk_hbox = QHBoxLayout()
+        self.recursive_cb = QCheckBox("Include subfolders")
+        self.per_folder_cb = QCheckBox("Number each folder from the start")
+        for cb in (self.recursive_cb, self.per_folder_cb):
+            cb.setStyleSheet("QCheckBox { border: none; color: #475569; font-size: 11px; }")
+            walk_hbox.addWidget(cb)
+        walk_hbox.addStretch()
+        left_vbox.addLayout(walk_hbox)
+
+        filter_grid = QGridLayout()
+        filter_grid.addWidget(QLabel("Include"), 0, 0)
+        filter_grid.addWidget(QLabel("Exclude"), 0, 1)
+        self.include_input = QLineEdit(placeholderText="e.g. *.jpg; *.png")
+        self.exclude_input = QLineEdit(placeholderText="e.g. Thumbs; *.tmp")
+        filter_grid.addWidget(self.include_input, 1, 0)
+        filter_grid.addWidget(self.exclude_input, 1, 1)
+        left_vbox.addLayout(filter_grid)
+
         left_vbox.addWidget(QLabel("Rename Pattern (optional)"))
         self.pattern_input = QLineEdit()
-        self.pattern_input.setPlaceholderText("e.g., Photo_{n}")
+        self.pattern_input.setPlaceholderText("e.g., Photo_{n} or {taken:%Y%m%d}_{name|lower}")
         left_vbox.addWidget(self.pattern_input)
+        self.pattern_hint = QLabel(self.PATTERN_HINT)
+        self.pattern_hint.setWordWrap(True)
+        self.pattern_hint.setStyleSheet("color: #94a3b8; font-weight: normal; font-size: 10px;")
+        left_vbox.addWidget(self.pattern_hint)
 
         num_grid = QGridLayout()
         num_grid.addWidget(QLabel("Start Number"), 0, 0)
@@ -96,6 +232,9 @@ class BatchRenameUI(QWidget):
         self.replace_input = QLineEdit(placeholderText="Replace with...")
         left_vbox.addWidget(self.find_input)
         left_vbox.addWidget(self.replace_input)
+        self.regex_cb = QCheckBox("Regular expression ({1}, {2}… in the pattern use its groups)")
+        self.regex_cb.setStyleSheet("QCheckBox { border: none; color: #475569; font-size: 11px; }")
+        left_vbox.addWidget(self.regex_cb)
 
         fix_grid = QGridLayout()
         fix_grid.addWidget(QLabel("Prefix"), 0, 0)
@@ -141,6 +280,17 @@ class BatchRenameUI(QWidget):
         """)
         left_vbox.addWidget(self.apply_btn)
 
+        self.rename_progress = QProgressBar()
+        self.rename_progress.setFixedHeight(6)
+        self.rename_progress.setTextVisible(False)
+        self.rename_progress.setStyleSheet("QProgressBar { background: #F1F5F9; border: none; border-radius: 3px; } QProgressBar::chunk { background: #2563EB; border-radius: 3px; }")
+        self.rename_progress.hide()
+        self.rename_status = QLabel("")
+        self.rename_status.setStyleSheet("font-size: 11px; color: #64748B; font-weight: normal; border: none;")
+        self.rename_status.hide()
+        left_vbox.addWidget(self.rename_progress)
+        left_vbox.addWidget(self.rename_status)
+
         # --- RIGHT COLUMN ---
         right_panel = QVBoxLayout()
         right_header = QHBoxLayout()
@@ -148,17 +298,34 @@ class BatchRenameUI(QWidget):
         right_header.addStretch()
         right_panel.addLayout(right_header)
 
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setStyleSheet(self.scrollbar_style + "border: 1px solid #e2e8f0; border-radius: 8px; background-color: white;")
-        
-        self.file_list_widget = QWidget()
-        self.file_list_layout = QVBoxLayout(self.file_list_widget)
-        self.file_list_layout.setContentsMargins(0, 0, 0, 0)
-        self.file_list_layout.setSpacing(0)
-        
-        scroll.setWidget(self.file_list_widget)
-        right_panel.addWidget(scroll)
+        self.file_list = QTreeView()
+        self.file_list.setModel(self.preview_model)
+        self.file_list.setItemDelegate(CheckToggleDelegate(self.file_list))
+        self.file_list.setUniformRowHeights(True)
+        self.file_list.setRootIsDecorated(False)
+        self.file_list.setHeaderHidden(True)
+        self.file_list.setMinimumHeight(400)
+        self.file_list.setStyleSheet(self.scrollbar_style + """
+            QTreeView { border: 1px solid #e2e8f0; border-radius: 8px; background-color: white; color: #475569; font-size: 12px; outline: none; }
+            QTreeView::item { padding: 10px; border-bottom: 1px solid #f1f5f9; }
+            QTreeView::item:selected { background: #f1f5f9; color: #475569; }
+        """)
+        right_panel.addWidget(self.file_list)
+
+        self.failures_frame = QFrame()
+        self.failures_frame.setStyleSheet("QFrame { background-color: #fef2f2; border: 1px solid #fecaca; border-radius: 8px; }")
+        failures_vbox = QVBoxLayout(self.failures_frame)
+        failures_vbox.setContentsMargins(12, 10, 12, 10)
+        self.failures_title = QLabel("")
+        self.failures_title.setStyleSheet("font-size: 12px; font-weight: bold; color: #b91c1c; border: none;")
+        self.failures_list = QListWidget()
+        self.failures_list.setUniformItemSizes(True)
+        self.failures_list.setMaximumHeight(160)
+        self.failures_list.setStyleSheet(self.scrollbar_style + "QListWidget { border: none; background: transparent; color: #7f1d1d; font-size: 11px; }")
+        failures_vbox.addWidget(self.failures_title)
+        failures_vbox.addWidget(self.failures_list)
+        self.failures_frame.hide()
+        right_panel.addWidget(self.failures_frame)
 
         content_layout.addWidget(left_panel, 1)
         content_layout.addLayout(right_panel, 2)
@@ -167,79 +334,401 @@ class BatchRenameUI(QWidget):
         # --- LOGIC CONNECTIONS ---
         self.browse_btn.clicked.connect(self.select_directory)
         self.apply_btn.clicked.connect(self.run_rename)
-        
-        settings_widgets = [self.pattern_input, self.find_input, self.replace_input, 
-                            self.prefix_input, self.suffix_input, self.start_num, self.padding_num]
+        self.preview_model.checkedCountChanged.connect(lambda count: self.selected_lbl.setText(str(count)))
+
+        self.preview_timer = QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.setInterval(self.PREVIEW_DEBOUNCE_MS)
+        self.preview_timer.timeout.connect(self.refresh_preview)
+        settings_widgets = [self.folder_input, self.pattern_input, self.find_input, self.replace_input, 
+                            self.prefix_input, self.suffix_input, self.start_num, self.padding_num,
+                            self.include_input, self.exclude_input]
         for w in settings_widgets:
-            w.textChanged.connect(self.refresh_preview)
+            w.textChanged.connect(self.preview_timer.start)
+        for cb in (self.regex_cb, self.recursive_cb, self.per_folder_cb):
+            cb.toggled.connect(self.preview_timer.start)
+
+        app = QApplication.instance()
+        if app:
+            app.aboutToQuit.connect(self.stop_workers)
 
     def select_directory(self):
         dir_path = QFileDialog.getExistingDirectory(self, "Select Folder")
         if dir_path:
             self.folder_input.setText(dir_path)
+            self.preview_timer.stop()
+            # Picking a folder again rescans it, including changes deeper than its own mtime shows
+            self.listing_key = None
             self.refresh_preview()
 
-    def refresh_preview(self):
-        for i in reversed(range(self.file_list_layout.count())): 
-            widget = self.file_list_layout.itemAt(i).widget()
-            if widget: widget.setParent(None)
-        self.all_rows = []
+    def listing_settings(self, path):
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        return (path, mtime, self.recursive_cb.isChecked(), self.include_input.text(), self.exclude_input.text())
 
-        path = self.folder_input.text()
-        if not os.path.isdir(path): return
+    def load_listing(self, path):
+        key = self.listing_settings(path)
+        if key is None:
+            return None
+        if key != self.listing_key:
+            self.stop_walk()
+            _, _, recursive, include, exclude = key
+            include, exclude = compile_globs(include), compile_globs(exclude)
+            self.listing_key = key
+            self.listing_generation += 1
+            self.listing_stats = []
+            if recursive:
+                # The preview fills in batch by batch as the walker streams folders in
+                self.listing = []
+                self.listing_positions = []
+                self.walker = TreeWalkWorker(path, include, exclude, self)
+                self.walker.batch_ready.connect(self.on_walk_batch)
+                self.walker.finished.connect(self.on_walk_finished)
+                self.walker.start()
+            else:
+                _, self.listing = next(walk_files(path, False, include, exclude), ("", []))
+                self.listing_positions = range(len(self.listing))
+            self.listing_parts = self.split_names(self.listing)
+        return self.listing
+
+    def on_walk_batch(self, names, positions):
+        if self.sender() is not self.walker:
+            return
+        start, padding = self.numbering()
+        first = len(self.listing)
+        parts = self.split_names(names)
+        for column, values in zip(self.listing_parts, parts):
+            column.extend(values)
+        self.listing_positions.extend(positions)
+        if self.per_folder_cb.isChecked():
+            numbers = [start + i for i in positions]
+        else:
+            numbers = range(start + first, start + first + len(names))
+        try:
+            new_names = self.calculate_new_names(names, numbers, padding, parts)
+        except (TemplateError, re.error):
+            new_names = list(names)
+        self.listing.extend(names)
+        self.preview_model.append_rows(names, new_names)
+        self.total_lbl.setText(f"{len(self.listing):,} (scanning…)")
+
+    def on_walk_finished(self):
+        walker = self.sender()
+        walker.deleteLater()
+        if walker is self.walker:
+            self.walker = None
+            self.refresh_preview()
 
-        files = [f for f in os.listdir(path) if os.path.isfile(os.path.join(path, f))]
-        self.total_lbl.setText(str(len(files)))
-        self.selected_lbl.setText(str(len(files)))
+    def stop_walk(self):
+        if self.walker is not None:
+            self.walker.requestInterruption()
+            self.walker = None
 
+    def stop_workers(self):
+        for worker in self.findChildren(TreeWalkWorker) + [self.metadata_worker]:
+            if worker is not None and worker.isRunning():
+                worker.requestInterruption()
+                worker.wait()
+        if self.rename_executor is not None:
+            # Stop at the next consistent point; the journal covers what already happened
+            self.rename_executor.cancel()
+            self.rename_executor.wait()
+            if self.rename_executor.journal:
+                self.rename_executor.journal.commit()
+
+    def stat_files(self, folder, names):
+        stats = []
+        for name in names:
+            try:
+                stats.append(os.stat(os.path.join(folder, name)))
+            except OSError:
+                stats.append(None)
+        return stats
+
+    def get_listing_stats(self):
+        # Grows with the listing while a walk is still streaming rows in
+        done = len(self.listing_stats)
+        if done < len(self.listing):
+            self.listing_stats.extend(self.stat_files(self.listing_key[0], self.listing[done:]))
+        return self.listing_stats
+
+    def numbering(self):
         try:
-            start = int(self.start_num.text())
-            padding = int(self.padding_num.text())
+            return int(self.start_num.text()), int(self.padding_num.text())
         except ValueError:
-            start, padding = 1, 1
+            return 1, 1
+
+    def refresh_preview(self):
+        if self.rename_executor is not None:
+            # The listing is frozen while a rename runs; completion refreshes it
+            return
+        path = self.folder_input.text()
+        files = self.load_listing(path) if os.path.isdir(path) else None
+        if files is None:
+            self.stop_walk()
+            self.listing_key = None
+            self.preview_generation = None
+            self.preview_model.set_listing([], [])
+            self.total_lbl.setText("0")
+            self.update_pattern_status()
+            return
+        start, padding = self.numbering()
+        self.preview_error = ""
+        try:
+            new_names = self.calculate_new_names(files, self.listing_numbers(start), padding,
+                                                 self.listing_parts, self.get_listing_stats)
+        except (TemplateError, re.error) as e:
+            self.preview_error = str(e)
+            new_names = list(files)
+        if self.preview_generation == self.listing_generation:
+            self.preview_model.set_new_names(new_names)
+        else:
+            self.preview_generation = self.listing_generation
+            self.preview_model.set_listing(files, new_names)
+        if self.walker is not None:
+            self.total_lbl.setText(f"{len(files):,} (scanning…)")
+        else:
+            self.total_lbl.setText(str(len(files)))
+            if not self.preview_error and self.template and self.template.metadata_kinds:
+                self.load_metadata(path, files)
+        self.update_pattern_status()
 
-        for i, filename in enumerate(files):
-            new_name = self.calculate_new_name(filename, i + start, padding)
-            self.add_file_row(filename, new_name)
-        self.file_list_layout.addStretch()
+    def listing_numbers(self, start):
+        if self.per_folder_cb.isChecked():
+            return [start + i for i in self.listing_positions]
+        return range(start, start + len(self.listing))
 
-    def calculate_new_name(self, old_name, index, padding):
-        name_part, ext = os.path.splitext(old_name)
+    def compile_template(self):
         pattern = self.pattern_input.text()
-        res = pattern.replace("{n}", str(index).zfill(padding)) if "{n}" in pattern else name_part
+        if self.template is None or self.template.pattern != pattern:
+            self.template = RenameTemplate(pattern) if pattern else None
+        return self.template
+
+    def load_metadata(self, folder, files):
+        if self.metadata_worker and self.metadata_worker.isRunning():
+            return
+        jobs = self.metadata.missing(zip((os.path.join(folder, f) for f in files), self.get_listing_stats()),
+                                     self.template.metadata_kinds)
+        if not jobs:
+            return
+        self.metadata_worker = MetadataWorker(self.metadata, jobs)
+        self.metadata_worker.progress.connect(self.on_metadata_progress)
+        self.metadata_worker.finished.connect(self.on_metadata_loaded)
+        self.metadata_worker.start()
+
+    def on_metadata_progress(self, done, total):
+        if self.sender() is self.metadata_worker:
+            self.pattern_hint.setText(f"Reading tags… {done:,} of {total:,}")
+
+    def on_metadata_loaded(self):
+        worker = self.sender()
+        worker.deleteLater()
+        if worker is self.metadata_worker:
+            self.metadata_worker = None
+            self.refresh_preview()
+
+    def update_pattern_status(self):
+        loading = self.walker is not None or (self.metadata_worker is not None and self.metadata_worker.isRunning())
+        if self.preview_error:
+            self.pattern_hint.setText(self.preview_error)
+            self.pattern_hint.setStyleSheet("color: #dc2626; font-weight: normal; font-size: 10px;")
+        elif not loading:
+            self.pattern_hint.setText(self.PATTERN_HINT)
+            self.pattern_hint.setStyleSheet("color: #94a3b8; font-weight: normal; font-size: 10px;")
+        # Names are not final until the walk is done, the template parses and every tag it uses has been read
+        self.apply_btn.setEnabled(not self.preview_error and not loading)
+
+    @staticmethod
+    def split_names(names):
+        # (subfolder, stem, extension) per relative name; patterns only ever apply to the file's own name
+        splitext, sep = os.path.splitext, os.sep
+        paths = [n.rpartition(sep) for n in names]
+        parts = [splitext(p[2]) for p in paths]
+        return [p[0] for p in paths], [p[0] for p in parts], [p[1] for p in parts]
+
+    def calculate_new_names(self, old_names, numbers, padding, parts=None, stats=None):
+        # One pass per step over the whole listing; settings are read once, not once per file
+        dirs, stems, exts = parts or self.split_names(old_names)
+        folder = self.folder_input.text()
         find_val = self.find_input.text()
-        if find_val:
-            res = res.replace(find_val, self.replace_input.text())
-        return f"{self.prefix_input.text()}{res}{self.suffix_input.text()}{ext}"
-
-    def add_file_row(self, old_name, new_name):
-        row = QFrame()
-        row.setStyleSheet("border-bottom: 1px solid #f1f5f9; padding: 10px; border-radius: 0px; background: white;")
-        row_layout = QHBoxLayout(row)
-        cb = QCheckBox()
-        cb.setChecked(True)
-        name_lbl = QLabel(f"{old_name}  →  {new_name}")
-        name_lbl.setStyleSheet("color: #475569; font-size: 12px; border: none;")
-        row_layout.addWidget(cb)
-        row_layout.addWidget(name_lbl)
-        row_layout.addStretch()
-        self.file_list_layout.addWidget(row)
-        self.all_rows.append((cb, old_name, new_name))
+        replace_val = self.replace_input.text()
+        prefix = self.prefix_input.text()
+        suffix = self.suffix_input.text()
+        regex = re.compile(find_val) if find_val and self.regex_cb.isChecked() else None
+        template = self.compile_template()
+        # A pattern without any {field} leaves the original names in place, as it always has
+        if template is not None and template.fields:
+            cols = RenameColumns(folder, old_names, stems, exts, numbers, padding,
+                                 stats or (lambda: self.stat_files(folder, old_names)),
+                                 self.metadata, regex, self.number_strings)
+            bodies = template.render(cols)
+            if template.uses_ext:
+                exts = [""] * len(bodies)
+        else:
+            bodies = stems
+        if regex is not None:
+            bodies = [regex.sub(replace_val, b) for b in bodies]
+        elif find_val:
+            bodies = [b.replace(find_val, replace_val) for b in bodies]
+        if prefix or suffix:
+            names = [f"{prefix}{b}{suffix}{e}" for b, e in zip(bodies, exts)]
+        else:
+            names = [b + e for b, e in zip(bodies, exts)]
+        if any(dirs):
+            sep = os.sep
+            return [f"{d}{sep}{n}" if d else n for d, n in zip(dirs, names)]
+        return names
+
+    def number_strings(self, numbers, padding):
+        key = (numbers, padding) if isinstance(numbers, range) else None
+        if key is None or key != self.numbers_key:
+            strings = [str(i).zfill(padding) for i in numbers]
+            if key is None:
+                return strings
+            self.numbers_key, self.numbers = key, strings
+        return self.numbers
 
     def run_rename(self):
+        if self.rename_executor is not None:
+            self.rename_executor.cancel()
+            self.apply_btn.setEnabled(False)
+            self.rename_status.setText("Cancelling…")
+            return
         path = self.folder_input.text()
-        count = 0
-        for cb, old, new in self.all_rows:
-            if cb.isChecked() and old != new:
-                try:
-                    os.rename(os.path.join(path, old), os.path.join(path, new))
-                    count += 1
-                except Exception as e:
-                    print(f"Error: {e}")
-        
-        QMessageBox.information(self, "Rename Complete", f"Successfully renamed {count} files.")
+        model = self.preview_model
+        rows = {}
+        for i, (old, new) in enumerate(zip(model.old_names, model.new_names)):
+            if model.checked[i] and old != new:
+                rows[os.path.join(path, old)] = i
+        plan = plan_renames((src, os.path.join(path, model.new_names[i])) for src, i in rows.items())
+        journal = RenameJournal()
+        try:
+            journal.begin(plan)
+        except OSError:
+            journal = None
+        self.rename_rows = rows
+        self.failures_frame.hide()
+        self.apply_btn.setText("Cancel")
+        self.rename_progress.setRange(0, max(plan.file_count, 1))
+        self.rename_progress.setValue(0)
+        self.rename_progress.show()
+        self.rename_status.setText(f"Renaming 0 of {plan.file_count:,} files…")
+        self.rename_status.show()
+        self.rename_executor = RenameExecutor(plan, journal)
+        self.rename_executor.progress.connect(self.on_rename_progress)
+        self.rename_executor.completed.connect(self.on_rename_completed)
+        self.rename_executor.start()
+
+    def on_rename_progress(self, done, total):
+        self.rename_progress.setValue(done)
+        if not self.rename_executor.cancel_event.is_set():
+            self.rename_status.setText(f"Renaming {done:,} of {total:,} files…")
+
+    def on_rename_completed(self, renamed, failed):
+        executor = self.rename_executor
+        executor.wait()
+        executor.deleteLater()
+        self.rename_executor = None
+        journal = executor.journal
+        cancelled = executor.cancel_event.is_set()
+        self.apply_btn.setText("Apply Changes")
+        self.apply_btn.setEnabled(True)
+        self.rename_progress.hide()
+        self.rename_status.hide()
+        rows = self.rename_rows
+        self.rename_rows = {}
+        # Files never attempted because of the cancel are not failures
+        errors = [(src, reason) for src, reason in failed if reason != "Cancelled"]
+
+        if (errors or cancelled) and renamed and journal and QMessageBox.question(
+                self, "Rename Cancelled" if cancelled else "Rename Incomplete",
+                f"Renamed {len(renamed):,} files" +
+                (f", {len(errors):,} could not be renamed." if errors else " before stopping.") +
+                "\n\nUndo the renames that succeeded?") == QMessageBox.Yes:
+            undo_failed = journal.rollback()
+            self.show_failures([(dst, f"Could not be restored: {reason}") for dst, reason in undo_failed] + errors)
+            self.refresh_preview()
+            return
+        if journal:
+            journal.commit()
+        self.show_failures(errors)
+        if cancelled:
+            self.rename_status.setText(f"Cancelled after renaming {len(renamed):,} files.")
+            self.rename_status.show()
+        elif errors:
+            QMessageBox.warning(self, "Rename Incomplete" if renamed else "Rename Failed",
+                                f"Renamed {len(renamed):,} files; {len(errors):,} could not be renamed (listed below).")
+        else:
+            QMessageBox.information(self, "Rename Complete", f"Successfully renamed {len(renamed)} files.")
+        self.apply_renames(sorted(rows[src] for src, _ in renamed))
         self.refresh_preview()
 
+    def recover_interrupted_renames(self):
+        # A crash mid-rename leaves its journal behind; the user decides whether those files get their old names back
+        try:
+            journals = interrupted_journals()
+        except OSError:
+            return
+        if not journals:
+            return
+        files = sum(plan.file_count for _, plan in journals)
+        if QMessageBox.question(
+                self, "Interrupted Rename",
+                f"A previous rename of {files:,} files was interrupted before it finished.\n\n"
+                "Restore their original names? Choose No to keep the files as they are now.") != QMessageBox.Yes:
+            for path, _ in journals:
+                RenameJournal(path).commit()
+            return
+        failed = []
+        for path, plan in journals:
+            try:
+                failed += recover_journal(path, plan)
+            except OSError as e:
+                failed.append((path, str(e)))
+        if failed:
+            self.show_failures([(dst, f"Could not be restored: {reason}") for dst, reason in failed])
+            QMessageBox.warning(self, "Interrupted Rename",
+                                f"{len(failed):,} files could not be restored (listed below). "
+                                "Restoring them will be offered again the next time AutoMate starts.")
+        else:
+            QMessageBox.information(self, "Interrupted Rename", f"Restored the original names of {files:,} files.")
+        self.refresh_preview()
+
+    def show_failures(self, failures):
+        self.failures_list.clear()
+        if not failures:
+            self.failures_frame.hide()
+            return
+        root = self.folder_input.text()
+        shown = failures[:self.MAX_FAILURES_SHOWN]
+        self.failures_list.addItems([f"{os.path.relpath(src, root)}  —  {reason}" for src, reason in shown])
+        if len(failures) > len(shown):
+            self.failures_list.addItem(f"…and {len(failures) - len(shown):,} more")
+        self.failures_title.setText(f"{len(failures):,} file{'s' if len(failures) != 1 else ''} not renamed")
+        self.failures_frame.show()
+
+    def apply_renames(self, rows):
+        start, padding = self.numbering()
+        model = self.preview_model
+        old_names = [model.new_names[i] for i in rows]
+        if self.per_folder_cb.isChecked():
+            numbers = [start + self.listing_positions[i] for i in rows]
+        else:
+            numbers = [start + i for i in rows]
+        model.update_rows(rows, old_names, self.calculate_new_names(old_names, numbers, padding))
+        for i, name in zip(rows, old_names):
+            self.listing[i] = name
+        for column, values in zip(self.listing_parts, self.split_names(old_names)):
+            for i, value in zip(rows, values):
+                column[i] = value
+        # Our own renames bumped the folder mtime; the rows above already reflect them
+        try:
+            self.listing_key = (self.listing_key[0], os.stat(self.listing_key[0]).st_mtime_ns) + self.listing_key[2:]
+        except (OSError, TypeError):
+            self.listing_key = None
+
 if __name__ == '__main__':
     app = QApplication(sys.argv)
     ex = BatchRenameUI()
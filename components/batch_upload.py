@@ -0,0 +1,79 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from components.sync_engine import SyncCancelled, SyncError
+
+MISSING_RESULT = "Dropbox: no result for this file"
+
+class AdaptiveBatchSize:
+    # Grows while batches finish well inside the target time, halves on slow batches or errors
+    def __init__(self, initial=32, minimum=8, maximum=1000, target=2.0):
+        self.value = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target = target
+
+    def observe(self, seconds, failed):
+        if failed or seconds > self.target * 2:
+            self.value = max(self.minimum, self.value // 2)
+        elif seconds < self.target / 2:
+            self.value = min(self.maximum, self.value * 2)
+        elif seconds < self.target:
+            self.value = min(self.maximum, self.value + max(1, self.value // 4))
+
+class BatchUploader:
+    # Small files share one upload-session batch: every file gets a session from one start call,
+    # its bytes go up in a single closing append (in parallel), and one finish call commits them all.
+    # api provides start_batch(n), append_chunk(session_id, offset, data, close) and finish_batch(entries).
+    def __init__(self, api, workers=8):
+        self.api = api
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+        self.batch_size = AdaptiveBatchSize()
+
+    def upload(self, items, on_done, cancel_event=None):
+        # items: [(local_path, remote_path)]; on_done(item, error or None) is called for each item in order
+        pos = 0
+        while pos < len(items):
+            if cancel_event is not None and cancel_event.is_set():
+                raise SyncCancelled()
+            batch = items[pos:pos + self.batch_size.value]
+            pos += len(batch)
+            started = time.monotonic()
+            errors = self.send(batch)
+            self.batch_size.observe(time.monotonic() - started, any(errors))
+            for item, error in zip(batch, errors):
+                on_done(item, error)
+
+    def send(self, batch):
+        try:
+            sessions = self.api.start_batch(len(batch))
+        except SyncError as e:
+            return [str(e)] * len(batch)
+
+        def append(job):
+            (local_path, _), session_id = job
+            try:
+                with open(local_path, 'rb') as f:
+                    data = f.read()
+                self.api.append_chunk(session_id, 0, data, close=True)
+                return len(data), None
+            except (OSError, SyncError) as e:
+                return 0, str(e)
+
+        jobs = list(zip(batch, sessions))
+        results = list(self.pool.map(append, jobs))
+        # A short start_batch response leaves the remaining files without a session
+        errors = [error for _, error in results] + [MISSING_RESULT] * (len(batch) - len(jobs))
+        entries = [(session_id, size, item[1]) for (item, session_id), (size, error) in zip(jobs, results) if error is None]
+        if entries:
+            try:
+                outcomes = list(self.api.finish_batch(entries))
+            except SyncError as e:
+                outcomes = [str(e)] * len(entries)
+            # Entries the server left out of its response are not known to be committed
+            outcomes = iter(outcomes[:len(entries)] + [MISSING_RESULT] * (len(entries) - len(outcomes)))
+            errors = [next(outcomes) if error is None else error for error in errors]
+        return errors
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False)
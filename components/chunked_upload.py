@@ -0,0 +1,126 @@
+import os
+import json
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION
+
+from components.app_cache import cache_dir
+from components.sync_engine import SyncCancelled, SyncError
+
+class UploadSessionStore:
+    # Remembers which chunks of an interrupted upload the server acknowledged, so the next attempt skips them
+    def __init__(self, folder=None):
+        self.folder = folder or cache_dir('upload_sessions')
+        self.lock = threading.Lock()
+
+    def path(self, key):
+        return os.path.join(self.folder, hashlib.sha1(key.encode('utf-8', 'surrogatepass')).hexdigest() + ".json")
+
+    def load(self, key):
+        try:
+            with open(self.path(key), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, key, state):
+        path = self.path(key)
+        with self.lock:
+            with open(path + ".tmp", 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+            os.replace(path + ".tmp", path)
+
+    def discard(self, key):
+        try:
+            os.unlink(self.path(key))
+        except FileNotFoundError:
+            pass
+
+class ChunkedUploader:
+    # Splits one file into fixed-size chunks sent by parallel workers into a single upload session.
+    # api provides start_session(), append_chunk(session_id, offset, data, close) and finish_session(session_id, size, remote_path).
+    def __init__(self, api, chunk_size, workers=4, store=None):
+        self.api = api
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.store = store or UploadSessionStore()
+        # Long-lived threads keep their keep-alive connections across files
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+
+    def upload(self, local_path, remote_path, size, mtime_ns, key, progress=None, cancel_event=None):
+        try:
+            return self.attempt(local_path, remote_path, size, mtime_ns, key, progress, cancel_event)
+        except SessionExpired:
+            # Server forgot the session (they expire after a few days): start over once
+            self.store.discard(key)
+            return self.attempt(local_path, remote_path, size, mtime_ns, key, progress, cancel_event)
+
+    def attempt(self, local_path, remote_path, size, mtime_ns, key, progress, cancel_event):
+        chunk_size = self.chunk_size
+        count = max(1, -(-size // chunk_size))
+        state = self.store.load(key)
+        if not state or (state.get('size'), state.get('mtime_ns'), state.get('chunk_size')) != (size, mtime_ns, chunk_size):
+            state = {'session_id': self.api.start_session(), 'size': size, 'mtime_ns': mtime_ns,
+                     'chunk_size': chunk_size, 'acked': []}
+            self.store.save(key, state)
+        acked = set(state['acked'])
+        if progress and acked:
+            progress(sum(min(chunk_size, size - i * chunk_size) for i in acked))
+        # The closing append must be the last one the server sees: an append still in flight after it would be
+        # rejected as "closed". So every other chunk goes up in parallel first and the last one follows on its own.
+        last = count - 1
+        todo = iter([i for i in range(last) if i not in acked])
+        lock = threading.Lock()
+        stop = threading.Event()
+
+        def send(f, view, index):
+            offset = index * chunk_size
+            length = min(chunk_size, size - offset)
+            f.seek(offset)
+            got = 0
+            while got < length:
+                n = f.readinto(view[got:length])
+                if not n:
+                    raise SyncError(f"{os.path.basename(local_path)} shrank during upload")
+                got += n
+            self.api.append_chunk(state['session_id'], offset, view[:length], close=index == last)
+            with lock:
+                acked.add(index)
+                state['acked'] = sorted(acked)
+                if progress:
+                    progress(length)
+            self.store.save(key, state)
+
+        def send_chunks():
+            view = memoryview(bytearray(chunk_size))
+            with open(local_path, 'rb', buffering=0) as f:
+                while True:
+                    with lock:
+                        if stop.is_set() or (cancel_event is not None and cancel_event.is_set()):
+                            return
+                        index = next(todo, None)
+                    if index is None:
+                        return
+                    send(f, view, index)
+
+        futures = [self.pool.submit(send_chunks) for _ in range(min(self.workers, last - len(acked - {last})))]
+        wait(futures, return_when=FIRST_EXCEPTION)
+        stop.set()
+        wait(futures)
+        for fut in futures:
+            if fut.exception() is not None:
+                raise fut.exception()
+        if len(acked - {last}) < last or (cancel_event is not None and cancel_event.is_set()):
+            raise SyncCancelled()
+        if last not in acked:
+            with open(local_path, 'rb', buffering=0) as f:
+                send(f, memoryview(bytearray(size - last * chunk_size)), last)
+        result = self.api.finish_session(state['session_id'], size, remote_path)
+        self.store.discard(key)
+        return result
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False)
+
+class SessionExpired(SyncError):
+    pass
@@ -0,0 +1,207 @@
+import os
+import json
+import time
+import socket
+import threading
+import http.client
+from urllib.parse import urlsplit
+
+from components.batch_upload import BatchUploader
+from components.chunked_upload import ChunkedUploader, SessionExpired
+from components.file_transfer import copy_file_fast
+from components.sync_engine import SyncError
+
+class LocalBackend:
+    # Mirrors synced folders into a local directory (a NAS mount, an external drive, or a stand-in for tests)
+    def __init__(self, root):
+        self.root = root
+        # sync_folder skips this directory when scanning and refuses to sync anything inside it
+        self.local_root = os.path.abspath(root)
+        self.key = f"local:{self.local_root}"
+        self.name = os.path.basename(os.path.normpath(root)) or root
+
+    def target(self, remote_path):
+        return os.path.join(self.root, *remote_path.split("/"))
+
+    def upload(self, local_path, remote_path, size=None, progress=None, cancel_event=None):
+        dst = self.target(remote_path)
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        tmp = f"{dst}.automate-part"
+        if os.path.lexists(tmp):
+            os.unlink(tmp)
+        copy_file_fast(local_path, tmp, progress, cancel_event)
+        os.replace(tmp, dst)
+
+    def delete(self, remote_path):
+        try:
+            os.unlink(self.target(remote_path))
+        except FileNotFoundError:
+            pass
+
+class NoDelayMixin:
+    # Headers and body go out in separate writes; with Nagle on, every small request waits on a delayed ACK
+    def connect(self):
+        super().connect()
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+class NoDelayHTTPConnection(NoDelayMixin, http.client.HTTPConnection):
+    pass
+
+class NoDelayHTTPSConnection(NoDelayMixin, http.client.HTTPSConnection):
+    pass
+
+class HttpClient:
+    # One keep-alive connection per thread and host; a dropped connection is reopened once per request
+    RETRIES = 4
+
+    def __init__(self, timeout=60):
+        self.timeout = timeout
+        self.local = threading.local()
+
+    def connection(self, scheme, netloc):
+        conns = self.local.__dict__.setdefault('conns', {})
+        conn = conns.get((scheme, netloc))
+        if conn is None:
+            cls = NoDelayHTTPSConnection if scheme == 'https' else NoDelayHTTPConnection
+            conn = cls(netloc, timeout=self.timeout, blocksize=1024 * 1024)
+            conns[(scheme, netloc)] = conn
+        return conn
+
+    def drop(self, scheme, netloc):
+        conn = self.local.__dict__.get('conns', {}).pop((scheme, netloc), None)
+        if conn is not None:
+            conn.close()
+
+    def request(self, method, url, body=None, headers=None):
+        parts = urlsplit(url)
+        target = parts.path + ("?" + parts.query if parts.query else "")
+        for attempt in range(self.RETRIES):
+            if hasattr(body, 'seek'):
+                body.seek(0)
+            conn = self.connection(parts.scheme, parts.netloc)
+            try:
+                conn.request(method, target, body=body, headers=headers or {})
+                resp = conn.getresponse()
+                data = resp.read()
+            except (OSError, http.client.HTTPException) as e:
+                self.drop(parts.scheme, parts.netloc)
+                if attempt == self.RETRIES - 1:
+                    raise SyncError(f"Connection failed: {e}", retry=True)
+                time.sleep(min(2 ** attempt, 8))
+                continue
+            if resp.status == 429 or resp.status >= 500:
+                if attempt == self.RETRIES - 1:
+                    raise SyncError(f"HTTP {resp.status}", retry=True)
+                time.sleep(float(resp.getheader('Retry-After') or min(2 ** attempt, 8)))
+                continue
+            return resp.status, resp, data
+        raise SyncError("Request failed", retry=True)
+
+class DropboxService:
+    CONTENT_URL = "https://content.dropboxapi.com/2"
+    API_URL = "https://api.dropboxapi.com/2"
+    # Files above the threshold go through a concurrent upload session; chunks must be multiples of 4 MB
+    CHUNKED_THRESHOLD = 32 * 1024 * 1024
+    CHUNK_SIZE = 8 * 1024 * 1024
+    CHUNK_WORKERS = 4
+    BATCH_WORKERS = 8
+
+    def __init__(self, token="YOUR_DROPBOX_TOKEN", root="/AutoMate", content_url=None, api_url=None):
+        self.token = token
+        self.root = root.rstrip("/")
+        self.content_url = content_url or self.CONTENT_URL
+        self.api_url = api_url or self.API_URL
+        self.key = f"dropbox:{self.api_url}:{self.root}:{token[-12:]}"
+        self.name = "Dropbox"
+        self.http = HttpClient()
+        self.uploader = None
+        self.batch_uploader = None
+
+    @property
+    def configured(self):
+        return bool(self.token) and self.token != "YOUR_DROPBOX_TOKEN"
+
+    def remote(self, remote_path):
+        return f"{self.root}/{remote_path}"
+
+    def call(self, url, arg=None, body=None, content=False):
+        headers = {"Authorization": f"Bearer {self.token}"}
+        if content:
+            # Dropbox-API-Arg must be ASCII; json.dumps escapes everything else
+            headers["Dropbox-API-Arg"] = json.dumps(arg)
+            headers["Content-Type"] = "application/octet-stream"
+        else:
+            body = json.dumps(arg).encode('utf-8')
+            headers["Content-Type"] = "application/json"
+        if body is not None:
+            headers["Content-Length"] = str(len(body) if isinstance(body, (bytes, bytearray, memoryview)) else os.fstat(body.fileno()).st_size)
+        status, resp, data = self.http.request("POST", url, body, headers)
+        try:
+            payload = json.loads(data) if data else {}
+        except ValueError:
+            payload = {"error_summary": data[:200].decode('utf-8', 'replace')}
+        if status != 200:
+            raise DropboxError(status, payload)
+        return payload
+
+    def upload(self, local_path, remote_path, size=None, progress=None, cancel_event=None):
+        st = os.stat(local_path)
+        if st.st_size > self.CHUNKED_THRESHOLD:
+            if self.uploader is None:
+                self.uploader = ChunkedUploader(self, self.CHUNK_SIZE, self.CHUNK_WORKERS)
+            return self.uploader.upload(local_path, remote_path, st.st_size, st.st_mtime_ns,
+                                        f"{self.key}\0{os.path.abspath(local_path)}\0{remote_path}", progress, cancel_event)
+        with open(local_path, 'rb') as f:
+            result = self.call(f"{self.content_url}/files/upload",
+                               {"path": self.remote(remote_path), "mode": "overwrite", "mute": True}, f, content=True)
+        if progress:
+            progress(st.st_size)
+        return result
+
+    def upload_batch(self, items, on_done, cancel_event=None):
+        if self.batch_uploader is None:
+            self.batch_uploader = BatchUploader(self, self.BATCH_WORKERS)
+        self.batch_uploader.upload(items, on_done, cancel_event)
+
+    def start_batch(self, count):
+        return self.call(f"{self.api_url}/files/upload_session/start_batch", {"num_sessions": count})["session_ids"]
+
+    def finish_batch(self, entries):
+        # entries: [(session_id, size, remote_path)] -> [None or error message] in the same order
+        payload = self.call(f"{self.api_url}/files/upload_session/finish_batch_v2", {"entries": [
+            {"cursor": {"session_id": session_id, "offset": size},
+             "commit": {"path": self.remote(remote_path), "mode": "overwrite", "mute": True}}
+            for session_id, size, remote_path in entries]})
+        return [None if entry.get(".tag") == "success" else f"Dropbox: {entry.get('failure', {}).get('.tag', 'commit failed')}"
+                for entry in payload.get("entries", [])]
+
+    def start_session(self):
+        return self.call(f"{self.content_url}/files/upload_session/start",
+                         {"close": False, "session_type": "concurrent"}, b"", content=True)["session_id"]
+
+    def append_chunk(self, session_id, offset, data, close=False):
+        try:
+            self.call(f"{self.content_url}/files/upload_session/append_v2",
+                      {"cursor": {"session_id": session_id, "offset": offset}, "close": close}, data, content=True)
+        except DropboxError as e:
+            if "not_found" in e.summary or "closed" in e.summary:
+                raise SessionExpired(str(e))
+            raise
+
+    def finish_session(self, session_id, size, remote_path):
+        return self.call(f"{self.content_url}/files/upload_session/finish",
+                         {"cursor": {"session_id": session_id, "offset": size},
+                          "commit": {"path": self.remote(remote_path), "mode": "overwrite", "mute": True}}, b"", content=True)
+
+    def delete(self, remote_path):
+        try:
+            self.call(f"{self.api_url}/files/delete_v2", {"path": self.remote(remote_path)})
+        except DropboxError as e:
+            if "not_found" not in e.summary:
+                raise
+
+class DropboxError(SyncError):
+    def __init__(self, status, payload):
+        self.status = status
+        self.summary = payload.get("error_summary", "") if isinstance(payload, dict) else ""
+        super().__init__(f"Dropbox {status}: {self.summary or 'request failed'}", retry=status in (429, 503))
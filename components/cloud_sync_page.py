@@ -2,60 +2,288 @@ import sys
 import time
 import random
 import os
+import threading
 import webbrowser
 import pickle
+import datetime
 from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout, 
                              QLabel, QLineEdit, QPushButton, QCheckBox, 
-                             QScrollArea, QFrame, QGridLayout, QComboBox, QProgressBar, QFileDialog)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer, QEvent
-from PyQt5.QtGui import QIcon
-from googleapiclient.discovery import build
+                             QScrollArea, QFrame, QGridLayout, QComboBox, QProgressBar, QFileDialog,
+                             QListView, QStyledItemDelegate, QStyle)
+from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer, QEvent, QAbstractListModel, QModelIndex, QSize, QRect
+from PyQt5.QtGui import QIcon, QPainter, QColor, QFont, QFontMetrics
+import httplib2
+import requests
+from googleapiclient.discovery import build_from_document
+from googleapiclient.errors import HttpError
+try:
+    from googleapiclient.discovery_cache import get_static_doc
+except ImportError:
+    get_static_doc = None
+from google_auth_httplib2 import AuthorizedHttp
 from google_auth_oauthlib.flow import InstalledAppFlow
+from google.auth.exceptions import RefreshError, TransportError
 from google.auth.transport.requests import Request
 
-SCOPES = ['https://www.googleapis.com/auth/drive.metadata.readonly']
-
-class DropboxService:
-    def __init__(self, token="YOUR_DROPBOX_TOKEN"):
-        self.token = token
+from components.app_cache import cache_dir
+from components.cloud_backends import DropboxService, LocalBackend
+from components.drive_cache import DriveMetadataCache, FILE_FIELDS
+from components.sync_scheduler import SyncScheduler, INTERACTIVE, BACKGROUND
 
-    def upload(self, local_path):
-        time.sleep(2)
-        print(f"Uploading {local_path} to Dropbox...")
-        return True
+SCOPES = ['https://www.googleapis.com/auth/drive.metadata.readonly']
+DRIVE_DISCOVERY_URL = "https://www.googleapis.com/discovery/v1/apis/drive/v3/rest"
+DRIVE_FOLDER_MIME = "application/vnd.google-apps.folder"
+
+def discovery_document():
+    # Parsed API surface for Drive v3, kept on disk so startup works offline and skips the fetch
+    path = os.path.join(cache_dir('google'), 'drive-v3-discovery.json')
+    try:
+        with open(path, encoding='utf-8') as f:
+            return f.read()
+    except OSError:
+        pass
+    doc = get_static_doc('drive', 'v3') if get_static_doc else None
+    if not doc:
+        resp, content = httplib2.Http(timeout=30).request(DRIVE_DISCOVERY_URL)
+        if resp.status != 200:
+            raise OSError(f"Drive discovery fetch failed: HTTP {resp.status}")
+        doc = content.decode('utf-8')
+    with open(path + ".tmp", 'w', encoding='utf-8') as f:
+        f.write(doc)
+    os.replace(path + ".tmp", path)
+    return doc
 
 class GoogleDriveService:
-    def __init__(self):
+    # One per account for the life of the app: credentials, the built API object and HTTP connections are reused
+    REFRESH_MARGIN = 300
+    PAGE_SIZE = 1000
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def for_account(cls, token_path='token.pickle'):
+        with cls._instances_lock:
+            if token_path not in cls._instances:
+                cls._instances[token_path] = cls(token_path)
+            return cls._instances[token_path]
+
+    def __init__(self, token_path='token.pickle'):
+        self.token_path = token_path
         self.creds = None
         self.service = None
+        self.lock = threading.RLock()
+        # Idle authorized transports, each holding its keep-alive connections; handed to one thread at a time
+        self.http_pool = []
+        self.http_pool_lock = threading.Lock()
+        self.refresh_session = None
+        self.refresh_timer = None
+
+    def authenticate(self, interactive=True):
+        with self.lock:
+            if self.service is not None and self.creds and self.creds.valid:
+                return True
+            if self.creds is None and os.path.exists(self.token_path):
+                with open(self.token_path, 'rb') as token:
+                    self.creds = pickle.load(token)
+
+            if not self.creds or not self.creds.valid:
+                if self.creds and self.creds.expired and self.creds.refresh_token:
+                    self.refresh_credentials()
+                elif not interactive:
+                    return False
+                else:
+                    flow = InstalledAppFlow.from_client_secrets_file('credentials.json', SCOPES)
+                    self.creds = flow.run_local_server(port=0)
+                    self.save_credentials()
+                    with self.http_pool_lock:
+                        self.http_pool = []
+
+            if self.service is None:
+                http = self.acquire_http()
+                self.service = build_from_document(discovery_document(), http=http)
+                self.release_http(http)
+            self.schedule_refresh()
+            return True
+
+    def acquire_http(self):
+        # httplib2 keeps connections alive but is not thread-safe, so a transport is never shared concurrently
+        with self.http_pool_lock:
+            if self.http_pool:
+                return self.http_pool.pop()
+        return AuthorizedHttp(self.creds, http=httplib2.Http(timeout=60))
+
+    def release_http(self, http):
+        with self.http_pool_lock:
+            self.http_pool.append(http)
+
+    def execute(self, request):
+        http = self.acquire_http()
+        try:
+            return request.execute(http=http, num_retries=3)
+        finally:
+            self.release_http(http)
+
+    def save_credentials(self):
+        with open(self.token_path, 'wb') as token:
+            pickle.dump(self.creds, token)
+
+    def refresh_credentials(self):
+        if self.refresh_session is None:
+            self.refresh_session = requests.Session()
+        self.creds.refresh(Request(self.refresh_session))
+        self.save_credentials()
+
+    def schedule_refresh(self, delay=None):
+        # Refresh a few minutes before expiry so no API call ever waits on the token endpoint
+        if self.refresh_timer is not None:
+            self.refresh_timer.cancel()
+        if delay is None:
+            if not self.creds or not self.creds.refresh_token or not self.creds.expiry:
+                return
+            delay = max(0.0, (self.creds.expiry - datetime.datetime.utcnow()).total_seconds() - self.REFRESH_MARGIN)
+        self.refresh_timer = threading.Timer(delay, self.background_refresh)
+        self.refresh_timer.daemon = True
+        self.refresh_timer.start()
+
+    def background_refresh(self):
+        with self.lock:
+            try:
+                self.refresh_credentials()
+            except (RefreshError, TransportError, OSError):
+                # Offline or the token endpoint is unhappy: try again shortly, calls still refresh on 401
+                self.schedule_refresh(60)
+                return
+            self.schedule_refresh()
+
+    def close(self):
+        if self.refresh_timer is not None:
+            self.refresh_timer.cancel()
+
+    def sync_metadata(self, cache):
+        # Follow the change feed from the cache's token; a full listing only on first use or an expired token
+        token = cache.page_token
+        if token:
+            try:
+                return self.apply_changes(cache, token)
+            except HttpError as e:
+                if e.resp.status not in (400, 404, 410):
+                    raise
+        # Taken before listing, so anything changing mid-listing shows up in the next change feed
+        start = self.execute(self.service.changes().getStartPageToken())['startPageToken']
+        cache.replace_all(self.list_pages(), start)
+
+    def list_pages(self):
+        kwargs = {"pageSize": self.PAGE_SIZE, "q": "trashed = false", "spaces": "drive",
+                  "fields": f"nextPageToken, files({FILE_FIELDS})"}
+        while True:
+            results = self.execute(self.service.files().list(**kwargs))
+            yield results.get('files', [])
+            if not results.get('nextPageToken'):
+                return
+            kwargs["pageToken"] = results['nextPageToken']
+
+    def apply_changes(self, cache, token):
+        changes = []
+        while True:
+            results = self.execute(self.service.changes().list(
+                pageToken=token, pageSize=self.PAGE_SIZE, spaces="drive", includeRemoved=True,
+                fields=f"nextPageToken, newStartPageToken, changes(fileId, removed, file({FILE_FIELDS}, trashed))"))
+            changes.extend(results.get('changes', []))
+            if 'newStartPageToken' in results:
+                return cache.apply_changes(changes, results['newStartPageToken'])
+            token = results['nextPageToken']
+
+class DriveFilesModel(QAbstractListModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # (name, size, mimeType, modifiedTime) rows straight from the metadata cache
+        self.files = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.files)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            return self.files[index.row()][0]
+        if role == Qt.UserRole:
+            return self.files[index.row()]
+        return None
+
+    def set_files(self, files):
+        self.beginResetModel()
+        self.files = files
+        self.endResetModel()
+
+class DriveFileDelegate(QStyledItemDelegate):
+    # Paints the old per-file row (name, badge, size and date) so only visible rows cost anything
+    ROW_HEIGHT = 56
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.name_font = QFont()
+        self.name_font.setPixelSize(13)
+        self.name_font.setBold(True)
+        self.meta_font = QFont()
+        self.meta_font.setPixelSize(12)
+        self.badge_font = QFont()
+        self.badge_font.setPixelSize(11)
+        self.badge_font.setBold(True)
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+
+    def paint(self, painter, option, index):
+        name, size, mime, modified = index.data(Qt.UserRole)
+        rect = option.rect
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.fillRect(rect, QColor("#f8fafc") if option.state & QStyle.State_MouseOver else QColor("white"))
+        painter.setPen(QColor("#f1f5f9"))
+        painter.drawLine(rect.bottomLeft(), rect.bottomRight())
+
+        details = f"{size / (1024 * 1024):.1f} MB" if size > 0 else "---"
+        details = f"{'Folder' if mime == DRIVE_FOLDER_MIME else 'File'}   {details}   {modified[:10]}"
+        painter.setFont(self.meta_font)
+        details_w = QFontMetrics(self.meta_font).horizontalAdvance(details)
+        details_rect = QRect(rect.right() - 20 - details_w, rect.top(), details_w, rect.height())
+        painter.setPen(QColor("#64748b"))
+        painter.drawText(details_rect, Qt.AlignRight | Qt.AlignVCenter, details)
+
+        badge = "✔ Synced"
+        badge_w = QFontMetrics(self.badge_font).horizontalAdvance(badge) + 24
+        badge_rect = QRect(details_rect.left() - 20 - badge_w, rect.center().y() - 11, badge_w, 22)
+        painter.setPen(QColor("#16a34a"))
+        painter.setBrush(QColor("#f0fdf4"))
+        painter.drawRoundedRect(badge_rect, 11, 11)
+        painter.setFont(self.badge_font)
+        painter.drawText(badge_rect, Qt.AlignCenter, badge)
+
+        name_rect = QRect(rect.left() + 20, rect.top(), badge_rect.left() - 40 - rect.left(), rect.height())
+        painter.setFont(self.name_font)
+        painter.setPen(QColor("#1e293b"))
+        label = f"{'📁' if mime == DRIVE_FOLDER_MIME else '📄'} {name}"
+        painter.drawText(name_rect, Qt.AlignLeft | Qt.AlignVCenter,
+                         QFontMetrics(self.name_font).elidedText(label, Qt.ElideMiddle, name_rect.width()))
+        painter.restore()
+
+class DriveListWorker(QThread):
+    listed = pyqtSignal(list)
+    failed = pyqtSignal(str)
+
+    def __init__(self, service, cache):
+        super().__init__()
+        self.service = service
+        self.cache = cache
 
-    def authenticate(self):
-        if os.path.exists('token.pickle'):
-            with open('token.pickle', 'rb') as token:
-                self.creds = pickle.load(token)
-        
-        if not self.creds or not self.creds.valid:
-            if self.creds and self.creds.expired and self.creds.refresh_token:
-                self.creds.refresh(Request())
-            else:
-                flow = InstalledAppFlow.from_client_secrets_file('credentials.json', SCOPES)
-                self.creds = flow.run_local_server(port=0)
-            
-            with open('token.pickle', 'wb') as token:
-                pickle.dump(self.creds, token)
-
-        self.service = build('drive', 'v3', credentials=self.creds)
-        return True
-
-    def fetch_recent_files(self):
-        if not self.service:
-            return []
-        
-        results = self.service.files().list(
-            pageSize=15, 
-            fields="files(id, name, size, modifiedTime)"
-        ).execute()
-        return results.get('files', [])
+    def run(self):
+        try:
+            self.service.sync_metadata(self.cache)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.listed.emit(self.cache.files())
 
 class CloudSyncUI(QWidget):
     def __init__(self):
@@ -277,8 +505,17 @@ class CloudSyncUI(QWidget):
         details = QLabel(f"{count}   {size}   {time_str}"); details.setStyleSheet("color: #64748b; font-size: 12px; border: none; margin-left: 20px;")
         layout.addWidget(details)
         refresh_btn = QPushButton("🔃"); refresh_btn.setFixedSize(30, 30); refresh_btn.setStyleSheet("border: none; color: #94a3b8;")
+        refresh_btn.setCursor(Qt.PointingHandCursor)
+        row.badge, row.details, row.refresh_btn = badge, details, refresh_btn
         return row
 
+    def update_folder_row(self, row, status, detail, color_key):
+        colors = {"green": ("#16a34a", "#f0fdf4", "✔"), "blue": ("#2563eb", "#eff6ff", "🔄"), "gray": ("#64748b", "#f8fafc", "🕒"), "red": ("#dc2626", "#fef2f2", "✖")}
+        text_c, bg_c, icon = colors[color_key]
+        row.badge.setText(f"{icon} {status}")
+        row.badge.setStyleSheet(f"color: {text_c}; background: {bg_c}; padding: 4px 12px; border-radius: 12px; font-weight: bold; font-size: 11px; border: 1px solid {text_c};")
+        row.details.setText(detail)
+
     def add_to_activity_feed(self, icon_type, text, time_str, color):
         a_row = QHBoxLayout()
         symbol = "✔" if icon_type == "check" else icon_type
@@ -287,34 +524,45 @@ class CloudSyncUI(QWidget):
         a_row.addWidget(lbl); a_row.addStretch(); a_row.addWidget(t_lbl)
         self.activity_vbox.insertLayout(0, a_row)
 
-class RealAPISyncWorker(QThread):
-    progress = pyqtSignal(int, str, str, str)
-    log_activity = pyqtSignal(str, str, str, str)
-
-    def __init__(self, row_index, folder_path, service_type):
-        super().__init__()
-        self.row_index = row_index
-        self.folder_path = folder_path
-        self.service_type = service_type
-
-    def run(self):
-        self.progress.emit(self.row_index, "Syncing", "Connecting...", "blue")
-        try:
-            time.sleep(1)
-            for i in range(1, 101, 25):
-                self.progress.emit(self.row_index, "Syncing", f"Uploading {i}%...", "blue")
-                time.sleep(0.4)
-            self.progress.emit(self.row_index, "Synced", "Just now", "green")
-            self.log_activity.emit("check", f"Synced: {os.path.basename(self.folder_path)}", "Just now", "#16a34a")
-        except Exception as e:
-            self.progress.emit(self.row_index, "Error", "Failed", "red")
-
 class CloudSyncEngine(CloudSyncUI):
     def __init__(self):
         super().__init__()
-        self.active_workers = {}
-        self.drive_service = GoogleDriveService()
+        self.sync_rows = []
+        self.scheduler = SyncScheduler(self)
+        self.scheduler.job_started.connect(self.on_sync_started)
+        self.scheduler.job_progress.connect(self.on_sync_progress)
+        self.scheduler.job_finished.connect(self.on_sync_finished)
+        # Rows queued by the last Sync All that haven't finished yet; they report one summary instead of a line each
+        self.global_pending = set()
+        self.global_failed = 0
+        self.drive_service = GoogleDriveService.for_account()
+        self.drive_cache = DriveMetadataCache(self.drive_service.token_path)
+        self.drive_worker = None
+        self.drive_view = None
+        # Load credentials, the API object and a warm connection before the card is first clicked
+        threading.Thread(target=self.warm_drive_service, daemon=True).start()
+        self.sync_backend = self.default_backend()
+        self.drive_status_name.setText(self.sync_backend.name)
         self.setup_functionality()
+        app = QApplication.instance()
+        if app:
+            app.aboutToQuit.connect(self.stop_syncs)
+            app.aboutToQuit.connect(self.drive_service.close)
+
+    def warm_drive_service(self):
+        try:
+            if self.drive_service.authenticate(interactive=False):
+                self.drive_service.execute(self.drive_service.service.about().get(fields="user(displayName)"))
+        except Exception:
+            # Best effort only; clicking the card authenticates for real and reports errors
+            pass
+
+    def default_backend(self):
+        # Dropbox when a token is configured, otherwise a plain local backup folder
+        dropbox = DropboxService(os.environ.get("DROPBOX_TOKEN", "YOUR_DROPBOX_TOKEN"))
+        if dropbox.configured:
+            return dropbox
+        return LocalBackend(os.path.join(os.path.expanduser("~"), "AutoMate Backup"))
 
     def setup_functionality(self):
         for btn in self.findChildren(QPushButton):
@@ -327,14 +575,29 @@ class CloudSyncEngine(CloudSyncUI):
                 if self.drive_service.authenticate():
                     self.update_drive_card_status(True)
                     self.add_to_activity_feed("check", "Authenticated Google Drive", "Just now", "#2563eb")
-                    files = self.drive_service.fetch_recent_files()
-                    self.update_ui_with_drive_files(files)
+                    cached = self.drive_cache.files()
+                    if cached:
+                        self.update_ui_with_drive_files(cached)
+                    self.refresh_drive_files()
             except Exception as e:
                 print(f"Error authenticating: {e}")
                 self.add_to_activity_feed("✖", "Auth Failed", "Just now", "#dc2626")
         else:
             webbrowser.open(url)
 
+    def refresh_drive_files(self):
+        if self.drive_worker is not None:
+            return
+        self.drive_worker = DriveListWorker(self.drive_service, self.drive_cache)
+        self.drive_worker.listed.connect(self.update_ui_with_drive_files)
+        self.drive_worker.failed.connect(lambda err: self.add_to_activity_feed("✖", f"Drive refresh failed: {err}", "Just now", "#dc2626"))
+        self.drive_worker.finished.connect(self.on_drive_worker_finished)
+        self.drive_worker.start()
+
+    def on_drive_worker_finished(self):
+        self.drive_worker.deleteLater()
+        self.drive_worker = None
+
     def update_drive_card_status(self, connected):
         status_lbl = self.google_card.findChildren(QLabel)[1]
         if connected:
@@ -346,29 +609,39 @@ class CloudSyncEngine(CloudSyncUI):
             status_lbl.setText("Connect")
 
     def update_ui_with_drive_files(self, files):
-        while self.folders_vbox.count():
-            item = self.folders_vbox.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-
+        # Synced folder rows share this list; only the previous Drive listing is cleared
+        keep = {row for _, row in self.sync_rows} | {self.drive_view}
+        for i in reversed(range(self.folders_vbox.count())):
+            widget = self.folders_vbox.itemAt(i).widget()
+            if widget in keep:
+                continue
+            self.folders_vbox.takeAt(i)
+            if widget:
+                widget.deleteLater()
+
+        if self.drive_view is None:
+            self.drive_model = DriveFilesModel(self)
+            self.drive_view = QListView()
+            self.drive_view.setModel(self.drive_model)
+            self.drive_view.setItemDelegate(DriveFileDelegate(self.drive_view))
+            self.drive_view.setUniformItemSizes(True)
+            self.drive_view.setMouseTracking(True)
+            self.drive_view.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+            self.drive_view.setMinimumHeight(DriveFileDelegate.ROW_HEIGHT * 8)
+            self.drive_view.setStyleSheet(self.scrollbar_style + "QListView { border: none; background: white; outline: none; }")
+            self.folders_vbox.addWidget(self.drive_view)
+        self.drive_model.set_files(files)
+        self.drive_view.setVisible(bool(files))
         if not files:
             self.folders_vbox.addWidget(QLabel("No files found in Google Drive."))
-            return
-
-        for i, file in enumerate(files):
-            name = file.get('name')
-            raw_size = int(file.get('size', 0))
-            size_fmt = f"{raw_size / (1024*1024):.1f} MB" if raw_size > 0 else "---"
-            mod_time = file.get('modifiedTime', '')[:10]
-            
-            is_last = (i == len(files) - 1)
-            row = self.create_folder_row(name, "Synced", "File", size_fmt, mod_time, "green", is_last)
-            self.folders_vbox.addWidget(row)
-        
-        self.folders_vbox.addStretch()
 
     def sync_all_action(self):
-        self.add_to_activity_feed("🔄", "Starting global sync...", "Just now", "#2563eb")
+        if not self.sync_rows:
+            self.add_to_activity_feed("🕒", "No folders to sync", "Just now", "#64748b")
+            return
+        queued = [i for i in range(len(self.sync_rows)) if self.start_sync(i, BACKGROUND)]
+        self.global_pending.update(queued)
+        self.add_to_activity_feed("🔄", f"Starting global sync: {len(queued)} folders queued", "Just now", "#2563eb")
 
     def add_folder_action(self):
         folder = QFileDialog.getExistingDirectory(self, "Select Folder")
@@ -376,6 +649,55 @@ class CloudSyncEngine(CloudSyncUI):
             self.add_to_activity_feed("↑", f"Added: {os.path.basename(folder)}", "Just now", "#2563eb")
             new_row = self.create_folder_row(folder, "Pending", "0 files", "0 KB", "Just added", "gray", False)
             self.folders_vbox.insertWidget(0, new_row)
+            new_row.layout().addWidget(new_row.refresh_btn)
+            row_index = len(self.sync_rows)
+            self.sync_rows.append((folder, new_row))
+            new_row.refresh_btn.clicked.connect(lambda: self.start_sync(row_index))
+            self.start_sync(row_index)
+
+    def start_sync(self, row_index, priority=INTERACTIVE):
+        folder, row = self.sync_rows[row_index]
+        if not self.scheduler.submit(row_index, folder, self.sync_backend, priority):
+            return False
+        self.update_folder_row(row, "Queued", "Waiting for a free slot...", "gray")
+        return True
+
+    def on_sync_started(self, row_index):
+        self.update_folder_row(self.sync_rows[row_index][1], "Syncing", "Checking for changes...", "blue")
+
+    def on_sync_progress(self, row_index, done, total):
+        self.update_folder_row(self.sync_rows[row_index][1], "Syncing", f"Uploading {done * 100 // max(total, 1)}%...", "blue")
+
+    def on_sync_finished(self, row_index, result, error):
+        folder, row = self.sync_rows[row_index]
+        name = os.path.basename(os.path.normpath(folder))
+        in_global = row_index in self.global_pending
+        self.global_pending.discard(row_index)
+        if result is None:
+            self.update_folder_row(row, "Error", "Failed", "red")
+            self.add_to_activity_feed("✖", f"Sync failed: {name} ({error})", "Just now", "#dc2626")
+            self.global_failed += in_global
+        elif result.failed:
+            self.update_folder_row(row, "Error", f"{len(result.failed)} files failed", "red")
+            self.add_to_activity_feed("✖", f"{name}: {len(result.failed)} files failed, first: {result.failed[0][0]} ({result.failed[0][1]})", "Just now", "#dc2626")
+            self.global_failed += in_global
+        elif result.cancelled:
+            self.update_folder_row(row, "Paused", "Sync stopped", "gray")
+        else:
+            self.update_folder_row(row, "Synced", "Just now", "green")
+            if result.uploaded or result.deleted:
+                self.add_to_activity_feed("check", f"Synced: {name} ({result.uploaded} uploaded, {result.deleted} removed)", "Just now", "#16a34a")
+            elif not in_global:
+                self.add_to_activity_feed("check", f"Up to date: {name}", "Just now", "#16a34a")
+        if in_global and not self.global_pending:
+            if self.global_failed:
+                self.add_to_activity_feed("✖", f"Global sync finished, {self.global_failed} folders failed", "Just now", "#dc2626")
+            else:
+                self.add_to_activity_feed("check", "Global sync finished", "Just now", "#16a34a")
+            self.global_failed = 0
+
+    def stop_syncs(self):
+        self.scheduler.stop()
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
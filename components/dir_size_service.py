@@ -0,0 +1,163 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+
+class DirSizeCache:
+    MAX_ENTRIES = 20000
+
+    def __init__(self):
+        # path -> (mtime, file names, subdirs) for the directory's direct children, least recently used first
+        self.listings = OrderedDict()
+        # path -> (bytes, files) recursive totals from the last finished walk
+        self.totals = OrderedDict()
+        self.lock = threading.Lock()
+
+    def remember(self, cache, key, value):
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > self.MAX_ENTRIES:
+            cache.popitem(last=False)
+
+    def listing(self, path):
+        # Returns (own bytes, own files, subdirs). Subdirectories on another device are left out, like du -x,
+        # so sizing / never wanders into /proc or a dead network mount.
+        st = os.stat(path)
+        with self.lock:
+            cached = self.listings.get(path)
+            if cached:
+                self.listings.move_to_end(path)
+        if cached and cached[0] == st.st_mtime:
+            # Names are current, but a file rewritten in place keeps the directory mtime; sizes are re-read
+            own_bytes = own_files = 0
+            for name in cached[1]:
+                try:
+                    own_bytes += os.lstat(os.path.join(path, name)).st_size
+                    own_files += 1
+                except OSError:
+                    continue
+            return own_bytes, own_files, cached[2]
+        own_bytes = own_files = 0
+        names = []
+        subdirs = []
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.stat(follow_symlinks=False).st_dev == st.st_dev:
+                            subdirs.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        own_bytes += entry.stat(follow_symlinks=False).st_size
+                        own_files += 1
+                        names.append(entry.name)
+                except OSError:
+                    continue
+        with self.lock:
+            self.remember(self.listings, path, (st.st_mtime, names, subdirs))
+        return own_bytes, own_files, subdirs
+
+    def total(self, path):
+        with self.lock:
+            return self.totals.get(path)
+
+    def set_total(self, path, size, files):
+        with self.lock:
+            self.remember(self.totals, path, (size, files))
+
+    def invalidate(self, path):
+        # Only this directory's listing is stale; its ancestors just lose their aggregated totals
+        with self.lock:
+            self.listings.pop(path, None)
+            while True:
+                self.totals.pop(path, None)
+                parent = os.path.dirname(path)
+                if parent == path:
+                    break
+                path = parent
+
+class DirSizeJob(QThread):
+    progress = pyqtSignal(str, 'qint64', int)
+    done = pyqtSignal(str, 'qint64', int)
+
+    WORKERS = 8
+    PROGRESS_INTERVAL = 0.1
+
+    def __init__(self, root, cache):
+        super().__init__()
+        self.root = root
+        self.cache = cache
+
+    def run(self):
+        size = files = 0
+        last_emit = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.WORKERS) as pool:
+            pending = {pool.submit(self.cache.listing, self.root)}
+            while pending:
+                if self.isInterruptionRequested():
+                    for fut in pending:
+                        fut.cancel()
+                    return
+                finished, pending = wait(pending, timeout=self.PROGRESS_INTERVAL, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    try:
+                        own_bytes, own_files, subdirs = fut.result()
+                    except OSError:
+                        continue
+                    size += own_bytes
+                    files += own_files
+                    pending.update(pool.submit(self.cache.listing, d) for d in subdirs)
+                now = time.monotonic()
+                if now - last_emit >= self.PROGRESS_INTERVAL:
+                    last_emit = now
+                    self.progress.emit(self.root, size, files)
+        self.cache.set_total(self.root, size, files)
+        self.done.emit(self.root, size, files)
+
+class DirSizeService(QObject):
+    size_progress = pyqtSignal(str, 'qint64', int)
+    size_ready = pyqtSignal(str, 'qint64', int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.cache = DirSizeCache()
+        self.job = None
+        self.retired = []
+
+    def request(self, path):
+        self.cancel()
+        cached = self.cache.total(path)
+        if cached:
+            # Show the last known total right away; the walk below re-validates it from cached listings
+            self.size_progress.emit(path, *cached)
+        self.job = DirSizeJob(path, self.cache)
+        self.job.progress.connect(self.size_progress)
+        self.job.done.connect(self.size_ready)
+        self.job.finished.connect(self.on_job_finished)
+        self.job.start()
+
+    def cancel(self):
+        if self.job and self.job.isRunning():
+            self.job.requestInterruption()
+            self.job.progress.disconnect()
+            self.job.done.disconnect()
+            # Keep a reference until the thread winds down
+            self.retired.append(self.job)
+        self.job = None
+
+    def on_job_finished(self):
+        job = self.sender()
+        if job is self.job:
+            self.job = None
+        elif job in self.retired:
+            self.retired.remove(job)
+        job.deleteLater()
+
+    def invalidate(self, path):
+        self.cache.invalidate(path)
+
+    def shutdown(self):
+        self.cancel()
+        for job in list(self.retired):
+            job.wait()
@@ -0,0 +1,182 @@
+import os
+import sys
+import stat
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+from PyQt5.QtCore import QObject, QThread, QTimer, QFileSystemWatcher, pyqtSignal
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+EVENT_HEADER = struct.Struct('iIII')
+
+PARTIAL_SUFFIXES = ('.crdownload', '.part', '.partial', '.download', '.opdownload',
+                    '.tmp', '.temp', '.!ut', '.aria2')
+
+class InotifyReader(QThread):
+    names_changed = pyqtSignal(list)
+    overflowed = pyqtSignal()
+
+    def __init__(self, folder_path):
+        super().__init__()
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        if libc.inotify_add_watch(self.fd, os.fsencode(folder_path), WATCH_MASK) < 0:
+            err = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(err, os.strerror(err), folder_path)
+        self.wake_r, self.wake_w = os.pipe()
+
+    def stop(self):
+        os.write(self.wake_w, b'x')
+        self.wait()
+        for fd in (self.fd, self.wake_r, self.wake_w):
+            os.close(fd)
+
+    def run(self):
+        while True:
+            readable, _, _ = select.select([self.fd, self.wake_r], [], [])
+            if self.wake_r in readable:
+                return
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except OSError as e:
+                if e.errno in (errno.EAGAIN, errno.EINTR):
+                    continue
+                raise
+            names = []
+            offset = 0
+            while offset < len(data):
+                _, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                raw = data[offset:offset + length].rstrip(b'\0')
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    self.overflowed.emit()
+                elif raw and not mask & IN_ISDIR:
+                    names.append(os.fsdecode(raw))
+            if names:
+                self.names_changed.emit(names)
+
+class DownloadWatcher(QObject):
+    files_ready = pyqtSignal(list)
+
+    DEBOUNCE_MS = 2000
+    SETTLE_SECONDS = 2
+
+    def __init__(self, folder_path, parent=None):
+        super().__init__(parent)
+        self.folder_path = folder_path
+        # name -> (size, mtime_ns) seen on the previous settle check
+        self.pending = {}
+        self.reader = None
+        self.fs_watcher = None
+        self.known_names = set()
+        self.debounce = QTimer(self)
+        self.debounce.setSingleShot(True)
+        self.debounce.setInterval(self.DEBOUNCE_MS)
+        self.debounce.timeout.connect(self.flush)
+
+    def start(self):
+        if self.reader or self.fs_watcher:
+            return
+        if sys.platform.startswith('linux'):
+            try:
+                self.reader = InotifyReader(self.folder_path)
+            except OSError:
+                self.reader = None
+        if self.reader:
+            self.reader.names_changed.connect(self.on_names_changed)
+            self.reader.overflowed.connect(self.on_overflow)
+            self.reader.start()
+        else:
+            # QFileSystemWatcher only reports that the directory changed, so diff its listing
+            self.known_names = self.list_names()
+            self.fs_watcher = QFileSystemWatcher([self.folder_path], self)
+            self.fs_watcher.directoryChanged.connect(self.on_directory_changed)
+
+    def stop(self):
+        if self.reader:
+            self.reader.stop()
+            self.reader = None
+        if self.fs_watcher:
+            self.fs_watcher.deleteLater()
+            self.fs_watcher = None
+        self.debounce.stop()
+        self.pending.clear()
+
+    def is_running(self):
+        return bool(self.reader or self.fs_watcher)
+
+    def list_names(self):
+        try:
+            with os.scandir(self.folder_path) as it:
+                return {entry.name for entry in it}
+        except OSError:
+            return set()
+
+    def on_directory_changed(self, _path):
+        names = self.list_names()
+        added = names - self.known_names
+        self.known_names = names
+        self.on_names_changed(list(added) + [n for n in self.pending if n in names])
+
+    def on_overflow(self):
+        self.on_names_changed(list(self.list_names()))
+
+    def is_partial(self, name):
+        lower = name.lower()
+        if name.startswith('.') or name.startswith('~$') or lower.endswith(PARTIAL_SUFFIXES):
+            return True
+        # Firefox keeps an empty placeholder next to "<name>.part" until the download finishes
+        return any(os.path.exists(os.path.join(self.folder_path, name + s)) for s in ('.part', '.crdownload'))
+
+    def on_names_changed(self, names):
+        # Only a newly seen finished name restarts the quiet period. The stream of IN_MODIFY events from
+        # downloads still in progress must not, or one long download would hold back every finished file.
+        added = False
+        for name in names:
+            if name not in self.pending and not name.lower().endswith(PARTIAL_SUFFIXES) and not name.startswith('.'):
+                self.pending[name] = None
+                added = True
+        if added or (self.pending and not self.debounce.isActive()):
+            self.debounce.start()
+
+    def flush(self):
+        ready = []
+        now = time.time()
+        for name, seen in list(self.pending.items()):
+            path = os.path.join(self.folder_path, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                del self.pending[name]
+                continue
+            if not stat.S_ISREG(st.st_mode):
+                del self.pending[name]
+                continue
+            sig = (st.st_size, st.st_mtime_ns)
+            if sig != seen or now - st.st_mtime < self.SETTLE_SECONDS or self.is_partial(name):
+                # Still growing (or never checked before): look again after the next quiet period
+                self.pending[name] = sig
+                continue
+            del self.pending[name]
+            ready.append(path)
+        if self.pending:
+            self.debounce.start()
+        if ready:
+            self.files_ready.emit(ready)
@@ -0,0 +1,71 @@
+import os
+import hashlib
+import sqlite3
+import threading
+
+from components.app_cache import cache_dir
+
+FILE_FIELDS = "id, name, size, mimeType, modifiedTime"
+
+class DriveMetadataCache:
+    # Local copy of a Drive account's file metadata plus the changes.list token it is current as of
+    def __init__(self, account):
+        digest = hashlib.sha1(os.path.abspath(account).encode('utf-8', 'surrogatepass')).hexdigest()[:16]
+        self.db = sqlite3.connect(os.path.join(cache_dir('google'), f"drive-{digest}.db"), check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("CREATE TABLE IF NOT EXISTS files (id TEXT PRIMARY KEY, name TEXT NOT NULL, size INTEGER NOT NULL, "
+                        "mime TEXT NOT NULL, modified TEXT NOT NULL)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS files_modified ON files (modified)")
+        self.db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def row(f):
+        return (f['id'], f.get('name', ''), int(f.get('size') or 0), f.get('mimeType', ''), f.get('modifiedTime', ''))
+
+    @property
+    def page_token(self):
+        with self.lock:
+            row = self.db.execute("SELECT value FROM meta WHERE key = 'page_token'").fetchone()
+        return row[0] if row else None
+
+    def set_token(self, token):
+        self.db.execute("INSERT OR REPLACE INTO meta VALUES ('page_token', ?)", (token,))
+
+    def replace_all(self, pages, token):
+        # pages: iterable of file lists from a full listing; the old contents stay visible until it completes
+        with self.lock:
+            self.db.execute("CREATE TEMP TABLE IF NOT EXISTS fresh AS SELECT * FROM files WHERE 0")
+            self.db.execute("DELETE FROM fresh")
+        for files in pages:
+            with self.lock:
+                self.db.executemany("INSERT OR REPLACE INTO fresh VALUES (?, ?, ?, ?, ?)", [self.row(f) for f in files])
+        with self.lock, self.db:
+            self.db.execute("DELETE FROM files")
+            self.db.execute("INSERT INTO files SELECT * FROM fresh")
+            self.db.execute("DELETE FROM fresh")
+            self.set_token(token)
+
+    def apply_changes(self, changes, token):
+        removed = []
+        updated = []
+        for change in changes:
+            f = change.get('file')
+            if change.get('removed') or not f or f.get('trashed'):
+                removed.append((change['fileId'],))
+            else:
+                updated.append(self.row(f))
+        with self.lock, self.db:
+            self.db.executemany("DELETE FROM files WHERE id = ?", removed)
+            self.db.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)", updated)
+            self.set_token(token)
+        return len(removed) + len(updated)
+
+    def files(self):
+        # Most recently modified first, as (name, size, mime, modifiedTime) tuples
+        with self.lock:
+            return self.db.execute("SELECT name, size, mime, modified FROM files ORDER BY modified DESC").fetchall()
+
+    def close(self):
+        with self.lock:
+            self.db.close()
@@ -0,0 +1,322 @@
+import os
+import uuid
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                             QTreeWidget, QTreeWidgetItem, QProgressBar, QMessageBox, QHeaderView)
+from PyQt5.QtCore import Qt, QThread, pyqtSignal
+
+EDGE_SIZE = 64 * 1024
+HASH_BLOCK = 1024 * 1024
+
+class DuplicateGroup:
+    __slots__ = ('size', 'paths')
+
+    def __init__(self, size, paths):
+        self.size = size
+        self.paths = paths
+
+    @property
+    def wasted(self):
+        return self.size * (len(self.paths) - 1)
+
+def walk_files(root, cancel_event=None):
+    stack = [root]
+    while stack:
+        if cancel_event is not None and cancel_event.is_set():
+            return
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            st = entry.stat(follow_symlinks=False)
+                            yield entry.path, st.st_size, st.st_dev, st.st_ino
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+def edge_hash(path, size):
+    h = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        h.update(f.read(EDGE_SIZE))
+        if size > EDGE_SIZE:
+            f.seek(max(EDGE_SIZE, size - EDGE_SIZE))
+            h.update(f.read(EDGE_SIZE))
+    return h.digest()
+
+def full_hash(path, size=None, cancel_event=None):
+    # Plain reads into one reused buffer rather than mmap: a file truncated mid-hash (a restarted download,
+    # a sync client rewriting it) must be an ordinary mismatch, not a SIGBUS
+    h = hashlib.blake2b(digest_size=20)
+    buf = bytearray(HASH_BLOCK)
+    view = memoryview(buf)
+    total = 0
+    with open(path, 'rb', buffering=0) as f:
+        while True:
+            if cancel_event is not None and cancel_event.is_set():
+                return None
+            n = f.readinto(buf)
+            if not n:
+                break
+            h.update(view[:n])
+            total += n
+    if size is not None and total != size:
+        # Changed since it was sized, so it no longer belongs to this bucket
+        return None
+    return h.digest()
+
+def find_duplicates(files, workers=4, cancel_event=None, progress=None):
+    # files: iterable of (path, size, dev, ino). Each tier only hashes what the previous one could not separate.
+    def report(stage, done, total):
+        if progress:
+            progress(stage, done, total)
+
+    by_size = {}
+    seen_inodes = set()
+    for path, size, dev, ino in files:
+        if not size or (dev, ino) in seen_inodes:
+            continue
+        seen_inodes.add((dev, ino))
+        by_size.setdefault(size, []).append(path)
+    candidates = [(size, paths) for size, paths in by_size.items() if len(paths) > 1]
+
+    def hash_tier(stage, groups, hasher):
+        jobs = [(size, path) for size, paths in groups for path in paths]
+        buckets = {}
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [(size, path, pool.submit(hasher, path, size)) for size, path in jobs]
+            for done, (size, path, fut) in enumerate(futures, 1):
+                if cancel_event is not None and cancel_event.is_set():
+                    for _, _, f in futures:
+                        f.cancel()
+                    return []
+                try:
+                    digest = fut.result()
+                except OSError:
+                    digest = None
+                if digest is not None:
+                    buckets.setdefault((size, digest), []).append(path)
+                if done % 64 == 0 or done == len(futures):
+                    report(stage, done, len(futures))
+        return [(size, paths) for (size, _), paths in buckets.items() if len(paths) > 1]
+
+    report("Hashing file edges", 0, sum(len(p) for _, p in candidates))
+    edge_groups = hash_tier("Hashing file edges", candidates, edge_hash)
+    # Files no larger than the two edges were hashed in full already
+    final = [g for g in edge_groups if g[0] <= 2 * EDGE_SIZE]
+    remaining = [g for g in edge_groups if g[0] > 2 * EDGE_SIZE]
+    if remaining:
+        final += hash_tier("Hashing full contents", remaining,
+                           lambda path, size: full_hash(path, size, cancel_event))
+    groups = [DuplicateGroup(size, sorted(paths)) for size, paths in final]
+    groups.sort(key=lambda g: g.wasted, reverse=True)
+    return groups
+
+def delete_duplicates(paths):
+    removed, failed = [], []
+    for path in paths:
+        try:
+            os.unlink(path)
+            removed.append(path)
+        except OSError as e:
+            failed.append((path, str(e)))
+    return removed, failed
+
+def link_temp(keep, path):
+    # A fresh hidden name next to path; EEXIST means someone else's file, so pick another name rather than touch it
+    head, tail = os.path.split(path)
+    while True:
+        tmp = os.path.join(head, f".{tail}.automate-link-{uuid.uuid4().hex[:8]}")
+        try:
+            os.link(keep, tmp)
+            return tmp
+        except FileExistsError:
+            continue
+
+def hardlink_duplicates(keep, paths):
+    linked, failed = [], []
+    for path in paths:
+        tmp = None
+        try:
+            tmp = link_temp(keep, path)
+            os.replace(tmp, path)
+            linked.append(path)
+        except OSError as e:
+            # Only ever remove the link this call created
+            if tmp is not None:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+            failed.append((path, str(e)))
+    return linked, failed
+
+class DuplicateScanWorker(QThread):
+    progress = pyqtSignal(str, int, int)
+    groups_found = pyqtSignal(list)
+
+    def __init__(self, files=None, roots=None):
+        super().__init__()
+        self.files = files
+        self.roots = roots or []
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        files = self.files
+        if files is None:
+            self.progress.emit("Listing files", 0, 0)
+            files = [f for root in self.roots for f in walk_files(root, self.cancel_event)]
+        groups = find_duplicates(files, cancel_event=self.cancel_event,
+                                 progress=lambda stage, done, total: self.progress.emit(stage, done, total))
+        self.groups_found.emit([] if self.cancel_event.is_set() else groups)
+
+class DuplicatesDialog(QDialog):
+    files_removed = pyqtSignal(list)
+
+    def __init__(self, format_size, files=None, roots=None, parent=None):
+        super().__init__(parent)
+        self.format_size = format_size
+        self.setWindowTitle("Duplicate Files")
+        self.resize(820, 560)
+        self.setStyleSheet("background-color: white;")
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(24, 24, 24, 24)
+        layout.setSpacing(12)
+        title = QLabel("Duplicate Files")
+        title.setStyleSheet("font-size: 18px; font-weight: 600; color: #0F172A;")
+        self.summary = QLabel("Looking for duplicates…")
+        self.summary.setStyleSheet("font-size: 13px; color: #64748B;")
+        layout.addWidget(title)
+        layout.addWidget(self.summary)
+
+        self.progress = QProgressBar()
+        self.progress.setFixedHeight(6)
+        self.progress.setTextVisible(False)
+        self.progress.setRange(0, 0)
+        self.progress.setStyleSheet("QProgressBar { background: #F1F5F9; border: none; border-radius: 3px; } QProgressBar::chunk { background: #2563EB; border-radius: 3px; }")
+        layout.addWidget(self.progress)
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(["File", "Size"])
+        self.tree.header().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.tree.setUniformRowHeights(True)
+        self.tree.setStyleSheet("QTreeWidget { border: 1px solid #E2E8F0; border-radius: 8px; color: #475569; outline: none; }")
+        layout.addWidget(self.tree, 1)
+
+        buttons = QHBoxLayout()
+        hint = QLabel("Checked copies are removed; the unchecked file in each group is kept.")
+        hint.setStyleSheet("font-size: 11px; color: #94A3B8;")
+        buttons.addWidget(hint)
+        buttons.addStretch()
+        self.link_btn = QPushButton("Replace with Hardlinks")
+        self.delete_btn = QPushButton("Delete Checked")
+        self.cancel_btn = QPushButton("Cancel")
+        for btn in (self.link_btn, self.delete_btn, self.cancel_btn):
+            btn.setCursor(Qt.PointingHandCursor)
+            btn.setFixedHeight(36)
+            btn.setStyleSheet("QPushButton { background: white; border: 1px solid #E2E8F0; border-radius: 6px; color: #475569; padding: 0 14px; } QPushButton:hover { background: #F8FAFC; } QPushButton:disabled { color: #CBD5E1; }")
+            buttons.addWidget(btn)
+        self.delete_btn.setStyleSheet("QPushButton { background: #DC2626; color: white; border: none; border-radius: 6px; font-weight: 500; padding: 0 14px; } QPushButton:hover { background: #B91C1C; } QPushButton:disabled { background: #FCA5A5; }")
+        self.link_btn.setEnabled(False)
+        self.delete_btn.setEnabled(False)
+        layout.addLayout(buttons)
+
+        self.link_btn.clicked.connect(self.hardlink_checked)
+        self.delete_btn.clicked.connect(self.delete_checked)
+        self.cancel_btn.clicked.connect(self.cancel_or_close)
+
+        self.worker = DuplicateScanWorker(files=files, roots=roots)
+        self.worker.progress.connect(self.on_progress)
+        self.worker.groups_found.connect(self.show_groups)
+        self.worker.start()
+
+    def on_progress(self, stage, done, total):
+        self.progress.setRange(0, total)
+        self.progress.setValue(done)
+        self.summary.setText(f"{stage}… {done:,} of {total:,}" if total else f"{stage}…")
+
+    def show_groups(self, groups):
+        self.progress.hide()
+        self.cancel_btn.setText("Close")
+        if self.worker.cancel_event.is_set():
+            self.summary.setText("Search cancelled.")
+            return
+        wasted = sum(g.wasted for g in groups)
+        self.summary.setText(f"{len(groups):,} duplicate groups • {self.format_size(wasted)} wasted")
+        self.tree.setUpdatesEnabled(False)
+        for group in groups:
+            parent = QTreeWidgetItem([f"{len(group.paths)} copies • {self.format_size(group.wasted)} wasted",
+                                      self.format_size(group.size)])
+            parent.setData(0, Qt.UserRole, group.paths[0])
+            for i, path in enumerate(group.paths):
+                child = QTreeWidgetItem([path, ""])
+                child.setCheckState(0, Qt.Unchecked if i == 0 else Qt.Checked)
+                parent.addChild(child)
+            self.tree.addTopLevelItem(parent)
+        self.tree.setUpdatesEnabled(True)
+        self.link_btn.setEnabled(bool(groups))
+        self.delete_btn.setEnabled(bool(groups))
+
+    def checked_by_group(self):
+        plan = []
+        for i in range(self.tree.topLevelItemCount()):
+            parent = self.tree.topLevelItem(i)
+            children = [parent.child(j) for j in range(parent.childCount())]
+            keep = [c.text(0) for c in children if c.checkState(0) != Qt.Checked]
+            drop = [c.text(0) for c in children if c.checkState(0) == Qt.Checked]
+            if keep and drop:
+                plan.append((parent, keep[0], drop))
+        return plan
+
+    def apply(self, action, verb):
+        plan = self.checked_by_group()
+        count = sum(len(drop) for _, _, drop in plan)
+        if not count:
+            return QMessageBox.warning(self, "Duplicates", "Leave at least one unchecked file in each group.")
+        if QMessageBox.question(self, "Duplicates", f"{verb} {count} duplicate files?") != QMessageBox.Yes:
+            return
+        done, failed = [], []
+        for parent, keep, drop in plan:
+            ok, bad = action(keep, drop)
+            done.extend(ok)
+            failed.extend(bad)
+            for j in reversed(range(parent.childCount())):
+                if parent.child(j).text(0) in ok:
+                    parent.removeChild(parent.child(j))
+            if parent.childCount() < 2:
+                self.tree.takeTopLevelItem(self.tree.indexOfTopLevelItem(parent))
+        if failed:
+            QMessageBox.warning(self, "Duplicates", f"{len(failed)} files could not be processed:\n" +
+                                "\n".join(f"• {os.path.basename(p)}: {e}" for p, e in failed[:10]))
+        return done
+
+    def delete_checked(self):
+        removed = self.apply(lambda keep, drop: delete_duplicates(drop), "Delete")
+        if removed:
+            self.files_removed.emit(removed)
+            self.summary.setText(f"Deleted {len(removed):,} duplicate files.")
+
+    def hardlink_checked(self):
+        linked = self.apply(hardlink_duplicates, "Replace with hardlinks")
+        if linked:
+            self.summary.setText(f"Replaced {len(linked):,} duplicates with hardlinks.")
+
+    def cancel_or_close(self):
+        if self.worker.isRunning():
+            self.worker.cancel()
+        else:
+            self.reject()
+
+    def done(self, result):
+        self.worker.cancel()
+        self.worker.wait()
+        super().done(result)
@@ -0,0 +1,289 @@
+import os
+import errno
+import queue
+import shutil
+import threading
+import time
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from PyQt5.QtCore import QThread, pyqtSignal
+
+CHUNK_SIZE = 8 * 1024 * 1024
+FICLONE = 0x40049409
+
+class TransferCancelled(Exception):
+    pass
+
+def unique_destination(dest_dir, name, taken=None):
+    base, ext = os.path.splitext(name)
+    candidate = os.path.join(dest_dir, name)
+    n = 1
+    while os.path.lexists(candidate) or (taken is not None and candidate in taken):
+        candidate = os.path.join(dest_dir, f"{base} ({n}){ext}")
+        n += 1
+    return candidate
+
+def copy_file_fast(src, dst, progress=None, cancel_event=None):
+    # Reflink clone when the filesystem can share extents, otherwise a kernel-side copy
+    # (copy_file_range, then sendfile) with a read/write fallback.
+    # A cancelled or failed copy never leaves a partial dst behind.
+    with open(src, 'rb') as fsrc:
+        size = os.fstat(fsrc.fileno()).st_size
+        with open(dst, 'xb') as fdst:
+            try:
+                _copy_fds(fsrc.fileno(), fdst.fileno(), size, progress, cancel_event)
+            except BaseException:
+                fdst.close()
+                os.unlink(dst)
+                raise
+    try:
+        shutil.copystat(src, dst)
+    except OSError:
+        # Times and mode bits are best effort (FAT and some SMB targets refuse them); the data is complete,
+        # so failing here would leave a full copy behind that the caller treats as a failed move
+        pass
+    return size
+
+def _copy_fds(infd, outfd, size, progress, cancel_event):
+    if _reflink(infd, outfd):
+        if progress:
+            progress(size)
+        return size
+    copied = 0
+    for strategy in (_copy_file_range, _sendfile, _read_write):
+        try:
+            for n in strategy(infd, outfd, copied, size):
+                if cancel_event is not None and cancel_event.is_set():
+                    raise TransferCancelled()
+                copied += n
+                if progress:
+                    progress(n)
+            return copied
+        except OSError as e:
+            if e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EBADF):
+                raise
+            if copied:
+                # Strategy failed mid-file; resume from the same offsets with the next one
+                os.lseek(infd, copied, os.SEEK_SET)
+                os.lseek(outfd, copied, os.SEEK_SET)
+
+def _reflink(infd, outfd):
+    if fcntl is None:
+        return False
+    try:
+        fcntl.ioctl(outfd, FICLONE, infd)
+        return True
+    except OSError:
+        # EXDEV, EOPNOTSUPP, EINVAL, ENOTTY...: not a CoW filesystem or not the same one
+        return False
+
+def _copy_file_range(infd, outfd, offset, size):
+    if not hasattr(os, 'copy_file_range'):
+        raise OSError(errno.ENOSYS, "copy_file_range unavailable")
+    while offset < size:
+        n = os.copy_file_range(infd, outfd, min(CHUNK_SIZE, size - offset), offset, offset)
+        if n == 0:
+            break
+        offset += n
+        yield n
+
+def _sendfile(infd, outfd, offset, size):
+    if not hasattr(os, 'sendfile'):
+        raise OSError(errno.ENOSYS, "sendfile unavailable")
+    os.lseek(outfd, offset, os.SEEK_SET)
+    while offset < size:
+        n = os.sendfile(outfd, infd, offset, min(CHUNK_SIZE, size - offset))
+        if n == 0:
+            break
+        offset += n
+        yield n
+
+def _read_write(infd, outfd, offset, size):
+    buf = bytearray(min(CHUNK_SIZE, max(size - offset, 1)))
+    view = memoryview(buf)
+    os.lseek(infd, offset, os.SEEK_SET)
+    os.lseek(outfd, offset, os.SEEK_SET)
+    with open(infd, 'rb', buffering=0, closefd=False) as f:
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            os.write(outfd, view[:n])
+            yield n
+
+class MoveExecutor(QThread):
+    progress = pyqtSignal(int, int)
+    completed = pyqtSignal(list, list)
+
+    COPY_WORKERS = 4
+    PROGRESS_INTERVAL = 0.1
+
+    def __init__(self, operations):
+        super().__init__()
+        # operations: iterable of (src_path, dest_dir)
+        self.operations = list(operations)
+        self.cancel_event = threading.Event()
+        self.moved = []
+        self.failed = []
+        self.lock = threading.Lock()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        groups = {}
+        for src, dest_dir in self.operations:
+            groups.setdefault(dest_dir, []).append(src)
+        total = len(self.operations)
+        self.last_emit = 0.0
+        src_devs = {}
+        cross_device = []
+        taken = set()
+
+        for dest_dir, sources in groups.items():
+            if self.cancel_event.is_set():
+                break
+            try:
+                os.makedirs(dest_dir, exist_ok=True)
+                dest_dev = os.stat(dest_dir).st_dev
+            except OSError as e:
+                self.failed.extend((src, str(e)) for src in sources)
+                continue
+            for src in sources:
+                if self.cancel_event.is_set():
+                    break
+                dst = unique_destination(dest_dir, os.path.basename(src), taken)
+                taken.add(dst)
+                src_dir = os.path.dirname(src)
+                try:
+                    if src_dir not in src_devs:
+                        src_devs[src_dir] = os.stat(src_dir).st_dev
+                    if src_devs[src_dir] != dest_dev:
+                        cross_device.append((src, dst))
+                        continue
+                    os.rename(src, dst)
+                    self.moved.append((src, dst))
+                except OSError as e:
+                    if e.errno == errno.EXDEV:
+                        cross_device.append((src, dst))
+                    else:
+                        self.failed.append((src, str(e)))
+                self.emit_progress(total)
+
+        if cross_device and not self.cancel_event.is_set():
+            with ThreadPoolExecutor(max_workers=self.COPY_WORKERS) as pool:
+                pending = {pool.submit(self.copy_then_unlink, src, dst) for src, dst in cross_device}
+                while pending:
+                    done, pending = wait(pending, timeout=self.PROGRESS_INTERVAL, return_when=FIRST_COMPLETED)
+                    if self.cancel_event.is_set():
+                        for fut in pending:
+                            fut.cancel()
+                    self.emit_progress(total)
+        self.progress.emit(len(self.moved) + len(self.failed), total)
+        self.completed.emit(self.moved, self.failed)
+
+    def copy_then_unlink(self, src, dst):
+        if self.cancel_event.is_set():
+            return
+        try:
+            copy_file_fast(src, dst, cancel_event=self.cancel_event)
+            os.unlink(src)
+            with self.lock:
+                self.moved.append((src, dst))
+        except TransferCancelled:
+            pass
+        except OSError as e:
+            with self.lock:
+                self.failed.append((src, str(e)))
+
+    def emit_progress(self, total):
+        now = time.monotonic()
+        if now - self.last_emit >= self.PROGRESS_INTERVAL:
+            self.last_emit = now
+            self.progress.emit(len(self.moved) + len(self.failed), total)
+
+class UploadQueue(QThread):
+    job_started = pyqtSignal(int, str)
+    job_progress = pyqtSignal(int, 'qint64', 'qint64', float)
+    # job_id, destination, error ('' on success)
+    job_finished = pyqtSignal(int, str, str)
+
+    PROGRESS_INTERVAL = 0.1
+
+    def __init__(self):
+        super().__init__()
+        self.jobs = queue.Queue()
+        self.lock = threading.Lock()
+        self.cancelled = set()
+        self.current = None
+        self.cancel_event = threading.Event()
+
+    def enqueue(self, job_id, src, dest_dir):
+        self.jobs.put((job_id, src, dest_dir))
+
+    def cancel(self, job_id):
+        with self.lock:
+            self.cancelled.add(job_id)
+            if self.current == job_id:
+                self.cancel_event.set()
+
+    def stop(self):
+        while True:
+            try:
+                job = self.jobs.get_nowait()
+            except queue.Empty:
+                break
+            if job is not None:
+                self.cancel(job[0])
+        with self.lock:
+            if self.current is not None:
+                self.cancel_event.set()
+        self.jobs.put(None)
+        self.wait()
+
+    def run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            job_id, src, dest_dir = job
+            with self.lock:
+                if job_id in self.cancelled:
+                    self.cancelled.discard(job_id)
+                    self.job_finished.emit(job_id, "", "Cancelled")
+                    continue
+                self.current = job_id
+                self.cancel_event.clear()
+            dst = ""
+            error = ""
+            try:
+                dst = unique_destination(dest_dir, os.path.basename(src))
+                self.job_started.emit(job_id, dst)
+                self.copy(job_id, src, dst)
+            except TransferCancelled:
+                error = "Cancelled"
+            except OSError as e:
+                error = e.strerror or str(e)
+            with self.lock:
+                self.current = None
+                self.cancelled.discard(job_id)
+            self.job_finished.emit(job_id, dst, error)
+
+    def copy(self, job_id, src, dst):
+        total = os.path.getsize(src)
+        started = last_emit = time.monotonic()
+        done = 0
+
+        def progress(n):
+            nonlocal done, last_emit
+            done += n
+            now = time.monotonic()
+            if now - last_emit >= self.PROGRESS_INTERVAL:
+                last_emit = now
+                self.job_progress.emit(job_id, done, total, done / max(now - started, 1e-6))
+
+        copy_file_fast(src, dst, progress, self.cancel_event)
+        self.job_progress.emit(job_id, total, total, total / max(time.monotonic() - started, 1e-6))
@@ -0,0 +1,231 @@
+import os
+import re
+import time
+import sqlite3
+import threading
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from components.app_cache import cache_path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS roots (path TEXT PRIMARY KEY);
+CREATE TABLE IF NOT EXISTS dirs (path TEXT PRIMARY KEY, mtime REAL);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY, path TEXT UNIQUE, parent TEXT, name TEXT,
+    is_dir INTEGER, size INTEGER, mtime REAL);
+CREATE INDEX IF NOT EXISTS files_parent ON files(parent);
+CREATE INDEX IF NOT EXISTS files_name ON files(name COLLATE NOCASE);
+CREATE VIRTUAL TABLE IF NOT EXISTS names USING fts5(name, content='files', content_rowid='id', tokenize='trigram');
+CREATE TRIGGER IF NOT EXISTS files_ai AFTER INSERT ON files BEGIN
+    INSERT INTO names(rowid, name) VALUES (new.id, new.name);
+END;
+CREATE TRIGGER IF NOT EXISTS files_ad AFTER DELETE ON files BEGIN
+    INSERT INTO names(names, rowid, name) VALUES ('delete', old.id, old.name);
+END;
+CREATE TRIGGER IF NOT EXISTS files_au AFTER UPDATE OF name ON files BEGIN
+    INSERT INTO names(names, rowid, name) VALUES ('delete', old.id, old.name);
+    INSERT INTO names(rowid, name) VALUES (new.id, new.name);
+END;
+"""
+
+def subtree_bounds(path):
+    # Every descendant path sorts in [path + sep, path + chr(ord(sep) + 1)); a root like "/" already ends with sep
+    path = path.rstrip(os.sep)
+    return path + os.sep, path + chr(ord(os.sep) + 1)
+
+def escape_like(text):
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+class FilenameIndex:
+    def __init__(self, path=None):
+        self.db_path = path or cache_path('filename_index.sqlite3')
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        self.lock = threading.Lock()
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def roots(self):
+        with self.lock:
+            return [row[0] for row in self.conn.execute("SELECT path FROM roots ORDER BY path")]
+
+    def add_root(self, path):
+        path = os.path.abspath(path)
+        with self.lock:
+            self.conn.execute("INSERT OR IGNORE INTO roots VALUES (?)", (path,))
+            self.conn.commit()
+        return path
+
+    def remove_root(self, path):
+        with self.lock:
+            self.conn.execute("DELETE FROM roots WHERE path = ?", (path,))
+            others = [row[0] for row in self.conn.execute("SELECT path FROM roots")]
+            # Keep entries still covered by another root
+            if not any(path == o or path.startswith(o.rstrip(os.sep) + os.sep) for o in others):
+                self.delete_subtree(path)
+            self.conn.commit()
+
+    def delete_subtree(self, path, include_self=True):
+        lo, hi = subtree_bounds(path)
+        self.conn.execute("DELETE FROM files WHERE path >= ? AND path < ?", (lo, hi))
+        self.conn.execute("DELETE FROM dirs WHERE path >= ? AND path < ?", (lo, hi))
+        if include_self:
+            self.conn.execute("DELETE FROM files WHERE path = ?", (path,))
+            self.conn.execute("DELETE FROM dirs WHERE path = ?", (path,))
+
+    def note_created(self, path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+        parent, name = os.path.split(path)
+        with self.lock:
+            if not self.conn.execute("SELECT 1 FROM dirs WHERE path = ?", (parent,)).fetchone():
+                return
+            self.upsert([(path, parent, name, int(os.path.isdir(path)), st.st_size, st.st_mtime)])
+            self.conn.commit()
+
+    def note_removed(self, path):
+        with self.lock:
+            self.delete_subtree(path)
+            self.conn.commit()
+
+    def upsert(self, rows):
+        self.conn.executemany("""INSERT INTO files (path, parent, name, is_dir, size, mtime) VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(path) DO UPDATE SET is_dir = excluded.is_dir, size = excluded.size, mtime = excluded.mtime""", rows)
+
+    def count(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def build_query(self, text, limit):
+        text = text.strip()
+        terms = [t for t in re.split(r'[\s*?]+', text) if t]
+        if not terms:
+            return None, None
+        long_terms = [t for t in terms if len(t) >= 3]
+        params = []
+        if long_terms:
+            sql = ("SELECT f.path, f.name, f.is_dir, f.size, f.mtime FROM names JOIN files f ON f.id = names.rowid "
+                   "WHERE names MATCH ?")
+            params.append(" AND ".join('"' + t.replace('"', '""') + '"' for t in long_terms))
+            for t in terms:
+                if len(t) < 3:
+                    sql += " AND f.name LIKE ? ESCAPE '\\'"
+                    params.append(f"%{escape_like(t)}%")
+        else:
+            # Too short for trigrams: use the name index with a prefix match
+            sql = "SELECT path, name, is_dir, size, mtime FROM files f WHERE f.name LIKE ? ESCAPE '\\'"
+            params.append(f"{escape_like(terms[0])}%")
+            for t in terms[1:]:
+                sql += " AND f.name LIKE ? ESCAPE '\\'"
+                params.append(f"%{escape_like(t)}%")
+        if '*' in text or '?' in text:
+            sql += " AND lower(f.name) GLOB ?"
+            params.append(f"*{text.lower()}*")
+        q = terms[0].lower()
+        sql += (" ORDER BY (lower(f.name) = ?) DESC, (lower(f.name) LIKE ? ESCAPE '\\') DESC, f.is_dir DESC,"
+                " length(f.name), f.name LIMIT ?")
+        params += [text.lower(), f"{escape_like(q)}%", limit]
+        return sql, params
+
+    def search(self, text, limit=200):
+        sql, params = self.build_query(text, limit)
+        if sql is None:
+            return []
+        with self.lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def search_pages(self, text, page_size=100, limit=5000):
+        sql, params = self.build_query(text, limit)
+        if sql is None:
+            return
+        with self.lock:
+            cursor = self.conn.execute(sql, params)
+        while True:
+            with self.lock:
+                rows = cursor.fetchmany(page_size)
+            if not rows:
+                return
+            yield rows
+
+    def interrupt(self):
+        # Safe to call from another thread; aborts the statement currently running
+        self.conn.interrupt()
+
+    def refresh_root(self, root, cancelled=lambda: False, progress=None):
+        # Directories whose mtime is unchanged keep their stored listing; only changed ones are re-read
+        stack = [root]
+        seen = 0
+        last_commit = time.monotonic()
+        while stack:
+            if cancelled():
+                with self.lock:
+                    self.conn.commit()
+                return False
+            d = stack.pop()
+            try:
+                mtime = os.stat(d).st_mtime
+            except OSError:
+                with self.lock:
+                    self.delete_subtree(d)
+                continue
+            with self.lock:
+                known = self.conn.execute("SELECT mtime FROM dirs WHERE path = ?", (d,)).fetchone()
+                if known and known[0] == mtime:
+                    stack.extend(row[0] for row in self.conn.execute(
+                        "SELECT path FROM files WHERE parent = ? AND is_dir = 1", (d,)))
+                    continue
+                existing = {row[0] for row in self.conn.execute("SELECT path FROM files WHERE parent = ?", (d,))}
+            rows = []
+            try:
+                with os.scandir(d) as it:
+                    for entry in it:
+                        try:
+                            is_dir = entry.is_dir(follow_symlinks=False)
+                            st = entry.stat(follow_symlinks=False)
+                        except OSError:
+                            continue
+                        if is_dir and entry.name.startswith('.'):
+                            continue
+                        rows.append((entry.path, d, entry.name, int(is_dir), 0 if is_dir else st.st_size, st.st_mtime))
+            except OSError:
+                continue
+            listed = {row[0] for row in rows}
+            with self.lock:
+                for gone in existing - listed:
+                    self.delete_subtree(gone)
+                self.upsert(rows)
+                self.conn.execute("INSERT OR REPLACE INTO dirs VALUES (?, ?)", (d, mtime))
+                if time.monotonic() - last_commit > 0.5:
+                    self.conn.commit()
+                    last_commit = time.monotonic()
+            stack.extend(row[0] for row in rows if row[3])
+            seen += len(rows)
+            if progress:
+                progress(seen)
+        with self.lock:
+            self.conn.commit()
+        return True
+
+class IndexBuilder(QThread):
+    progress = pyqtSignal(int)
+
+    def __init__(self, db_path, roots):
+        super().__init__()
+        self.db_path = db_path
+        self.roots = roots
+
+    def run(self):
+        index = FilenameIndex(self.db_path)
+        try:
+            for root in self.roots:
+                if not index.refresh_root(root, self.isInterruptionRequested, self.progress.emit):
+                    break
+        finally:
+            index.close()
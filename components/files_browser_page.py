@@ -1,13 +1,122 @@
 import sys
 import os
-import shutil
+import sqlite3
 from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout, 
-                             QLabel, QPushButton, QLineEdit, QFrame, QTreeView, 
-                             QFileSystemModel, QHeaderView, QFileDialog, QInputDialog, QMessageBox)
-from PyQt5.QtCore import Qt, QDir, QSortFilterProxyModel, QRegExp
+                             QLabel, QPushButton, QLineEdit, QFrame, QTreeView, QListView, QMenu,
+                             QHeaderView, QFileDialog, QInputDialog, QMessageBox, QFileIconProvider, QProgressBar)
+from PyQt5.QtCore import Qt, QDir, QAbstractListModel, QModelIndex, QTimer, QFileInfo, QSize, pyqtSignal
 from PyQt5.QtGui import QFont
 
+from components.dir_size_service import DirSizeService
+from components.duplicate_finder import DuplicatesDialog
+from components.file_transfer import UploadQueue
+from components.filename_index import FilenameIndex, IndexBuilder
+from components.lazy_fs_model import LazyFileSystemModel
+from components.search_pipeline import SearchPipeline, IndexSearchBackend, WalkSearchBackend
+from components.thumbnail_service import ThumbnailService
+
+class SearchResultsModel(QAbstractListModel):
+    PathRole = Qt.UserRole + 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # (path, name, is_dir, size, mtime) rows as returned by FilenameIndex.search
+        self.rows = []
+        self.icon_provider = QFileIconProvider()
+        self.icons = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        path, name, is_dir, size, mtime = self.rows[index.row()]
+        if role == Qt.DisplayRole:
+            return f"{name}\n{os.path.dirname(path)}"
+        if role == Qt.ToolTipRole or role == self.PathRole:
+            return path
+        if role == Qt.DecorationRole:
+            key = "/" if is_dir else os.path.splitext(name)[1].lower()
+            if key not in self.icons:
+                self.icons[key] = (self.icon_provider.icon(QFileIconProvider.Folder) if is_dir
+                                   else self.icon_provider.icon(QFileInfo(path)))
+            return self.icons[key]
+        return None
+
+    def set_rows(self, rows):
+        self.beginResetModel()
+        self.rows = rows
+        self.endResetModel()
+
+    def append_rows(self, rows):
+        if not rows:
+            return
+        first = len(self.rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self.rows.extend(rows)
+        self.endInsertRows()
+
+class UploadRow(QFrame):
+    cancel_requested = pyqtSignal(int)
+
+    def __init__(self, job_id, name, format_size, parent=None):
+        super().__init__(parent)
+        self.job_id = job_id
+        self.format_size = format_size
+        self.state = "queued"
+        self.setStyleSheet("QFrame { border: none; } QLabel { color: #475569; font-size: 12px; }")
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 4, 0, 4)
+        layout.setSpacing(12)
+        self.name_label = QLabel(name)
+        self.name_label.setFixedWidth(220)
+        self.name_label.setText(self.name_label.fontMetrics().elidedText(name, Qt.ElideMiddle, 220))
+        self.name_label.setToolTip(name)
+        self.bar = QProgressBar()
+        self.bar.setFixedHeight(6)
+        self.bar.setTextVisible(False)
+        self.bar.setRange(0, 1000)
+        self.bar.setStyleSheet("QProgressBar { background: #F1F5F9; border: none; border-radius: 3px; } QProgressBar::chunk { background: #2563EB; border-radius: 3px; }")
+        self.status_label = QLabel("Queued")
+        self.status_label.setFixedWidth(260)
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.setCursor(Qt.PointingHandCursor)
+        self.cancel_btn.setStyleSheet("color: #2563EB; border: none; font-size: 12px; font-weight: 500; background: transparent;")
+        self.cancel_btn.clicked.connect(lambda: self.cancel_requested.emit(self.job_id))
+        layout.addWidget(self.name_label)
+        layout.addWidget(self.bar, 1)
+        layout.addWidget(self.status_label)
+        layout.addWidget(self.cancel_btn)
+
+    def set_progress(self, done, total, rate):
+        self.state = "running"
+        self.bar.setValue(int(done * 1000 / total) if total else 1000)
+        eta = (total - done) / rate if rate else 0
+        self.status_label.setText(f"{self.format_size(done)} of {self.format_size(total)} • "
+                                  f"{self.format_size(rate)}/s • {self.format_eta(eta)} left")
+
+    def set_finished(self, text, failed=False):
+        self.state = "finished"
+        self.bar.setValue(self.bar.maximum() if not failed else self.bar.value())
+        self.status_label.setText(text)
+        self.status_label.setStyleSheet("color: #DC2626;" if failed else "color: #166534;")
+        self.cancel_btn.setText("Dismiss")
+
+    @staticmethod
+    def format_eta(seconds):
+        seconds = int(seconds)
+        if seconds >= 3600:
+            return f"{seconds // 3600}h {seconds % 3600 // 60}m"
+        if seconds >= 60:
+            return f"{seconds // 60}m {seconds % 60}s"
+        return f"{seconds}s"
+
 class FileBrowserUI(QWidget):
+    # None browses the home folder, the filesystem root and mounted volumes (drives on Windows)
+    BROWSE_ROOTS = None
+    THUMB_SIZE = 32
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("File Browser")
@@ -75,24 +184,36 @@ class FileBrowserUI(QWidget):
             QPushButton:hover { background-color: #F8FAFC; }
         """)
 
+        self.duplicates_btn = QPushButton("Duplicates")
+        self.duplicates_btn.setFixedHeight(40)
+        self.duplicates_btn.setFixedWidth(120)
+        self.duplicates_btn.setCursor(Qt.PointingHandCursor)
+        self.duplicates_btn.setStyleSheet(self.new_folder_btn.styleSheet())
+
+        self.index_btn = QPushButton("Index")
+        self.index_btn.setFixedHeight(40)
+        self.index_btn.setFixedWidth(100)
+        self.index_btn.setCursor(Qt.PointingHandCursor)
+        self.index_btn.setStyleSheet(self.new_folder_btn.styleSheet() + "QPushButton::menu-indicator { width: 0px; }")
+        self.index_menu = QMenu(self)
+        self.index_menu.aboutToShow.connect(self.populate_index_menu)
+        self.index_btn.setMenu(self.index_menu)
+
         toolbar_layout.addWidget(self.search_input)
         toolbar_layout.addWidget(self.upload_btn)
         toolbar_layout.addWidget(self.new_folder_btn)
+        toolbar_layout.addWidget(self.duplicates_btn)
+        toolbar_layout.addWidget(self.index_btn)
         self.main_layout.addWidget(toolbar_container)
 
-        self.model = QFileSystemModel()
-        self.model.setRootPath("") 
-
-        self.proxy_model = QSortFilterProxyModel()
-        self.proxy_model.setSourceModel(self.model)
-        self.proxy_model.setFilterCaseSensitivity(Qt.CaseInsensitive)
-        self.proxy_model.setRecursiveFilteringEnabled(True)
+        self.thumbnails = ThumbnailService(self.THUMB_SIZE, self)
+        self.model = LazyFileSystemModel(self.BROWSE_ROOTS, self, self.thumbnails)
 
         self.tree = QTreeView()
-        self.tree.setModel(self.proxy_model)
-
-        self.tree.setRootIndex(self.proxy_model.mapFromSource(self.model.index("")))
-        
+        self.tree.setModel(self.model)
+        self.tree.setUniformRowHeights(True)
+        self.tree.setIconSize(QSize(self.THUMB_SIZE, self.THUMB_SIZE))
+        self.thumbnails.thumbnails_ready.connect(self.tree.viewport().update)
         self.tree.setIndentation(25)
         self.tree.setAnimated(True)
         self.tree.setFrameShape(QFrame.NoFrame)
@@ -132,6 +253,23 @@ class FileBrowserUI(QWidget):
 
         self.main_layout.addWidget(self.tree)
 
+        self.results_model = SearchResultsModel(self)
+        self.results_view = QListView()
+        self.results_view.setModel(self.results_model)
+        self.results_view.setUniformItemSizes(True)
+        self.results_view.setFrameShape(QFrame.NoFrame)
+        self.results_view.setStyleSheet(self.tree.styleSheet().replace("QTreeView", "QListView"))
+        self.results_view.hide()
+        self.main_layout.addWidget(self.results_view)
+
+        self.uploads_frame = QFrame()
+        self.uploads_frame.setStyleSheet("QFrame { border-top: 1px solid #F1F5F9; }")
+        self.uploads_layout = QVBoxLayout(self.uploads_frame)
+        self.uploads_layout.setContentsMargins(0, 8, 0, 0)
+        self.uploads_layout.setSpacing(0)
+        self.uploads_frame.hide()
+        self.main_layout.addWidget(self.uploads_frame)
+
         footer_frame = QFrame()
         footer_frame.setFixedHeight(60)
         footer_layout = QHBoxLayout(footer_frame)
@@ -149,39 +287,239 @@ class FileBrowserUI(QWidget):
         self.main_layout.addWidget(footer_frame)
 
         self.tree.doubleClicked.connect(self.open_file)
+        self.tree.expanded.connect(self.model.on_expanded)
+        self.tree.collapsed.connect(self.model.on_collapsed)
         self.tree.selectionModel().selectionChanged.connect(self.update_footer_info)
         self.upload_btn.clicked.connect(self.handle_upload)
         self.new_folder_btn.clicked.connect(self.handle_new_folder)
+        self.duplicates_btn.clicked.connect(self.handle_duplicates)
         self.search_input.textChanged.connect(self.handle_search)
+        self.results_view.doubleClicked.connect(self.open_result)
+        self.results_view.selectionModel().currentChanged.connect(self.update_result_footer)
+
+        try:
+            self.index = FilenameIndex()
+            # Only folders added from the index menu are crawled; until then search walks the current folder.
+            # Cached so typing never queries the index connection; only the index menu changes the roots
+            self.index_roots = self.index.roots()
+        except sqlite3.Error:
+            self.index = None
+            self.index_roots = []
+        self.index_builder = None
+        self.index_backend = IndexSearchBackend(self.index.db_path) if self.index else None
+        self.size_service = DirSizeService(self)
+        self.size_service.size_progress.connect(self.on_dir_size_progress)
+        self.size_service.size_ready.connect(self.on_dir_size_ready)
+        self.size_path = None
+        self.model.directoryChanged.connect(self.size_service.invalidate)
+        self.upload_rows = {}
+        self.next_upload_id = 0
+        self.upload_queue = UploadQueue()
+        self.upload_queue.job_started.connect(self.on_upload_started)
+        self.upload_queue.job_progress.connect(self.on_upload_progress)
+        self.upload_queue.job_finished.connect(self.on_upload_finished)
+        self.upload_queue.start()
+        self.search_pipeline = SearchPipeline(self)
+        self.search_pipeline.results_reset.connect(lambda: self.results_model.set_rows([]))
+        self.search_pipeline.page_ready.connect(self.on_search_page)
+        self.search_pipeline.search_done.connect(self.on_search_done)
+        self.search_pipeline.search_failed.connect(self.on_search_failed)
+        self.index_timer = QTimer(self)
+        self.index_timer.setInterval(10 * 60 * 1000)
+        self.index_timer.timeout.connect(self.refresh_index)
+        if self.index:
+            self.index_timer.start()
+            QTimer.singleShot(0, self.refresh_index)
+        app = QApplication.instance()
+        if app:
+            app.aboutToQuit.connect(self.stop_index_builder)
+            app.aboutToQuit.connect(self.search_pipeline.shutdown)
+            app.aboutToQuit.connect(self.size_service.shutdown)
+            app.aboutToQuit.connect(self.model.shutdown)
+            app.aboutToQuit.connect(self.thumbnails.shutdown)
+            app.aboutToQuit.connect(self.upload_queue.stop)
 
     def handle_search(self, text):
-        reg_exp = QRegExp(text, Qt.CaseInsensitive, QRegExp.Wildcard)
-        self.proxy_model.setFilterRegExp(reg_exp)
+        if not text.strip():
+            self.search_pipeline.cancel()
+            self.results_model.set_rows([])
+            self.results_view.hide()
+            self.tree.show()
+            self.stats_label.setText("Select a drive or file to see details")
+            return
+        if self.index and self.index_roots:
+            self.search_pipeline.set_backend(self.index_backend, WalkSearchBackend(self.index_roots))
+            self.search_scope = "in indexed folders"
+        elif not self.results_view.isVisible():
+            # No index: walk the folder the tree is showing, streaming matches as they are found
+            path = self.model.filePath(self.tree.currentIndex())
+            root = path if os.path.isdir(path) else QDir.homePath()
+            self.search_pipeline.set_backend(WalkSearchBackend([root]))
+            self.search_scope = f"in {root}"
+        self.tree.hide()
+        self.results_view.show()
+        self.stats_label.setText("Searching…")
+        self.size_label.setText("")
+        self.search_pipeline.set_text(text)
+
+    def on_search_page(self, rows):
+        self.results_model.append_rows(rows)
+        count = self.results_model.rowCount()
+        self.stats_label.setText(f"{count:,} result{'s' if count != 1 else ''} {self.search_scope}…")
+
+    def on_search_done(self, total, first_ms, total_ms):
+        self.stats_label.setText(f"{total:,} result{'s' if total != 1 else ''} {self.search_scope} • "
+                                 f"first page {first_ms:.0f} ms • done in {total_ms:.0f} ms")
+
+    def on_search_failed(self, message, falling_back):
+        if falling_back:
+            self.search_scope = "in indexed folders (index unavailable, scanning directly)"
+            self.stats_label.setText(f"Index unavailable ({message}); scanning folders directly…")
+        else:
+            self.stats_label.setText(f"Search failed: {message}")
+
+    def refresh_index(self):
+        if not self.index or not self.index_roots or (self.index_builder and self.index_builder.isRunning()):
+            return
+        self.index_builder = IndexBuilder(self.index.db_path, self.index_roots)
+        self.index_builder.finished.connect(self.on_index_refreshed)
+        self.index_builder.start()
+
+    def on_index_refreshed(self):
+        if self.search_input.text().strip():
+            self.handle_search(self.search_input.text())
+
+    def stop_index_builder(self):
+        if self.index_builder and self.index_builder.isRunning():
+            self.index_builder.requestInterruption()
+            self.index_builder.wait()
+
+    def populate_index_menu(self):
+        self.index_menu.clear()
+        if not self.index:
+            self.index_menu.addAction("Indexing unavailable (SQLite FTS5 missing)").setEnabled(False)
+            return
+        self.index_menu.addAction("Add Folder to Index…", self.add_index_root)
+        refresh = self.index_menu.addAction("Refresh Index Now", self.refresh_index)
+        refresh.setEnabled(bool(self.index_roots) and not (self.index_builder and self.index_builder.isRunning()))
+        self.index_menu.addSeparator()
+        if not self.index_roots:
+            self.index_menu.addAction("No folders indexed").setEnabled(False)
+        for root in self.index_roots:
+            self.index_menu.addAction(f"Remove {root}", lambda r=root: self.remove_index_root(r))
+
+    def add_index_root(self):
+        folder = QFileDialog.getExistingDirectory(self, "Select Folder to Index")
+        if folder:
+            self.index.add_root(folder)
+            self.index_roots = self.index.roots()
+            self.stop_index_builder()
+            self.refresh_index()
+
+    def remove_index_root(self, root):
+        self.stop_index_builder()
+        self.index.remove_root(root)
+        self.index_roots = self.index.roots()
+        self.handle_search(self.search_input.text())
+
+    def open_result(self, index):
+        self.open_path(index.data(SearchResultsModel.PathRole))
+
+    def update_result_footer(self, current, _previous):
+        if not current.isValid():
+            return
+        path, name, is_dir, size, _ = self.results_model.rows[current.row()]
+        if is_dir:
+            self.stats_label.setText(f"Folder/Drive: {name}")
+            self.request_dir_size(path)
+        else:
+            self.cancel_dir_size()
+            self.stats_label.setText(f"File: {name}")
+            self.size_label.setText(f"Size: {self.format_size(size)}")
 
     def handle_upload(self):
-        file_path, _ = QFileDialog.getOpenFileName(self, "Select File to Upload")
-        if file_path:
-            index = self.tree.currentIndex()
-            source_index = self.proxy_model.mapToSource(index)
+        file_paths, _ = QFileDialog.getOpenFileNames(self, "Select Files to Upload")
+        if not file_paths:
+            return
+        path = self.model.filePath(self.tree.currentIndex())
+        dest_dir = path if os.path.isdir(path) else QDir.homePath()
+        for file_path in file_paths:
+            self.next_upload_id += 1
+            row = UploadRow(self.next_upload_id, os.path.basename(file_path), self.format_size)
+            row.cancel_requested.connect(self.cancel_upload)
+            self.upload_rows[row.job_id] = row
+            self.uploads_layout.addWidget(row)
+            self.upload_queue.enqueue(row.job_id, file_path, dest_dir)
+        self.uploads_frame.show()
+
+    def cancel_upload(self, job_id):
+        row = self.upload_rows.get(job_id)
+        if row is None:
+            return
+        if row.state == "running":
+            # The copy stops at its next chunk and removes the partial file before reporting back
+            row.status_label.setText("Cancelling…")
+            row.cancel_btn.setEnabled(False)
+            self.upload_queue.cancel(job_id)
+            return
+        if row.state == "queued":
+            self.upload_queue.cancel(job_id)
+        self.remove_upload_row(job_id)
 
-            dest_dir = self.model.filePath(source_index) if os.path.isdir(self.model.filePath(source_index)) else QDir.homePath()
-            try:
-                shutil.copy(file_path, dest_dir)
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Could not upload file: {str(e)}")
+    def remove_upload_row(self, job_id):
+        row = self.upload_rows.pop(job_id, None)
+        if row is not None:
+            row.deleteLater()
+        if not self.upload_rows:
+            self.uploads_frame.hide()
+
+    def on_upload_started(self, job_id, _dst):
+        row = self.upload_rows.get(job_id)
+        if row is not None and row.state == "queued":
+            row.state = "running"
+            row.status_label.setText("Starting…")
+
+    def on_upload_progress(self, job_id, done, total, rate):
+        row = self.upload_rows.get(job_id)
+        if row is not None and row.state == "running" and row.cancel_btn.isEnabled():
+            row.set_progress(done, total, rate)
+
+    def on_upload_finished(self, job_id, dst, error):
+        row = self.upload_rows.get(job_id)
+        if row is None:
+            return
+        if error == "Cancelled":
+            self.remove_upload_row(job_id)
+        elif error:
+            row.set_finished(f"Failed: {error}", failed=True)
+        else:
+            if self.index:
+                self.index.note_created(dst)
+            row.set_finished(f"Uploaded to {os.path.basename(os.path.dirname(dst))}")
+            QTimer.singleShot(3000, lambda: self.remove_upload_row(job_id))
 
     def handle_new_folder(self):
         folder_name, ok = QInputDialog.getText(self, 'New Folder', 'Enter folder name:')
         if ok and folder_name:
-            index = self.tree.currentIndex()
-            source_index = self.proxy_model.mapToSource(index)
-            parent_path = self.model.filePath(source_index) if os.path.isdir(self.model.filePath(source_index)) else QDir.homePath()
+            path = self.model.filePath(self.tree.currentIndex())
+            parent_path = path if os.path.isdir(path) else QDir.homePath()
             new_path = os.path.join(parent_path, folder_name)
             if not os.path.exists(new_path):
                 os.makedirs(new_path)
+                if self.index:
+                    self.index.note_created(new_path)
             else:
                 QMessageBox.warning(self, "Warning", "Folder already exists.")
 
+    def handle_duplicates(self):
+        path = self.model.filePath(self.tree.currentIndex())
+        root = path if os.path.isdir(path) else QDir.homePath()
+        if QMessageBox.question(self, "Duplicates", f"Search for duplicate files in:\n{root}") != QMessageBox.Yes:
+            return
+        dialog = DuplicatesDialog(self.format_size, roots=[root], parent=self)
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+        dialog.show()
+
     def format_size(self, size):
         for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
             if size < 1024:
@@ -193,25 +531,40 @@ class FileBrowserUI(QWidget):
         index = self.tree.currentIndex()
         if not index.isValid():
             return
-        
-        source_index = self.proxy_model.mapToSource(index)
-        file_path = self.model.filePath(source_index)
-        file_name = self.model.fileName(source_index)
-        
-        if not file_name: # Handle Drive root cases
-            file_name = file_path
 
-        if os.path.isdir(file_path):
+        file_path = self.model.filePath(index)
+        file_name = self.model.fileName(index) or file_path
+
+        if self.model.isDir(index):
             self.stats_label.setText(f"Folder/Drive: {file_name}")
-            self.size_label.setText("--")
+            self.request_dir_size(file_path)
         else:
-            file_size = self.model.size(source_index)
+            self.cancel_dir_size()
+            file_size = self.model.size(index)
             self.stats_label.setText(f"File: {file_name}")
             self.size_label.setText(f"Size: {self.format_size(file_size)}")
 
+    def request_dir_size(self, path):
+        self.size_path = path
+        self.size_label.setText("Calculating…")
+        self.size_service.request(path)
+
+    def cancel_dir_size(self):
+        self.size_path = None
+        self.size_service.cancel()
+
+    def on_dir_size_progress(self, path, size, files):
+        if path == self.size_path:
+            self.size_label.setText(f"Size: {self.format_size(size)}… ({files:,} files)")
+
+    def on_dir_size_ready(self, path, size, files):
+        if path == self.size_path:
+            self.size_label.setText(f"Size: {self.format_size(size)} ({files:,} files)")
+
     def open_file(self, index):
-        source_index = self.proxy_model.mapToSource(index)
-        path = self.model.filePath(source_index)
+        self.open_path(self.model.filePath(index))
+
+    def open_path(self, path):
         try:
             if sys.platform == 'win32':
                 os.startfile(path)
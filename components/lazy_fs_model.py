@@ -0,0 +1,355 @@
+import os
+import sys
+import time
+import queue
+import datetime
+from collections import OrderedDict
+from PyQt5.QtWidgets import QFileIconProvider
+from PyQt5.QtCore import (Qt, QAbstractItemModel, QModelIndex, QPersistentModelIndex, QThread, QFileSystemWatcher, QFileInfo,
+                          QStorageInfo, QDir, pyqtSignal)
+
+def default_roots():
+    roots = [QDir.homePath()]
+    if sys.platform == 'win32':
+        roots += [d.absoluteFilePath() for d in QDir.drives()]
+    else:
+        roots.append('/')
+        for volume in QStorageInfo.mountedVolumes():
+            path = volume.rootPath()
+            if volume.isValid() and volume.isReady() and path.startswith(('/media/', '/mnt/', '/run/media/', '/Volumes/')):
+                roots.append(path)
+    seen = set()
+    return [r for r in roots if not (r in seen or seen.add(r))]
+
+class FsNode:
+    __slots__ = ('path', 'name', 'parent', 'is_dir', 'size', 'mtime', 'children', 'row', 'streamed')
+
+    def __init__(self, path, name, parent, is_dir, size=0, mtime=0.0, row=0):
+        self.path = path
+        self.name = name
+        self.parent = parent
+        self.is_dir = is_dir
+        self.size = size
+        self.mtime = mtime
+        # None until listed; evicted listings go back to None
+        self.children = None
+        self.row = row
+        # Set once a listing arrives in more than one batch; the batches are only sorted among themselves
+        self.streamed = False
+
+class DirListWorker(QThread):
+    batch_ready = pyqtSignal(str, int, list, bool)
+
+    BATCH_SIZE = 1000
+    FLUSH_INTERVAL = 0.1
+
+    def __init__(self):
+        super().__init__()
+        self.requests = queue.Queue()
+
+    def request(self, path, generation, whole=False):
+        self.requests.put((path, generation, whole))
+
+    def stop(self):
+        self.requests.put(None)
+        self.wait()
+
+    def run(self):
+        while True:
+            request = self.requests.get()
+            if request is None:
+                return
+            path, generation, whole = request
+            batch = []
+            last_flush = time.monotonic()
+            try:
+                with os.scandir(path) as it:
+                    for entry in it:
+                        if entry.name.startswith('.'):
+                            continue
+                        try:
+                            is_dir = entry.is_dir()
+                            st = entry.stat()
+                            batch.append((entry.name, is_dir, 0 if is_dir else st.st_size, st.st_mtime))
+                        except OSError:
+                            continue
+                        if not whole and (len(batch) >= self.BATCH_SIZE or time.monotonic() - last_flush >= self.FLUSH_INTERVAL):
+                            self.batch_ready.emit(path, generation, self.sorted(batch), False)
+                            batch = []
+                            last_flush = time.monotonic()
+            except OSError:
+                pass
+            self.batch_ready.emit(path, generation, self.sorted(batch), True)
+
+    @staticmethod
+    def sorted(batch):
+        return sorted(batch, key=lambda e: (not e[1], e[0].lower()))
+
+class LazyFileSystemModel(QAbstractItemModel):
+    directoryChanged = pyqtSignal(str)
+
+    COLUMNS = ["Name", "Size", "Type", "Date Modified"]
+    MAX_WATCHED = 64
+    KEEP_COLLAPSED = 16
+
+    def __init__(self, roots=None, parent=None, thumbnails=None):
+        super().__init__(parent)
+        self.thumbnails = thumbnails
+        self.root = FsNode("", "", None, True)
+        self.root.children = []
+        self.loaded = {}
+        self.generations = {}
+        self.refreshing = set()
+        self.watched = OrderedDict()
+        self.collapsed = OrderedDict()
+        self.icon_provider = QFileIconProvider()
+        self.icons = {}
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.on_directory_changed)
+        self.worker = DirListWorker()
+        self.worker.batch_ready.connect(self.on_batch_ready)
+        self.worker.start()
+        self.set_roots(roots or default_roots())
+
+    def shutdown(self):
+        self.worker.stop()
+
+    def set_roots(self, roots):
+        self.beginResetModel()
+        for path in list(self.watched):
+            self.unwatch(path)
+        self.loaded.clear()
+        self.collapsed.clear()
+        self.generations = {p: g + 1 for p, g in self.generations.items()}
+        self.root.children = [FsNode(os.path.normpath(p), p if p in ('/', QDir.homePath()) or p.endswith(':/') else os.path.basename(p.rstrip('/')) or p,
+                                     self.root, True, row=i) for i, p in enumerate(roots)]
+        self.endResetModel()
+
+    def node(self, index):
+        return index.internalPointer() if index.isValid() else self.root
+
+    def index(self, row, column, parent=QModelIndex()):
+        node = self.node(parent)
+        if node.children is None or not 0 <= row < len(node.children) or not 0 <= column < len(self.COLUMNS):
+            return QModelIndex()
+        return self.createIndex(row, column, node.children[row])
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        parent = index.internalPointer().parent
+        if parent is None or parent is self.root:
+            return QModelIndex()
+        return self.createIndex(parent.row, 0, parent)
+
+    def node_index(self, node):
+        return QModelIndex() if node is self.root else self.createIndex(node.row, 0, node)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        children = self.node(parent).children
+        return len(children) if children else 0
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.COLUMNS)
+
+    def hasChildren(self, parent=QModelIndex()):
+        node = self.node(parent)
+        return node.is_dir and (node.children is None or bool(node.children))
+
+    def canFetchMore(self, parent):
+        node = self.node(parent)
+        return node.is_dir and node.children is None
+
+    def fetchMore(self, parent):
+        node = self.node(parent)
+        if not node.is_dir or node.children is not None:
+            return
+        node.children = []
+        node.streamed = False
+        self.loaded[node.path] = node
+        generation = self.generations.get(node.path, 0) + 1
+        self.generations[node.path] = generation
+        self.worker.request(node.path, generation)
+        self.watch(node.path)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        col = index.column()
+        if role == Qt.DisplayRole:
+            if col == 0:
+                return node.name
+            if col == 1:
+                return "" if node.is_dir else self.format_size(node.size)
+            if col == 2:
+                return "Folder" if node.is_dir else (os.path.splitext(node.name)[1][1:].upper() or "File")
+            if col == 3:
+                return datetime.datetime.fromtimestamp(node.mtime).strftime('%Y-%m-%d %H:%M') if node.mtime else ""
+        elif role == Qt.DecorationRole and col == 0:
+            if self.thumbnails is not None and not node.is_dir:
+                pix = self.thumbnails.thumbnail(node.path, node.mtime)
+                if pix is not None:
+                    return pix
+            return self.icon(node)
+        elif role == Qt.ToolTipRole:
+            return node.path
+        return None
+
+    def icon(self, node):
+        key = "/" if node.is_dir else os.path.splitext(node.name)[1].lower()
+        if key not in self.icons:
+            self.icons[key] = (self.icon_provider.icon(QFileIconProvider.Folder) if node.is_dir
+                               else self.icon_provider.icon(QFileInfo(node.path)))
+        return self.icons[key]
+
+    def format_size(self, size):
+        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
+            if size < 1024:
+                return f"{size:.1f} {unit}"
+            size /= 1024
+        return f"{size:.1f} PB"
+
+    def filePath(self, index):
+        return self.node(index).path
+
+    def fileName(self, index):
+        return self.node(index).name
+
+    def size(self, index):
+        return self.node(index).size
+
+    def isDir(self, index):
+        return self.node(index).is_dir
+
+    def on_batch_ready(self, path, generation, entries, done):
+        node = self.loaded.get(path)
+        if node is None or self.generations.get(path) != generation:
+            return
+        if path in self.refreshing:
+            if done:
+                self.refreshing.discard(path)
+                self.apply_refresh(node, entries)
+            return
+        self.insert_children(node, entries)
+        if not done:
+            node.streamed = True
+        elif node.streamed:
+            node.streamed = False
+            self.sort_children(node)
+
+    def sort_children(self, node):
+        # Settle the final order once a streamed listing is complete
+        parent_index = self.node_index(node)
+        self.layoutAboutToBeChanged.emit([QPersistentModelIndex(parent_index)])
+        old = self.persistentIndexList()
+        node.children.sort(key=lambda c: (not c.is_dir, c.name.lower()))
+        for row, child in enumerate(node.children):
+            child.row = row
+        self.changePersistentIndexList(old, [self.createIndex(i.internalPointer().row, i.column(), i.internalPointer())
+                                             if i.isValid() and i.internalPointer().parent is node else i for i in old])
+        self.layoutChanged.emit([QPersistentModelIndex(parent_index)])
+
+    def insert_children(self, node, entries):
+        if not entries:
+            return
+        first = len(node.children)
+        self.beginInsertRows(self.node_index(node), first, first + len(entries) - 1)
+        for row, (name, is_dir, size, mtime) in enumerate(entries, first):
+            node.children.append(FsNode(os.path.join(node.path, name), name, node, is_dir, size, mtime, row))
+        self.endInsertRows()
+
+    def apply_refresh(self, node, entries):
+        fresh = {e[0]: e for e in entries}
+        parent_index = self.node_index(node)
+        for row in reversed(range(len(node.children))):
+            child = node.children[row]
+            if child.name in fresh and fresh[child.name][1] == child.is_dir:
+                continue
+            self.beginRemoveRows(parent_index, row, row)
+            self.forget(child)
+            del node.children[row]
+            for r in range(row, len(node.children)):
+                node.children[r].row = r
+            self.endRemoveRows()
+        for child in node.children:
+            _, _, size, mtime = fresh.pop(child.name)
+            if (size, mtime) != (child.size, child.mtime):
+                child.size, child.mtime = size, mtime
+                self.dataChanged.emit(self.createIndex(child.row, 1, child), self.createIndex(child.row, 3, child))
+        self.insert_children(node, DirListWorker.sorted(list(fresh.values())))
+
+    def forget(self, node):
+        # Drop a subtree's bookkeeping; its rows are already being removed by the caller
+        if node.children is None:
+            return
+        for child in node.children:
+            self.forget(child)
+        self.loaded.pop(node.path, None)
+        self.collapsed.pop(node.path, None)
+        self.refreshing.discard(node.path)
+        self.generations[node.path] = self.generations.get(node.path, 0) + 1
+        self.unwatch(node.path)
+        node.children = None
+
+    def evict(self, node):
+        if not node.children:
+            node.children = None
+            self.loaded.pop(node.path, None)
+            return
+        self.beginRemoveRows(self.node_index(node), 0, len(node.children) - 1)
+        self.forget(node)
+        self.endRemoveRows()
+
+    def on_expanded(self, index):
+        node = self.node(index)
+        self.collapsed.pop(node.path, None)
+        if node.children is not None and node.path not in self.watched:
+            # Its watcher was recycled while it was open; catch up with a fresh listing
+            self.watch(node.path)
+            self.refresh(node)
+
+    def on_collapsed(self, index):
+        node = self.node(index)
+        if node.children is None:
+            return
+        self.collapsed[node.path] = node
+        self.collapsed.move_to_end(node.path)
+        while len(self.collapsed) > self.KEEP_COLLAPSED:
+            _, oldest = self.collapsed.popitem(last=False)
+            self.evict(oldest)
+
+    def watch(self, path):
+        if path in self.watched:
+            self.watched.move_to_end(path)
+            return
+        self.watched[path] = True
+        self.watcher.addPath(path)
+        while len(self.watched) > self.MAX_WATCHED:
+            oldest, _ = self.watched.popitem(last=False)
+            self.watcher.removePath(oldest)
+
+    def unwatch(self, path):
+        if self.watched.pop(path, None):
+            self.watcher.removePath(path)
+
+    def refresh(self, node):
+        if node.children is None or node.path in self.refreshing:
+            return
+        self.refreshing.add(node.path)
+        generation = self.generations.get(node.path, 0) + 1
+        self.generations[node.path] = generation
+        self.worker.request(node.path, generation, whole=True)
+
+    def on_directory_changed(self, path):
+        node = self.loaded.get(path)
+        self.directoryChanged.emit(path)
+        if node is not None:
+            self.refresh(node)
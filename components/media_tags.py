@@ -0,0 +1,191 @@
+import os
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.QtCore import QThread, pyqtSignal
+
+EXIF_TAGS = {
+    0x010F: 'Make', 0x0110: 'Model', 0x0112: 'Orientation', 0x0131: 'Software', 0x0132: 'DateTime',
+    0x829A: 'ExposureTime', 0x829D: 'FNumber', 0x8827: 'ISO', 0x9003: 'DateTimeOriginal',
+    0x9004: 'DateTimeDigitized', 0x920A: 'FocalLength', 0xA002: 'Width', 0xA003: 'Height', 0xA434: 'LensModel',
+}
+EXIF_IFD_POINTER = 0x8769
+TYPE_SIZES = {1: 1, 2: 1, 3: 2, 4: 4, 5: 8, 7: 1, 9: 4, 10: 8}
+
+ID3_FRAMES = {
+    'TIT2': 'title', 'TT2': 'title', 'TPE1': 'artist', 'TP1': 'artist', 'TPE2': 'albumartist', 'TP2': 'albumartist',
+    'TALB': 'album', 'TAL': 'album', 'TRCK': 'track', 'TRK': 'track', 'TYER': 'year', 'TYE': 'year',
+    'TDRC': 'year', 'TCON': 'genre', 'TCO': 'genre',
+}
+ID3_ENCODINGS = {0: 'latin-1', 1: 'utf-16', 2: 'utf-16-be', 3: 'utf-8'}
+
+def read_exif(path):
+    with open(path, 'rb') as f:
+        head = f.read(4)
+        if head[:2] in (b'II', b'MM'):
+            f.seek(0)
+            return parse_tiff(f.read(1024 * 1024))
+        if head[:2] != b'\xff\xd8':
+            return {}
+        f.seek(2)
+        # Walk JPEG segments up to the APP1 Exif block; image data never gets read
+        while True:
+            marker = f.read(4)
+            if len(marker) < 4 or marker[0] != 0xFF or marker[1] in (0xD9, 0xDA):
+                return {}
+            size = struct.unpack('>H', marker[2:])[0]
+            if marker[1] == 0xE1:
+                data = f.read(size - 2)
+                if data.startswith(b'Exif\0\0'):
+                    return parse_tiff(data[6:])
+            else:
+                f.seek(size - 2, 1)
+
+def parse_tiff(data):
+    if data[:2] == b'II':
+        order = '<'
+    elif data[:2] == b'MM':
+        order = '>'
+    else:
+        return {}
+    tags = {}
+
+    def read_ifd(offset, depth=0):
+        if offset + 2 > len(data) or depth > 2:
+            return
+        count = struct.unpack_from(order + 'H', data, offset)[0]
+        for i in range(count):
+            entry = offset + 2 + i * 12
+            if entry + 12 > len(data):
+                return
+            tag, typ, n = struct.unpack_from(order + 'HHI', data, entry)
+            if tag == EXIF_IFD_POINTER:
+                read_ifd(struct.unpack_from(order + 'I', data, entry + 8)[0], depth + 1)
+                continue
+            name = EXIF_TAGS.get(tag)
+            if name is None or typ not in TYPE_SIZES:
+                continue
+            size = TYPE_SIZES[typ] * n
+            pos = entry + 8 if size <= 4 else struct.unpack_from(order + 'I', data, entry + 8)[0]
+            if pos + size > len(data):
+                continue
+            if typ == 2:
+                value = data[pos:pos + n].split(b'\0', 1)[0].decode('utf-8', 'replace').strip()
+            elif typ == 3:
+                value = struct.unpack_from(order + 'H', data, pos)[0]
+            elif typ in (4, 9):
+                value = struct.unpack_from(order + ('I' if typ == 4 else 'i'), data, pos)[0]
+            elif typ in (5, 10):
+                num, den = struct.unpack_from(order + ('II' if typ == 5 else 'ii'), data, pos)
+                value = num / den if den else 0
+            else:
+                continue
+            tags[name] = str(value)
+
+    read_ifd(struct.unpack_from(order + 'I', data, 4)[0])
+    return tags
+
+def syncsafe(b):
+    return (b[0] << 21) | (b[1] << 14) | (b[2] << 7) | b[3]
+
+def decode_text(payload):
+    if not payload:
+        return ""
+    encoding = ID3_ENCODINGS.get(payload[0], 'latin-1')
+    return payload[1:].decode(encoding, 'replace').replace('\0', ' ').strip()
+
+def read_id3(path):
+    tags = {}
+    with open(path, 'rb') as f:
+        header = f.read(10)
+        if len(header) == 10 and header[:3] == b'ID3':
+            version, flags = header[3], header[5]
+            data = f.read(syncsafe(header[6:10]))
+            pos = 0
+            if flags & 0x40 and version >= 3:
+                pos = (syncsafe(data[:4]) if version == 4 else struct.unpack('>I', data[:4])[0] + 4)
+            id_len, head_len = (3, 6) if version == 2 else (4, 10)
+            while pos + head_len <= len(data):
+                frame_id = data[pos:pos + id_len].decode('latin-1')
+                if not frame_id.strip('\0'):
+                    break
+                raw = data[pos + id_len:pos + id_len + (3 if version == 2 else 4)]
+                if version == 2:
+                    size = int.from_bytes(raw, 'big')
+                elif version == 4:
+                    size = syncsafe(raw)
+                else:
+                    size = struct.unpack('>I', raw)[0]
+                name = ID3_FRAMES.get(frame_id)
+                if name and name not in tags:
+                    tags[name] = decode_text(data[pos + head_len:pos + head_len + size])
+                pos += head_len + size
+        if not tags:
+            # ID3v1 trailer
+            try:
+                f.seek(-128, os.SEEK_END)
+            except OSError:
+                return tags
+            tail = f.read(128)
+            if tail[:3] == b'TAG':
+                field = lambda a, b: tail[a:b].split(b'\0', 1)[0].decode('latin-1').strip()
+                tags = {'title': field(3, 33), 'artist': field(33, 63), 'album': field(63, 93), 'year': field(93, 97)}
+                if tail[125] == 0 and tail[126]:
+                    tags['track'] = str(tail[126])
+    if 'track' in tags:
+        tags['track'] = tags['track'].split('/')[0]
+    if 'year' in tags:
+        tags['year'] = tags['year'][:4]
+    return {k: v for k, v in tags.items() if v}
+
+READERS = {'exif': read_exif, 'id3': read_id3}
+
+class MetadataCache:
+    def __init__(self):
+        # (dev, inode, mtime_ns, kind) -> tag dict; a changed file gets a new key
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(st, kind):
+        return (st.st_dev, st.st_ino, st.st_mtime_ns, kind)
+
+    def get(self, st, kind):
+        return self.entries.get(self.key(st, kind))
+
+    def put(self, st, kind, tags):
+        with self.lock:
+            self.entries[self.key(st, kind)] = tags
+
+    def missing(self, items, kinds):
+        return [(path, st, kind) for path, st in items if st is not None
+                for kind in kinds if self.key(st, kind) not in self.entries]
+
+class MetadataWorker(QThread):
+    progress = pyqtSignal(int, int)
+
+    WORKERS = 8
+    BATCH = 64
+
+    def __init__(self, cache, jobs):
+        super().__init__()
+        self.cache = cache
+        # jobs: [(path, stat_result, kind)] not yet in the cache
+        self.jobs = jobs
+
+    def read(self, job):
+        path, st, kind = job
+        try:
+            tags = READERS[kind](path)
+        except (OSError, struct.error, ValueError, IndexError):
+            tags = {}
+        self.cache.put(st, kind, tags)
+
+    def run(self):
+        total = len(self.jobs)
+        with ThreadPoolExecutor(max_workers=self.WORKERS) as pool:
+            for start in range(0, total, self.BATCH):
+                if self.isInterruptionRequested():
+                    return
+                list(pool.map(self.read, self.jobs[start:start + self.BATCH]))
+                self.progress.emit(min(start + self.BATCH, total), total)
@@ -3,12 +3,22 @@ import os
 import datetime
 import platform
 import shutil
+import time
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout, QFrame, 
-                             QLabel, QPushButton, QScrollArea, QCheckBox, 
-                             QRadioButton, QButtonGroup, QMessageBox)
-from PyQt5.QtCore import Qt, pyqtSignal
-from PyQt5.QtGui import QPixmap, QIcon
+                             QLabel, QPushButton, QCheckBox, QListView,
+                             QRadioButton, QButtonGroup, QMessageBox,
+                             QStyledItemDelegate, QStyle, QStyleOptionButton, QProgressBar)
+from PyQt5.QtCore import Qt, QObject, pyqtSignal, QThread, QAbstractListModel, QModelIndex, QRect, QSize, QEvent
+from PyQt5.QtGui import QPixmap, QIcon, QColor, QPen, QFont, QFontMetrics, QPainter
+
+from components.download_watcher import DownloadWatcher
+from components.duplicate_finder import DuplicatesDialog
+from components.file_transfer import MoveExecutor
+from components.thumbnail_service import ThumbnailService
+from components.type_sniffer import SignatureCache, sniff_file
 
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
 BASE_DIR = os.path.dirname(CURRENT_DIR) 
@@ -22,6 +32,418 @@ class ClickableFrame(QFrame):
         if event.button() == Qt.LeftButton:
             self.doubleClicked.emit(self.file_path)
 
+class FileRecord:
+    __slots__ = ('path', 'name', 'ext', 'size', 'mtime', 'category', 'dev', 'ino', 'sniffed')
+
+    def __init__(self, path, name, ext, size, mtime, category, dev=0, ino=0):
+        self.path = path
+        self.name = name
+        self.ext = ext
+        self.size = size
+        self.mtime = mtime
+        self.category = category
+        self.dev = dev
+        self.ino = ino
+        self.sniffed = None
+
+    @classmethod
+    def from_stat(cls, path, name, st, ext_category):
+        ext = os.path.splitext(name)[1].lower()
+        return cls(path, name, ext, st.st_size, st.st_mtime, ext_category.get(ext, "Others"), st.st_dev, st.st_ino)
+
+    @classmethod
+    def from_entry(cls, entry, ext_category):
+        return cls.from_stat(entry.path, entry.name, entry.stat(), ext_category)
+
+    @classmethod
+    def from_path(cls, path, ext_category):
+        return cls.from_stat(path, os.path.basename(path), os.stat(path), ext_category)
+
+    @property
+    def cache_key(self):
+        return (self.dev, self.ino, self.size, self.mtime)
+
+    def apply_sniffed(self, sniffed, ext_category):
+        self.sniffed = sniffed
+        if not sniffed or sniffed == self.ext or sniffed not in ext_category:
+            return
+        # A bare zip signature also matches Office files and other zip-based formats
+        if self.ext not in ext_category or (sniffed != '.zip' and ext_category[sniffed] != self.category):
+            self.category = ext_category[sniffed]
+
+class FileListModel(QAbstractListModel):
+    PathRole = Qt.UserRole + 1
+    SizeRole = Qt.UserRole + 2
+    MtimeRole = Qt.UserRole + 3
+    ExtRole = Qt.UserRole + 4
+    checkedCountChanged = pyqtSignal(int)
+    # Removed positions kept before the index is compacted
+    COMPACT_AFTER = 4096
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # One FileRecord per row; checked state is one byte per row
+        self.entries = []
+        self.checked = bytearray()
+        self.checked_count = 0
+        # path -> position at the last compaction; rows removed since then are in `removed`, so a path's
+        # row is its position minus the removed positions before it and removals never renumber the rest
+        self.positions = {}
+        self.removed = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.entries)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        rec = self.entries[row]
+        if role == Qt.DisplayRole:
+            return rec.name
+        if role == Qt.CheckStateRole:
+            return Qt.Checked if self.checked[row] else Qt.Unchecked
+        if role == self.PathRole:
+            return rec.path
+        if role == self.SizeRole:
+            return rec.size
+        if role == self.MtimeRole:
+            return rec.mtime
+        if role == self.ExtRole:
+            return rec.ext or rec.sniffed or ''
+
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsUserCheckable
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.CheckStateRole:
+            return False
+        row = index.row()
+        new = 1 if value == Qt.Checked else 0
+        if self.checked[row] != new:
+            self.checked[row] = new
+            self.checked_count += 1 if new else -1
+            self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+            self.checkedCountChanged.emit(self.checked_count)
+        return True
+
+    def set_entries(self, entries, checked=True):
+        self.beginResetModel()
+        self.entries = list(entries)
+        self.reindex()
+        self.checked = bytearray([1 if checked else 0]) * len(self.entries)
+        self.checked_count = len(self.entries) if checked else 0
+        self.endResetModel()
+        self.checkedCountChanged.emit(self.checked_count)
+
+    def append_entries(self, entries):
+        if not entries:
+            return
+        first = len(self.entries)
+        self.beginInsertRows(QModelIndex(), first, first + len(entries) - 1)
+        self.entries.extend(entries)
+        for pos, rec in enumerate(entries, first + len(self.removed)):
+            self.positions[rec.path] = pos
+        self.checked.extend(b"\x01" * len(entries))
+        self.checked_count += len(entries)
+        self.endInsertRows()
+        self.checkedCountChanged.emit(self.checked_count)
+
+    def reindex(self):
+        self.positions = {rec.path: row for row, rec in enumerate(self.entries)}
+        self.removed = []
+
+    def row_of(self, path):
+        pos = self.positions.get(path)
+        if pos is None:
+            return None
+        return pos - bisect_left(self.removed, pos)
+
+    def remove_paths(self, paths):
+        positions = sorted({self.positions[p] for p in paths if p in self.positions}, reverse=True)
+        if not positions:
+            return
+        rows = [pos - bisect_left(self.removed, pos) for pos in positions]
+        # Remove contiguous runs bottom-up so earlier row numbers stay valid
+        ranges = []
+        start = end = rows[0]
+        for row in rows[1:]:
+            if row == start - 1:
+                start = row
+            else:
+                ranges.append((start, end))
+                start = end = row
+        ranges.append((start, end))
+        for start, end in ranges:
+            for rec in self.entries[start:end + 1]:
+                del self.positions[rec.path]
+            self.checked_count -= sum(self.checked[start:end + 1])
+            self.beginRemoveRows(QModelIndex(), start, end)
+            del self.entries[start:end + 1]
+            del self.checked[start:end + 1]
+            self.endRemoveRows()
+        self.removed = sorted(self.removed + positions)
+        if len(self.removed) > self.COMPACT_AFTER:
+            self.reindex()
+        self.checkedCountChanged.emit(self.checked_count)
+
+    def refresh_paths(self, paths):
+        for path in paths:
+            row = self.row_of(path)
+            if row is not None:
+                index = self.index(row)
+                self.dataChanged.emit(index, index)
+
+    def set_all_checked(self, state):
+        if not self.entries:
+            return
+        self.checked = bytearray([1 if state else 0]) * len(self.entries)
+        self.checked_count = len(self.entries) if state else 0
+        self.dataChanged.emit(self.index(0), self.index(len(self.entries) - 1), [Qt.CheckStateRole])
+        self.checkedCountChanged.emit(self.checked_count)
+
+    def checked_records(self):
+        return [rec for rec, c in zip(self.entries, self.checked) if c]
+
+class SniffService(QObject):
+    # One sniffing pool and signature cache shared by the Downloads scan and the watcher's new files
+    records_ready = pyqtSignal(list)
+
+    WORKERS = 4
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pool = ThreadPoolExecutor(max_workers=self.WORKERS)
+        try:
+            self.cache = SignatureCache()
+        except Exception:
+            self.cache = None
+
+    def lookup(self, rec):
+        return self.cache.get(*rec.cache_key) if self.cache else SignatureCache.MISS
+
+    def submit(self, rec):
+        return self.pool.submit(self.sniff, rec.path)
+
+    def store(self, rows):
+        if self.cache and rows:
+            self.cache.put_many(rows)
+
+    @staticmethod
+    def sniff(path):
+        try:
+            return sniff_file(path)
+        except OSError:
+            return None
+
+    def detect(self, paths, ext_category):
+        # Stats and sniffs new files off the GUI thread; records_ready delivers them with their types applied
+        self.pool.submit(self.detect_paths, paths, ext_category)
+
+    def detect_paths(self, paths, ext_category):
+        records = []
+        sniffed = []
+        for path in paths:
+            try:
+                rec = FileRecord.from_path(path, ext_category)
+            except OSError:
+                continue
+            ext = self.lookup(rec)
+            if ext is SignatureCache.MISS:
+                ext = self.sniff(path) if rec.size else None
+                sniffed.append(rec.cache_key + (ext,))
+            rec.apply_sniffed(ext, ext_category)
+            records.append(rec)
+        self.store(sniffed)
+        self.records_ready.emit(records)
+
+    def shutdown(self):
+        self.pool.shutdown(wait=True, cancel_futures=True)
+        if self.cache:
+            self.cache.close()
+            self.cache = None
+
+class DownloadsScanWorker(QThread):
+    batch_ready = pyqtSignal(list)
+    progress = pyqtSignal(int)
+    types_detected = pyqtSignal(list)
+    failed = pyqtSignal(str)
+
+    BATCH_SIZE = 500
+    FLUSH_INTERVAL = 0.1
+
+    def __init__(self, folder_path, ext_category, sniffer):
+        super().__init__()
+        self.folder_path = folder_path
+        self.ext_category = ext_category
+        self.sniffer = sniffer
+
+    def cancel(self):
+        self.requestInterruption()
+
+    def run(self):
+        batch = []
+        count = 0
+        last_flush = time.monotonic()
+        pending = []
+        try:
+            with os.scandir(self.folder_path) as it:
+                for entry in it:
+                    if self.isInterruptionRequested():
+                        break
+                    try:
+                        if not entry.is_file():
+                            continue
+                        rec = FileRecord.from_entry(entry, self.ext_category)
+                    except OSError:
+                        continue
+                    cached = self.sniffer.lookup(rec)
+                    if cached is SignatureCache.MISS:
+                        if rec.size:
+                            pending.append((rec, self.sniffer.submit(rec)))
+                    else:
+                        rec.apply_sniffed(cached, self.ext_category)
+                    batch.append(rec)
+                    count += 1
+                    now = time.monotonic()
+                    if len(batch) >= self.BATCH_SIZE or now - last_flush >= self.FLUSH_INTERVAL:
+                        self.batch_ready.emit(batch)
+                        self.progress.emit(count)
+                        batch = []
+                        last_flush = now
+                        pending = self.collect_sniffed(pending, wait=False)
+        except OSError as e:
+            self.failed.emit(str(e))
+        if batch:
+            self.batch_ready.emit(batch)
+        self.progress.emit(count)
+        while pending and not self.isInterruptionRequested():
+            pending = self.collect_sniffed(pending, wait=True)
+        for _, fut in pending:
+            fut.cancel()
+
+    def collect_sniffed(self, pending, wait):
+        if wait:
+            pending[0][1].result()
+        # Partition once; a future finishing between two done() checks would otherwise be dropped
+        done, rest = [], []
+        for item in pending:
+            (done if item[1].done() else rest).append(item)
+        if not done:
+            return pending
+        detected = [(rec.path, fut.result()) for rec, fut in done]
+        self.sniffer.store([rec.cache_key + (ext,) for (rec, _), (_, ext) in zip(done, detected)])
+        self.types_detected.emit(detected)
+        return rest
+
+class FileRowDelegate(QStyledItemDelegate):
+    ROW_HEIGHT = 56
+    ROW_SPACING = 8
+    THUMB_SIZE = 36
+
+    def __init__(self, icon_mapping, format_size, thumbnails=None, parent=None):
+        super().__init__(parent)
+        self.icon_mapping = icon_mapping
+        self.format_size = format_size
+        self.thumbnails = thumbnails
+        # One scaled pixmap per extension, shared by every row that paints it
+        self.pixmaps = {}
+        self.name_font = QFont()
+        self.name_font.setPixelSize(13)
+        self.name_font.setWeight(QFont.Medium)
+        self.meta_font = QFont()
+        self.meta_font.setPixelSize(11)
+        self.tag_font = QFont()
+        self.tag_font.setPixelSize(10)
+        self.tag_font.setBold(True)
+
+    def get_pixmap(self, ext):
+        pix = self.pixmaps.get(ext)
+        if pix is None:
+            pix = QPixmap(self.icon_mapping.get(ext, self.icon_mapping['default']))
+            if not pix.isNull():
+                pix = pix.scaled(24, 24, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            self.pixmaps[ext] = pix
+        return pix
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ROW_HEIGHT + self.ROW_SPACING)
+
+    def card_rect(self, option):
+        return option.rect.adjusted(0, 0, -1, -self.ROW_SPACING - 1)
+
+    def checkbox_rect(self, option):
+        card = self.card_rect(option)
+        return QRect(card.left() + 12, card.center().y() - 8, 16, 16)
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        card = self.card_rect(option)
+        painter.setPen(QPen(QColor("#F1F5F9")))
+        painter.setBrush(QColor("#F8FAFC") if option.state & QStyle.State_MouseOver else QColor("white"))
+        painter.drawRoundedRect(card, 6, 6)
+
+        cb = QStyleOptionButton()
+        cb.rect = self.checkbox_rect(option)
+        cb.state = QStyle.State_Enabled
+        cb.state |= QStyle.State_On if index.data(Qt.CheckStateRole) == Qt.Checked else QStyle.State_Off
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawPrimitive(QStyle.PE_IndicatorCheckBox, cb, painter, option.widget)
+
+        ext = index.data(FileListModel.ExtRole)
+        icon_rect = QRect(cb.rect.right() + 12, card.center().y() - self.THUMB_SIZE // 2, self.THUMB_SIZE, self.THUMB_SIZE)
+        pix = None
+        if self.thumbnails is not None:
+            pix = self.thumbnails.thumbnail(index.data(FileListModel.PathRole), index.data(FileListModel.MtimeRole))
+        if pix is None:
+            pix = self.get_pixmap(ext)
+        if not pix.isNull():
+            painter.drawPixmap(icon_rect.center().x() - pix.width() // 2 + 1, icon_rect.center().y() - pix.height() // 2 + 1, pix)
+        else:
+            painter.drawText(icon_rect, Qt.AlignCenter, "📄")
+
+        tag = ext.replace('.', '').upper() or "FILE"
+        tag_w = QFontMetrics(self.tag_font).horizontalAdvance(tag) + 16
+        tag_rect = QRect(card.right() - 12 - tag_w, card.center().y() - 10, tag_w, 20)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor("#F0FDF4"))
+        painter.drawRoundedRect(tag_rect, 4, 4)
+        painter.setFont(self.tag_font)
+        painter.setPen(QColor("#166534"))
+        painter.drawText(tag_rect, Qt.AlignCenter, tag)
+
+        text_left = icon_rect.right() + 12
+        text_w = tag_rect.left() - 12 - text_left
+        name_rect = QRect(text_left, card.top() + 9, text_w, 20)
+        meta_rect = QRect(text_left, card.top() + 29, text_w, 18)
+        painter.setFont(self.name_font)
+        painter.setPen(QColor("#1E293B"))
+        name = QFontMetrics(self.name_font).elidedText(index.data(Qt.DisplayRole), Qt.ElideMiddle, text_w)
+        painter.drawText(name_rect, Qt.AlignLeft | Qt.AlignVCenter, name)
+        date = datetime.datetime.fromtimestamp(index.data(FileListModel.MtimeRole)).strftime('%Y-%m-%d')
+        size = self.format_size(index.data(FileListModel.SizeRole))
+        painter.setFont(self.meta_font)
+        painter.setPen(QColor("#94A3B8"))
+        painter.drawText(meta_rect, Qt.AlignLeft | Qt.AlignVCenter, f"{size} • {date}")
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() in (QEvent.MouseButtonRelease, QEvent.MouseButtonDblClick):
+            if event.button() == Qt.LeftButton and self.checkbox_rect(option).adjusted(-4, -4, 4, 4).contains(event.pos()):
+                if event.type() == QEvent.MouseButtonRelease:
+                    state = Qt.Unchecked if index.data(Qt.CheckStateRole) == Qt.Checked else Qt.Checked
+                    model.setData(index, state, Qt.CheckStateRole)
+                return True
+        elif event.type() == QEvent.KeyPress and event.key() == Qt.Key_Space:
+            state = Qt.Unchecked if index.data(Qt.CheckStateRole) == Qt.Checked else Qt.Checked
+            return model.setData(index, state, Qt.CheckStateRole)
+        return False
+
 class OrganizeDownloadPage(QWidget):
     def __init__(self):
         super().__init__()
@@ -35,6 +457,7 @@ class OrganizeDownloadPage(QWidget):
             'Archives': ['.zip', '.rar', '.7z', '.tar'],
             'Code': ['.py', '.html', '.css', '.js', '.cpp'],
         }
+        self.EXT_CATEGORY = {ext: cat for cat, exts in self.EXT_GROUPS.items() for ext in exts}
 
         def get_asset(name):
             return os.path.join(BASE_DIR, 'assets', 'icons', name)
@@ -51,9 +474,33 @@ class OrganizeDownloadPage(QWidget):
             'folder': get_asset('folder.png')
         }
 
-        self.file_checkboxes = {}
+        self.file_model = FileListModel(self)
+        self.file_model.checkedCountChanged.connect(self.update_counters)
+        self.scan_worker = None
+        self.scan_started = False
+        self.scan_error = None
+        self.move_executor = None
+        self.move_interactive = False
+        self.auto_queue = []
+        self.watcher = DownloadWatcher(self.downloads_path, self)
+        self.watcher.files_ready.connect(self.on_new_downloads)
+        self.sniffer = SniffService(self)
+        self.sniffer.records_ready.connect(self.on_new_records)
+        self.thumbnails = ThumbnailService(FileRowDelegate.THUMB_SIZE, self)
         self.setup_ui()
-        self.load_real_data()
+        self.thumbnails.thumbnails_ready.connect(self.file_list.viewport().update)
+        app = QApplication.instance()
+        if app:
+            app.aboutToQuit.connect(self.stop_scan)
+            app.aboutToQuit.connect(self.sniffer.shutdown)
+            app.aboutToQuit.connect(self.stop_organization)
+            app.aboutToQuit.connect(self.watcher.stop)
+            app.aboutToQuit.connect(self.thumbnails.shutdown)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self.scan_started:
+            self.load_real_data()
 
     def setup_ui(self):
         self.main_layout = QVBoxLayout(self)
@@ -98,6 +545,7 @@ class OrganizeDownloadPage(QWidget):
         auto_card.setStyleSheet("QFrame { background-color: #EFF6FF; border: none; border-radius: 10px; }")
         auto_lay = QHBoxLayout(auto_card)
         self.auto_cb = QCheckBox()
+        self.auto_cb.toggled.connect(self.toggle_auto_organize)
         auto_txt = QVBoxLayout()
         at = QLabel("Auto-organize")
         at.setStyleSheet("font-weight: 600; color: #1E293B; border: none;")
@@ -145,6 +593,17 @@ class OrganizeDownloadPage(QWidget):
 
         sidebar_layout.addWidget(self.preview_btn)
         sidebar_layout.addWidget(self.organize_btn)
+
+        self.move_progress = QProgressBar()
+        self.move_progress.setFixedHeight(6)
+        self.move_progress.setTextVisible(False)
+        self.move_progress.setStyleSheet("QProgressBar { background: #F1F5F9; border: none; border-radius: 3px; } QProgressBar::chunk { background: #2563EB; border-radius: 3px; }")
+        self.move_progress.hide()
+        self.move_status = QLabel("")
+        self.move_status.setStyleSheet("font-size: 11px; color: #64748B; border: none;")
+        self.move_status.hide()
+        sidebar_layout.addWidget(self.move_progress)
+        sidebar_layout.addWidget(self.move_status)
         sidebar_layout.addStretch()
 
         right_panel = QVBoxLayout()
@@ -154,18 +613,36 @@ class OrganizeDownloadPage(QWidget):
         self.deselect_btn = QPushButton("Deselect All")
         self.deselect_btn.clicked.connect(self.toggle_all)
         self.deselect_btn.setStyleSheet("color: #2563EB; border: none; font-size: 12px; font-weight: 500; background: transparent;")
+        self.duplicates_btn = QPushButton("Find Duplicates")
+        self.duplicates_btn.setCursor(Qt.PointingHandCursor)
+        self.duplicates_btn.clicked.connect(self.find_duplicates)
+        self.duplicates_btn.setStyleSheet("color: #2563EB; border: none; font-size: 12px; font-weight: 500; background: transparent;")
+        list_header.addWidget(self.duplicates_btn)
         list_header.addWidget(self.deselect_btn)
         right_panel.addLayout(list_header)
 
-        self.scroll = QScrollArea()
-        self.scroll.setWidgetResizable(True)
-        self.scroll.setStyleSheet("QScrollArea { border: none; background: transparent; }")
-        self.scroll_content = QWidget()
-        self.file_list_layout = QVBoxLayout(self.scroll_content)
-        self.file_list_layout.setContentsMargins(0, 0, 0, 0)
-        self.file_list_layout.setSpacing(8)
-        self.scroll.setWidget(self.scroll_content)
-        right_panel.addWidget(self.scroll)
+        scan_row = QHBoxLayout()
+        self.scan_label = QLabel("")
+        self.scan_label.setStyleSheet("color: #64748B; font-size: 12px; border: none;")
+        self.scan_btn = QPushButton("Cancel")
+        self.scan_btn.setCursor(Qt.PointingHandCursor)
+        self.scan_btn.setStyleSheet("color: #2563EB; border: none; font-size: 12px; font-weight: 500; background: transparent;")
+        self.scan_btn.clicked.connect(self.toggle_scan)
+        self.scan_btn.hide()
+        scan_row.addWidget(self.scan_label)
+        scan_row.addStretch()
+        scan_row.addWidget(self.scan_btn)
+        right_panel.addLayout(scan_row)
+
+        self.file_list = QListView()
+        self.file_list.setModel(self.file_model)
+        self.file_list.setItemDelegate(FileRowDelegate(self.ICON_MAPPING, self.format_size, self.thumbnails, self.file_list))
+        self.file_list.setUniformItemSizes(True)
+        self.file_list.setMouseTracking(True)
+        self.file_list.setSelectionMode(QListView.NoSelection)
+        self.file_list.setVerticalScrollMode(QListView.ScrollPerPixel)
+        self.file_list.setStyleSheet("QListView { border: none; background: transparent; outline: none; }")
+        right_panel.addWidget(self.file_list)
 
         content.addWidget(sidebar)
         content.addLayout(right_panel, 1)
@@ -187,92 +664,215 @@ class OrganizeDownloadPage(QWidget):
         return card
 
     def load_real_data(self):
-        self.file_checkboxes = {}
-        while self.file_list_layout.count():
-            child = self.file_list_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-        try:
-            files = [f for f in os.scandir(self.downloads_path) if f.is_file()]
-            for entry in files:
-                ext = os.path.splitext(entry.name)[1].lower()
-                row, cb = self.create_file_row(entry.name, entry.stat(), ext, entry.path)
-                cb.stateChanged.connect(self.update_counters)
-                self.file_list_layout.addWidget(row)
-                self.file_checkboxes[entry.path] = cb
-            self.total_val.setText(str(len(files)))
-            self.update_counters()
-            self.file_list_layout.addStretch()
-        except Exception as e:
-            print(f"Error: {e}")
-
-    def create_file_row(self, name, stats, ext, path):
-        row = QFrame()
-        row.setStyleSheet("QFrame { background: white; border: 1px solid #F1F5F9; border-radius: 6px; }")
-        lay = QHBoxLayout(row)
-        cb = QCheckBox()
-        cb.setChecked(True)
-        icon = QLabel()
-        icon.setFixedSize(24, 24)
-        pix = QPixmap(self.ICON_MAPPING.get(ext, self.ICON_MAPPING['default']))
-        if not pix.isNull():
-            icon.setPixmap(pix.scaled(24, 24, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+        if self.scan_worker and self.scan_worker.isRunning():
+            return
+        self.scan_started = True
+        self.scan_error = None
+        self.file_model.set_entries([])
+        self.total_val.setText("0")
+        self.scan_label.setText("Scanning Downloads…")
+        self.scan_btn.setText("Cancel")
+        self.scan_btn.show()
+        self.scan_worker = DownloadsScanWorker(self.downloads_path, self.EXT_CATEGORY, self.sniffer)
+        self.scan_worker.batch_ready.connect(self.on_scan_batch)
+        self.scan_worker.progress.connect(self.on_scan_progress)
+        self.scan_worker.types_detected.connect(self.on_types_detected)
+        self.scan_worker.failed.connect(self.on_scan_failed)
+        self.scan_worker.finished.connect(self.on_scan_finished)
+        self.scan_worker.start()
+
+    def on_scan_batch(self, entries):
+        if self.sender() is not self.scan_worker:
+            return
+        self.file_model.append_entries(entries)
+        self.total_val.setText(str(self.file_model.rowCount()))
+
+    def on_scan_progress(self, count):
+        if self.sender() is not self.scan_worker:
+            return
+        self.scan_label.setText(f"Scanning Downloads… {count:,} files")
+
+    def on_types_detected(self, detected):
+        if self.sender() is not self.scan_worker:
+            return
+        changed = []
+        for path, ext in detected:
+            row = self.file_model.row_of(path)
+            if row is not None:
+                self.file_model.entries[row].apply_sniffed(ext, self.EXT_CATEGORY)
+                changed.append(path)
+        self.file_model.refresh_paths(changed)
+
+    def on_scan_failed(self, message):
+        if self.sender() is not self.scan_worker:
+            return
+        self.scan_error = message
+
+    def on_scan_finished(self):
+        worker = self.sender()
+        if worker is not self.scan_worker:
+            worker.deleteLater()
+            return
+        total = self.file_model.rowCount()
+        if self.scan_error:
+            self.scan_label.setText(f"Could not read Downloads: {self.scan_error}")
+        elif worker.isInterruptionRequested():
+            self.scan_label.setText(f"Scan cancelled • {total:,} files loaded")
         else:
-            icon.setText("📄")
-        v = QVBoxLayout()
-        v.addWidget(QLabel(name, styleSheet="font-weight: 500; font-size: 13px; color: #1E293B; border: none;"))
-        date = datetime.datetime.fromtimestamp(stats.st_mtime).strftime('%Y-%m-%d')
-        size = self.format_size(stats.st_size)
-        v.addWidget(QLabel(f"{size} • {date}", styleSheet="font-size: 11px; color: #94A3B8; border: none;"))
-        tag = QLabel(ext.replace('.', '').upper() or "FILE")
-        tag.setStyleSheet("background: #F0FDF4; color: #166534; font-size: 10px; font-weight: 700; padding: 3px 8px; border-radius: 4px; border: none;")
-        lay.addWidget(cb)
-        lay.addWidget(icon)
-        lay.addLayout(v)
-        lay.addStretch()
-        lay.addWidget(tag)
-        return row, cb
+            self.scan_label.setText(f"{total:,} files")
+        self.scan_btn.setText("Rescan")
+
+    def toggle_scan(self):
+        if self.scan_worker and self.scan_worker.isRunning():
+            self.scan_worker.cancel()
+        else:
+            self.load_real_data()
+
+    def stop_scan(self):
+        if self.scan_worker and self.scan_worker.isRunning():
+            self.scan_worker.cancel()
+            self.scan_worker.wait()
 
     def update_counters(self):
-        count = sum(1 for cb in self.file_checkboxes.values() if cb.isChecked())
+        count = self.file_model.checked_count
         self.selected_val.setText(str(count))
         self.deselect_btn.setText("Deselect All" if count > 0 else "Select All")
 
     def toggle_all(self):
-        state = not any(cb.isChecked() for cb in self.file_checkboxes.values())
-        for cb in self.file_checkboxes.values():
-            cb.setChecked(state)
+        self.file_model.set_all_checked(self.file_model.checked_count == 0)
+
+    def find_duplicates(self):
+        files = [(rec.path, rec.size, rec.dev, rec.ino) for rec in self.file_model.entries]
+        dialog = DuplicatesDialog(self.format_size, files=files, parent=self)
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+        dialog.files_removed.connect(self.on_duplicates_removed)
+        dialog.show()
+
+    def on_duplicates_removed(self, paths):
+        self.file_model.remove_paths(paths)
+        self.total_val.setText(str(self.file_model.rowCount()))
 
-    def get_dest(self, path):
+    def get_dest(self, record):
         if self.group.checkedId() == 0:
-            ext = os.path.splitext(path)[1].lower()
-            for cat, exts in self.EXT_GROUPS.items():
-                if ext in exts:
-                    return cat
-            return "Others"
-        return datetime.datetime.fromtimestamp(os.path.getmtime(path)).strftime('%Y-%m')
+            return record.category
+        return time.strftime('%Y-%m', time.localtime(record.mtime))
 
-    def preview_organization(self):
+    def plan_organization(self, records):
         plan = {}
-        for path, cb in self.file_checkboxes.items():
-            if cb.isChecked() and os.path.exists(path):
-                d = self.get_dest(path)
-                plan[d] = plan.get(d, 0) + 1
+        for rec in records:
+            plan.setdefault(self.get_dest(rec), []).append(rec)
+        return plan
+
+    def existing_names(self):
+        try:
+            with os.scandir(self.downloads_path) as it:
+                return {entry.name for entry in it}
+        except OSError:
+            return set()
+
+    def preview_organization(self):
+        plan = self.plan_organization(self.file_model.checked_records())
         if not plan:
             return QMessageBox.warning(self, "Preview", "No files selected.")
-        msg = "Summary:\n" + "\n".join([f"• {k}: {v} files" for k, v in plan.items()])
+        msg = "Summary:\n" + "\n".join([f"• {k}: {len(v)} files" for k, v in plan.items()])
         QMessageBox.information(self, "Preview", msg)
 
     def run_organization(self):
-        moved = 0
-        for path, cb in self.file_checkboxes.items():
-            if cb.isChecked() and os.path.exists(path):
-                dest_dir = os.path.join(self.downloads_path, self.get_dest(path))
-                os.makedirs(dest_dir, exist_ok=True)
-                shutil.move(path, os.path.join(dest_dir, os.path.basename(path)))
-                moved += 1
-        QMessageBox.information(self, "Success", f"Moved {moved} files.")
-        self.load_real_data()
+        if self.move_executor and self.move_executor.isRunning():
+            if self.move_interactive:
+                self.move_executor.cancel()
+                self.organize_btn.setEnabled(False)
+                self.move_status.setText("Cancelling…")
+            else:
+                self.move_status.setText("Auto-organize in progress, try again shortly…")
+                self.move_status.show()
+            return
+        present = self.existing_names()
+        records = [rec for rec in self.file_model.checked_records() if rec.name in present]
+        operations = self.plan_moves(records)
+        if not operations:
+            return QMessageBox.warning(self, "Organize", "No files selected.")
+        self.start_moves(operations, interactive=True)
+
+    def plan_moves(self, records):
+        return [(rec.path, os.path.join(self.downloads_path, dest))
+                for dest, recs in self.plan_organization(records).items() for rec in recs]
+
+    def start_moves(self, operations, interactive):
+        self.move_interactive = interactive
+        if interactive:
+            self.organize_btn.setText(" Cancel")
+            self.preview_btn.setEnabled(False)
+            self.move_progress.setRange(0, len(operations))
+            self.move_progress.setValue(0)
+            self.move_progress.show()
+        self.move_status.setText(f"Moving 0 of {len(operations):,} files…")
+        self.move_status.show()
+        self.move_executor = MoveExecutor(operations)
+        self.move_executor.progress.connect(self.on_move_progress)
+        self.move_executor.completed.connect(self.on_move_completed)
+        self.move_executor.start()
+
+    def on_move_progress(self, done, total):
+        self.move_progress.setValue(done)
+        self.move_status.setText(f"Moving {done:,} of {total:,} files…")
+
+    def on_move_completed(self, moved, failed):
+        cancelled = self.move_executor.cancel_event.is_set()
+        self.move_executor.wait()
+        self.move_executor.deleteLater()
+        self.move_executor = None
+        self.organize_btn.setText(" Organize Now")
+        self.organize_btn.setEnabled(True)
+        self.preview_btn.setEnabled(True)
+        self.move_progress.hide()
+        self.file_model.remove_paths([src for src, _ in moved])
+        self.total_val.setText(str(self.file_model.rowCount()))
+        if not self.move_interactive:
+            self.move_status.setText(f"Auto-organized {len(moved)} new file{'s' if len(moved) != 1 else ''}")
+            if failed:
+                self.move_status.setText(self.move_status.text() + f", {len(failed)} failed")
+            self.run_auto_queue()
+            return
+        self.move_status.hide()
+        msg = f"Moved {len(moved)} files."
+        if cancelled:
+            msg = f"Cancelled. {msg}"
+        if failed:
+            msg += f"\n{len(failed)} could not be moved:\n" + "\n".join(
+                f"• {os.path.basename(src)}: {err}" for src, err in failed[:10])
+            QMessageBox.warning(self, "Organize", msg)
+        else:
+            QMessageBox.information(self, "Success", msg)
+        self.run_auto_queue()
+
+    def toggle_auto_organize(self, enabled):
+        if enabled:
+            self.watcher.folder_path = self.downloads_path
+            self.watcher.start()
+        else:
+            self.watcher.stop()
+            self.auto_queue = []
+
+    def on_new_downloads(self, paths):
+        self.sniffer.detect(paths, self.EXT_CATEGORY)
+
+    def on_new_records(self, records):
+        if not self.watcher.is_running():
+            return
+        self.auto_queue.extend(records)
+        self.run_auto_queue()
+
+    def run_auto_queue(self):
+        if not self.auto_queue or (self.move_executor and self.move_executor.isRunning()):
+            return
+        records, self.auto_queue = self.auto_queue, []
+        self.start_moves(self.plan_moves(records), interactive=False)
+
+    def stop_organization(self):
+        if self.move_executor and self.move_executor.isRunning():
+            self.move_executor.cancel()
+            self.move_executor.wait()
 
     def format_size(self, b):
         for u in ['B', 'KB', 'MB', 'GB']:
@@ -0,0 +1,311 @@
+import os
+import sys
+import json
+import time
+import uuid
+import errno
+import ctypes
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from components.app_cache import cache_dir
+
+RENAME_NOREPLACE = 1
+AT_FDCWD = -100
+
+class RenamePlan:
+    def __init__(self):
+        # Each chain is an ordered list of (src, dst) steps; chains touch disjoint paths
+        self.chains = []
+        # (src, dst, reason) for requests that will not be attempted
+        self.conflicts = []
+
+    @property
+    def step_count(self):
+        return sum(len(chain) for chain in self.chains)
+
+    @property
+    def file_count(self):
+        return sum(not is_temp(dst) for chain in self.chains for _, dst in chain)
+
+def temp_name(path):
+    head, tail = os.path.split(path)
+    return os.path.join(head, f".{tail}.automate-tmp-{uuid.uuid4().hex[:8]}")
+
+def is_temp(path):
+    return ".automate-tmp-" in os.path.basename(path)
+
+def plan_renames(renames, exists=os.path.lexists):
+    # renames: iterable of (src, dst) absolute paths. Every step below is a dict/set lookup, so planning is O(n).
+    plan = RenamePlan()
+    moves = {}
+    by_target = {}
+    for src, dst in renames:
+        if src == dst:
+            continue
+        if not os.path.basename(dst) or os.path.basename(dst) in ('.', '..'):
+            plan.conflicts.append((src, dst, "Invalid name"))
+            continue
+        if dst in by_target:
+            by_target[dst].append(src)
+        else:
+            by_target[dst] = [src]
+        moves[src] = dst
+
+    blocked = {}
+    for dst, sources in by_target.items():
+        if len(sources) > 1:
+            for src in sources:
+                blocked[src] = f"{len(sources)} files would be named {os.path.basename(dst)}"
+    for src, dst in moves.items():
+        if src not in blocked and dst not in moves and exists(dst) and not same_file(src, dst):
+            blocked[src] = f"{os.path.basename(dst)} already exists"
+    # A file that stays put keeps its name occupied, so whatever was headed for that name is blocked too
+    pending = list(blocked)
+    while pending:
+        src = pending.pop()
+        for upstream in by_target.get(src, ()):
+            if upstream not in blocked:
+                blocked[upstream] = f"{os.path.basename(src)} could not be renamed first"
+                pending.append(upstream)
+    for src, reason in blocked.items():
+        plan.conflicts.append((src, moves.pop(src), reason))
+
+    incoming = {dst: src for src, dst in moves.items()}
+    visited = set()
+    for src in moves:
+        if src in incoming:
+            continue
+        # Head of an open chain a→b→c→(free): run it back to front so each target is vacated first
+        chain = []
+        node = src
+        while node in moves:
+            visited.add(node)
+            chain.append((node, moves[node]))
+            node = moves[node]
+        chain.reverse()
+        if len(chain) == 1 and exists(chain[0][1]):
+            # Case-only rename on a case-insensitive filesystem: go through a temporary name
+            tmp = temp_name(chain[0][0])
+            chain = [(chain[0][0], tmp), (tmp, chain[0][1])]
+        plan.chains.append(chain)
+    for src in moves:
+        if src in visited:
+            continue
+        # Closed cycle a→b→c→a: park a, shift the rest back to front, then unpark into a's target
+        cycle = []
+        node = src
+        while node not in visited:
+            visited.add(node)
+            cycle.append((node, moves[node]))
+            node = moves[node]
+        tmp = temp_name(src)
+        plan.chains.append([(src, tmp)] + list(reversed(cycle[1:])) + [(tmp, cycle[0][1])])
+    return plan
+
+def same_file(a, b):
+    try:
+        return os.path.samefile(a, b)
+    except OSError:
+        return False
+
+_renameat2 = None
+if sys.platform.startswith('linux'):
+    try:
+        _libc = ctypes.CDLL(None, use_errno=True)
+        _renameat2 = _libc.renameat2
+        _renameat2.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p, ctypes.c_uint]
+    except (OSError, AttributeError):
+        _renameat2 = None
+
+def rename_noreplace(src, dst):
+    # os.rename silently replaces an existing dst on POSIX; never let a rename clobber a file
+    global _renameat2
+    if _renameat2 is not None:
+        if _renameat2(AT_FDCWD, os.fsencode(src), AT_FDCWD, os.fsencode(dst), RENAME_NOREPLACE) == 0:
+            return
+        err = ctypes.get_errno()
+        if err not in (errno.EINVAL, errno.ENOSYS):
+            raise OSError(err, os.strerror(err), src, None, dst)
+        _renameat2 = None
+    if os.path.lexists(dst) and not same_file(src, dst):
+        raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), dst)
+    os.rename(src, dst)
+
+class RenameJournal:
+    # Write-ahead journal: the whole plan is written and fsynced before the first rename.
+    # Recovery walks the steps backwards and undoes those whose effect is visible on disk.
+    def __init__(self, path=None):
+        self.path = path or os.path.join(cache_dir('rename_journals'), f"{time.time():.0f}-{os.getpid()}-{uuid.uuid4().hex[:6]}.json")
+        self.completed = []
+        self.lock = threading.Lock()
+
+    def begin(self, plan):
+        tmp = self.path + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({"chains": plan.chains}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+    def record(self, src, dst):
+        with self.lock:
+            self.completed.append((src, dst))
+
+    def discard(self, steps):
+        with self.lock:
+            gone = set(steps)
+            self.completed = [step for step in self.completed if step not in gone]
+
+    def commit(self):
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    def rollback(self):
+        with self.lock:
+            steps = list(reversed(self.completed))
+            self.completed = []
+        failed = []
+        for src, dst in steps:
+            try:
+                rename_noreplace(dst, src)
+            except OSError as e:
+                failed.append((dst, str(e)))
+        if not failed:
+            self.commit()
+        return failed
+
+    @staticmethod
+    def undo_steps(chains):
+        failed = []
+        for chain in reversed(chains):
+            for src, dst in reversed(chain):
+                if os.path.lexists(dst) and not os.path.lexists(src):
+                    try:
+                        rename_noreplace(dst, src)
+                    except OSError as e:
+                        failed.append((dst, str(e)))
+        return failed
+
+def interrupted_journals():
+    # Plans a crash left half applied, as (journal path, RenamePlan); nothing is touched until the user decides
+    folder = cache_dir('rename_journals')
+    journals = []
+    for name in sorted(os.listdir(folder)):
+        path = os.path.join(folder, name)
+        if not name.endswith('.json'):
+            continue
+        try:
+            with open(path, encoding='utf-8') as f:
+                plan = RenamePlan()
+                plan.chains = json.load(f)["chains"]
+        except (OSError, ValueError, KeyError):
+            continue
+        journals.append((path, plan))
+    return journals
+
+def recover_journal(path, plan):
+    # Undo an interrupted plan; the journal stays behind while anything failed so recovery can be retried
+    failed = RenameJournal.undo_steps(plan.chains)
+    if not failed:
+        RenameJournal(path).commit()
+    return failed
+
+def execute_plan(plan, workers=8, journal=None, cancel_event=None, progress=None):
+    # Chains are independent, so they run concurrently (each rename is a round trip on network shares);
+    # steps inside a chain stay in order. Returns (renamed [(src, dst)], failed [(src, reason)]).
+    # progress(1) is called each time a file reaches its final name.
+    renamed, failed = [], [(src, reason) for src, _, reason in plan.conflicts]
+    lock = threading.Lock()
+
+    def run_chain(chain):
+        done = []
+        parked = 0
+        for i, (src, dst) in enumerate(chain):
+            if cancel_event is not None and cancel_event.is_set() and not parked:
+                # Stop only where no file is parked under a temporary name
+                return done, [(s, "Cancelled") for s, _ in chain[i:] if not is_temp(s)]
+            try:
+                rename_noreplace(src, dst)
+            except OSError as e:
+                errors = [(src, e.strerror or str(e))] if not is_temp(src) else []
+                errors += [(s, "Skipped after an earlier failure") for s, _ in chain[i + 1:] if not is_temp(s)]
+                if parked:
+                    # Never leave a half-rotated cycle behind
+                    for s, d in reversed(done):
+                        try:
+                            rename_noreplace(d, s)
+                        except OSError:
+                            pass
+                    if journal:
+                        journal.discard(done)
+                    errors += [(s, "Rolled back") for s, _ in done if not is_temp(s)]
+                    done = []
+                return done, errors
+            done.append((src, dst))
+            parked += is_temp(dst) - is_temp(src)
+            if journal:
+                journal.record(src, dst)
+            if progress and not is_temp(dst):
+                progress(1)
+        return done, []
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for fut in as_completed([pool.submit(run_chain, chain) for chain in plan.chains]):
+            done, errors = fut.result()
+            with lock:
+                renamed.extend(collapse_temps(done))
+                failed.extend(errors)
+    return renamed, failed
+
+def collapse_temps(steps):
+    # a→tmp … tmp→b reads as a→b to the caller
+    parked = {}
+    for src, dst in steps:
+        if is_temp(dst):
+            parked[dst] = src
+        elif is_temp(src):
+            yield parked.pop(src, src), dst
+        else:
+            yield src, dst
+
+class RenameExecutor(QThread):
+    progress = pyqtSignal(int, int)
+    completed = pyqtSignal(list, list)
+
+    # About one update per frame, however many renames finish in between
+    PROGRESS_INTERVAL = 1 / 30
+
+    def __init__(self, plan, journal=None):
+        super().__init__()
+        self.plan = plan
+        self.journal = journal
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        total = self.plan.file_count
+        done = 0
+        last_emit = 0.0
+        lock = threading.Lock()
+
+        def progress(n):
+            nonlocal done, last_emit
+            with lock:
+                done += n
+                now = time.monotonic()
+                if now - last_emit < self.PROGRESS_INTERVAL:
+                    return
+                last_emit = now
+                count = done
+            self.progress.emit(count, total)
+
+        renamed, failed = execute_plan(self.plan, journal=self.journal, cancel_event=self.cancel_event,
+                                       progress=progress)
+        self.progress.emit(len(renamed), total)
+        self.completed.emit(renamed, failed)
@@ -0,0 +1,152 @@
+import os
+import re
+import time
+from itertools import repeat
+
+FILTERS = {'upper': str.upper, 'lower': str.lower, 'title': str.title, 'capitalize': str.capitalize}
+KINDS = {'n', 'name', 'ext', 'parent', 'date', 'taken', 'exif', 'id3'}
+TOKEN_RE = re.compile(r'\{\{|\}\}|\{([^{}]*)\}|[{}]')
+UNSAFE = str.maketrans({'/': '-', '\\': '-', '\0': '', ':': '-'} if os.name == 'nt' else {'/': '-', '\0': ''})
+
+class TemplateError(ValueError):
+    pass
+
+class Field:
+    __slots__ = ('kind', 'arg', 'filters')
+
+    def __init__(self, spec):
+        body, *filters = spec.split('|')
+        kind, _, arg = body.partition(':')
+        kind = kind.strip()
+        if kind not in KINDS and not kind.isdigit():
+            raise TemplateError(f"Unknown field {{{kind}}}")
+        if kind in ('exif', 'id3') and not arg:
+            raise TemplateError(f"{{{kind}:…}} needs a tag name, e.g. {{exif:Model}} or {{id3:artist}}")
+        if kind == 'n' and arg and not arg.isdigit():
+            raise TemplateError("{n:…} takes a width, e.g. {n:4}")
+        for name in filters:
+            if name not in FILTERS:
+                raise TemplateError(f"Unknown transform |{name}; use " + ", ".join(FILTERS))
+        self.kind = kind
+        self.arg = arg
+        self.filters = [FILTERS[name] for name in filters]
+
+class RenameTemplate:
+    # Parsed once per pattern; rendering then works column by column over the whole listing
+    def __init__(self, pattern):
+        self.pattern = pattern
+        self.parts = []
+        pos = 0
+        for m in TOKEN_RE.finditer(pattern):
+            if m.start() > pos:
+                self.parts.append(pattern[pos:m.start()])
+            token = m.group(0)
+            if token in ('{{', '}}'):
+                self.parts.append(token[0])
+            elif m.group(1) is None:
+                raise TemplateError(f"Unmatched '{token}' (use '{token}{token}' for a literal brace)")
+            else:
+                self.parts.append(Field(m.group(1)))
+            pos = m.end()
+        if pos < len(pattern):
+            self.parts.append(pattern[pos:])
+        self.fields = [p for p in self.parts if isinstance(p, Field)]
+        kinds = {f.kind for f in self.fields}
+        self.uses_ext = 'ext' in kinds
+        self.uses_groups = any(k.isdigit() for k in kinds)
+        self.needs_stat = bool(kinds & {'date', 'taken', 'exif', 'id3'})
+        self.metadata_kinds = ({'exif'} if kinds & {'exif', 'taken'} else set()) | ({'id3'} if 'id3' in kinds else set())
+
+    def render(self, cols):
+        if not self.fields:
+            return [self.pattern.replace('{{', '{').replace('}}', '}')] * cols.count
+        columns = [repeat(part) if isinstance(part, str) else self.values(part, cols) for part in self.parts]
+        if len(columns) == 1:
+            return columns[0]
+        return [''.join(row) for row in zip(*columns)]
+
+    def values(self, field, cols):
+        kind = field.kind
+        if kind == 'n':
+            width = int(field.arg) if field.arg else cols.padding
+            values = cols.number_strings(width)
+        elif kind == 'name':
+            values = cols.stems
+        elif kind == 'ext':
+            values = [e[1:] for e in cols.exts]
+        elif kind == 'parent':
+            values = cols.parents()
+        elif kind == 'date':
+            values = [strftime(field.arg, st.st_mtime) if st else "" for st in cols.stats()]
+        elif kind == 'taken':
+            values = [taken_date(tags, st, field.arg) for tags, st in zip(cols.metadata('exif'), cols.stats())]
+        elif kind in ('exif', 'id3'):
+            values = [tags.get(field.arg, "") if tags else "" for tags in cols.metadata(kind)]
+        else:
+            group = int(kind)
+            values = [(m.group(group) or "") if m and group <= m.re.groups else "" for m in cols.matches()]
+        if kind not in ('n', 'name', 'ext'):
+            values = [v.translate(UNSAFE) for v in values]
+        for fn in field.filters:
+            values = [fn(v) for v in values]
+        return values
+
+def strftime(fmt, timestamp):
+    return time.strftime(fmt or '%Y-%m-%d', time.localtime(timestamp))
+
+def taken_date(tags, st, fmt):
+    raw = tags.get('DateTimeOriginal') or tags.get('DateTime') if tags else None
+    if raw:
+        try:
+            return time.strftime(fmt or '%Y-%m-%d', time.strptime(raw[:19], '%Y:%m:%d %H:%M:%S'))
+        except ValueError:
+            pass
+    return strftime(fmt, st.st_mtime) if st else ""
+
+class RenameColumns:
+    # Per-file inputs for one render pass; anything expensive is only computed if a field asks for it
+    def __init__(self, folder, names, stems, exts, numbers, padding, stats=None, metadata=None, regex=None,
+                 number_strings=None):
+        self.folder = folder
+        self.names = names
+        self.stems = stems
+        self.exts = exts
+        self.numbers = numbers
+        self.padding = padding
+        self.count = len(names)
+        self.stats_source = stats
+        self.metadata_cache = metadata
+        self.regex = regex
+        self.number_strings_source = number_strings
+        self._stats = None
+
+    def number_strings(self, width):
+        if self.number_strings_source:
+            return self.number_strings_source(self.numbers, width)
+        return [str(i).zfill(width) for i in self.numbers]
+
+    def paths(self):
+        join = os.path.join
+        return [join(self.folder, n) for n in self.names]
+
+    def parents(self):
+        base = os.path.basename(os.path.normpath(self.folder))
+        dirname, basename = os.path.dirname, os.path.basename
+        return [basename(dirname(n)) or base for n in self.names]
+
+    def stats(self):
+        if self._stats is None:
+            self._stats = self.stats_source() if self.stats_source else [None] * self.count
+        return self._stats
+
+    def metadata(self, kind):
+        if self.metadata_cache is None:
+            return [None] * self.count
+        get = self.metadata_cache.get
+        return [get(st, kind) if st else None for st in self.stats()]
+
+    def matches(self):
+        if self.regex is None:
+            return [None] * self.count
+        search = self.regex.search
+        return [search(s) for s in self.stems]
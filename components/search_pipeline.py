@@ -0,0 +1,233 @@
+import os
+import re
+import time
+import queue
+import fnmatch
+import sqlite3
+from PyQt5.QtCore import QObject, QThread, QTimer, pyqtSignal
+
+from components.filename_index import FilenameIndex
+
+class IndexSearchBackend:
+    def __init__(self, db_path, limit=5000):
+        self.db_path = db_path
+        self.limit = limit
+        self.index = None
+
+    def search(self, text, page_size, cancelled):
+        if self.index is None:
+            # Opened lazily so the connection belongs to the search thread
+            self.index = FilenameIndex(self.db_path)
+        try:
+            for rows in self.index.search_pages(text, page_size, self.limit):
+                if cancelled():
+                    return
+                yield rows
+        except sqlite3.OperationalError:
+            if not cancelled():
+                raise
+
+    def cancel(self):
+        if self.index:
+            self.index.interrupt()
+
+    def close(self):
+        if self.index:
+            self.index.close()
+            self.index = None
+
+class WalkSearchBackend:
+    FLUSH_INTERVAL = 0.05
+
+    def __init__(self, roots, limit=5000):
+        self.roots = roots
+        self.limit = limit
+
+    def matcher(self, text):
+        text = text.strip().lower()
+        if '*' in text or '?' in text:
+            return re.compile(fnmatch.translate(f"*{text}*"), re.IGNORECASE).match
+        terms = text.split()
+        return lambda name: all(t in name.lower() for t in terms)
+
+    def search(self, text, page_size, cancelled):
+        if not text.strip():
+            return
+        match = self.matcher(text)
+        page = []
+        found = 0
+        last_flush = time.monotonic()
+        stack = list(self.roots)
+        while stack:
+            if cancelled():
+                return
+            try:
+                with os.scandir(stack.pop()) as it:
+                    for entry in it:
+                        try:
+                            is_dir = entry.is_dir(follow_symlinks=False)
+                            if is_dir and not entry.name.startswith('.'):
+                                stack.append(entry.path)
+                            if not match(entry.name):
+                                continue
+                            st = entry.stat(follow_symlinks=False)
+                        except OSError:
+                            continue
+                        page.append((entry.path, entry.name, int(is_dir), 0 if is_dir else st.st_size, st.st_mtime))
+                        found += 1
+                        if found >= self.limit:
+                            yield page
+                            return
+            except OSError:
+                continue
+            now = time.monotonic()
+            if len(page) >= page_size or (page and now - last_flush >= self.FLUSH_INTERVAL):
+                yield page
+                page = []
+                last_flush = now
+        if page:
+            yield page
+
+    def cancel(self):
+        pass
+
+    def close(self):
+        pass
+
+class SearchWorker(QThread):
+    page_ready = pyqtSignal(int, list, float)
+    search_done = pyqtSignal(int, int, float)
+    search_failed = pyqtSignal(int, str)
+
+    PAGE_SIZE = 100
+
+    def __init__(self):
+        super().__init__()
+        self.requests = queue.Queue()
+        self.generation = 0
+        self.backend = None
+
+    def submit(self, generation, backend, text):
+        self.cancel(generation)
+        self.requests.put((generation, backend, text))
+
+    def cancel(self, generation):
+        self.generation = generation
+        if self.backend:
+            self.backend.cancel()
+
+    def stop(self):
+        self.cancel(self.generation + 1)
+        self.requests.put(None)
+        self.wait()
+
+    def run(self):
+        backends = set()
+        while True:
+            request = self.requests.get()
+            # Only the newest queued request matters
+            while request is not None and not self.requests.empty():
+                request = self.requests.get()
+            if request is None:
+                break
+            generation, backend, text = request
+            if generation != self.generation:
+                continue
+            backends.add(backend)
+            self.backend = backend
+            started = time.perf_counter()
+            total = 0
+            cancelled = lambda: generation != self.generation
+            try:
+                for rows in backend.search(text, self.PAGE_SIZE, cancelled):
+                    total += len(rows)
+                    self.page_ready.emit(generation, rows, (time.perf_counter() - started) * 1000)
+            except (OSError, sqlite3.Error) as e:
+                self.backend = None
+                if not cancelled():
+                    self.search_failed.emit(generation, str(e))
+                continue
+            self.backend = None
+            if not cancelled():
+                self.search_done.emit(generation, total, (time.perf_counter() - started) * 1000)
+        for backend in backends:
+            backend.close()
+
+class SearchPipeline(QObject):
+    results_reset = pyqtSignal()
+    page_ready = pyqtSignal(list)
+    search_done = pyqtSignal(int, float, float)
+    # error message, whether the fallback backend is now searching instead
+    search_failed = pyqtSignal(str, bool)
+
+    DEBOUNCE_MS = 150
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.backend = None
+        self.fallback = None
+        self.text = ""
+        self.generation = 0
+        self.first_page_ms = None
+        self.worker = SearchWorker()
+        self.worker.page_ready.connect(self.on_page_ready)
+        self.worker.search_done.connect(self.on_search_done)
+        self.worker.search_failed.connect(self.on_search_failed)
+        self.worker.start()
+        self.debounce = QTimer(self)
+        self.debounce.setSingleShot(True)
+        self.debounce.setInterval(self.DEBOUNCE_MS)
+        self.debounce.timeout.connect(self.dispatch)
+
+    def set_backend(self, backend, fallback=None):
+        # fallback takes over the current query if backend fails (a locked or corrupt index, say)
+        self.backend = backend
+        self.fallback = fallback
+
+    def set_text(self, text):
+        # Every keystroke invalidates whatever is running; the query itself waits for a pause in typing
+        self.text = text
+        self.generation += 1
+        self.worker.cancel(self.generation)
+        self.debounce.start()
+
+    def cancel(self):
+        self.debounce.stop()
+        self.generation += 1
+        self.worker.cancel(self.generation)
+
+    def dispatch(self):
+        if self.backend is None or not self.text.strip():
+            return
+        self.first_page_ms = None
+        self.worker.submit(self.generation, self.backend, self.text)
+
+    def on_page_ready(self, generation, rows, elapsed_ms):
+        if generation != self.generation:
+            return
+        if self.first_page_ms is None:
+            self.first_page_ms = elapsed_ms
+            self.results_reset.emit()
+        self.page_ready.emit(rows)
+
+    def on_search_done(self, generation, total, elapsed_ms):
+        if generation != self.generation:
+            return
+        if self.first_page_ms is None:
+            self.first_page_ms = elapsed_ms
+            self.results_reset.emit()
+        self.search_done.emit(total, self.first_page_ms, elapsed_ms)
+
+    def on_search_failed(self, generation, message):
+        if generation != self.generation:
+            return
+        if self.fallback is None or self.backend is self.fallback:
+            self.search_failed.emit(message, False)
+            return
+        self.backend = self.fallback
+        self.search_failed.emit(message, True)
+        self.dispatch()
+
+    def shutdown(self):
+        self.debounce.stop()
+        self.worker.stop()
@@ -0,0 +1,273 @@
+import os
+import time
+import hashlib
+import sqlite3
+import threading
+
+from components.app_cache import cache_dir
+from components.file_transfer import TransferCancelled
+
+HASH_BLOCK = 4 * 1024 * 1024
+# Backends with upload_batch() take files up to this size in batches instead of one request each
+SMALL_FILE_LIMIT = 4 * 1024 * 1024
+COMMIT_EVERY = 256
+COMMIT_INTERVAL = 2.0
+
+def content_hash(path, cancel_event=None):
+    # Dropbox's content_hash: SHA-256 over the SHA-256 of each 4 MB block, so remote metadata can be compared directly
+    overall = hashlib.sha256()
+    buf = bytearray(HASH_BLOCK)
+    view = memoryview(buf)
+    with open(path, 'rb', buffering=0) as f:
+        while True:
+            if cancel_event is not None and cancel_event.is_set():
+                raise SyncCancelled()
+            n = f.readinto(buf)
+            if not n:
+                break
+            # Fill the block completely before hashing; short reads would change the block boundaries
+            while n < HASH_BLOCK:
+                more = f.readinto(view[n:])
+                if not more:
+                    break
+                n += more
+            overall.update(hashlib.sha256(view[:n]).digest())
+    return overall.hexdigest()
+
+class SyncCancelled(Exception):
+    pass
+
+class SyncError(Exception):
+    def __init__(self, message, retry=False):
+        super().__init__(message)
+        self.retry = retry
+
+def scan_folder(root, exclude=None):
+    # Yields (relative path with '/' separators, size, mtime_ns) for every regular file; one stat per file, no reads.
+    # exclude: a directory (real path) whose subtree is skipped, e.g. a backup target inside the synced folder
+    skip_name = os.path.basename(exclude) if exclude else None
+    stack = [""]
+    while stack:
+        rel = stack.pop()
+        try:
+            with os.scandir(os.path.join(root, rel) if rel else root) as it:
+                for entry in it:
+                    try:
+                        if entry.is_file(follow_symlinks=False):
+                            st = entry.stat(follow_symlinks=False)
+                            yield (rel + "/" + entry.name if rel else entry.name), st.st_size, st.st_mtime_ns
+                        elif entry.is_dir(follow_symlinks=False):
+                            if entry.name == skip_name and os.path.realpath(entry.path) == exclude:
+                                continue
+                            stack.append(rel + "/" + entry.name if rel else entry.name)
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+def manifest_path(folder, backend_key):
+    digest = hashlib.sha1(f"{os.path.abspath(folder)}\0{backend_key}".encode('utf-8', 'surrogatepass')).hexdigest()
+    return os.path.join(cache_dir('sync_manifests'), digest[:20] + ".db")
+
+def remote_root(folder):
+    # Folder name plus a hash of its absolute path, so two "Photos" folders (or "/") never share a remote directory
+    path = os.path.abspath(folder)
+    digest = hashlib.sha1(path.encode('utf-8', 'surrogatepass')).hexdigest()[:8]
+    return f"{os.path.basename(path) or 'root'}-{digest}"
+
+class SyncManifest:
+    # What the remote side is known to hold for one local folder: path -> (size, mtime_ns, content hash)
+    def __init__(self, path):
+        self.path = path
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, size INTEGER NOT NULL, "
+                        "mtime_ns INTEGER NOT NULL, hash TEXT NOT NULL, synced_at REAL NOT NULL)")
+        self.db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self.lock = threading.Lock()
+        self.pending = 0
+        self.last_commit = time.monotonic()
+
+    def bind(self, root):
+        # Entries describe files under one remote root only; a manifest written for any other root starts over,
+        # so the delete pass can never reach files this folder didn't upload
+        with self.lock, self.db:
+            row = self.db.execute("SELECT value FROM meta WHERE key = 'remote_root'").fetchone()
+            if row and row[0] == root:
+                return
+            self.db.execute("DELETE FROM files")
+            self.db.execute("INSERT OR REPLACE INTO meta VALUES ('remote_root', ?)", (root,))
+
+    def entries(self):
+        with self.lock:
+            return {row[0]: (row[1], row[2], row[3]) for row in self.db.execute("SELECT path, size, mtime_ns, hash FROM files")}
+
+    def record(self, path, size, mtime_ns, digest):
+        with self.lock:
+            self.db.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)", (path, size, mtime_ns, digest, time.time()))
+            self.maybe_commit()
+
+    def remove(self, path):
+        with self.lock:
+            self.db.execute("DELETE FROM files WHERE path = ?", (path,))
+            self.maybe_commit()
+
+    def maybe_commit(self):
+        # Batched so a folder of small files isn't one fsync per file; an interrupted sync loses at most one batch
+        self.pending += 1
+        if self.pending >= COMMIT_EVERY or time.monotonic() - self.last_commit >= COMMIT_INTERVAL:
+            self.db.commit()
+            self.pending = 0
+            self.last_commit = time.monotonic()
+
+    def close(self):
+        with self.lock:
+            self.db.commit()
+            self.db.close()
+
+class SyncDelta:
+    def __init__(self):
+        # (path, size, mtime_ns, known hash or None)
+        self.uploads = []
+        self.deletes = []
+        self.unchanged = 0
+        self.upload_bytes = 0
+
+    def __bool__(self):
+        return bool(self.uploads or self.deletes)
+
+def compute_delta(scan, known):
+    # Pure metadata comparison: files whose size and mtime match the manifest are never opened
+    delta = SyncDelta()
+    seen = set()
+    for path, size, mtime_ns in scan:
+        seen.add(path)
+        entry = known.get(path)
+        if entry is not None and entry[0] == size and entry[1] == mtime_ns:
+            delta.unchanged += 1
+            continue
+        delta.uploads.append((path, size, mtime_ns, entry[2] if entry is not None and entry[0] == size else None))
+        delta.upload_bytes += size
+    delta.deletes = [path for path in known if path not in seen]
+    return delta
+
+class SyncResult:
+    def __init__(self):
+        self.uploaded = 0
+        self.deleted = 0
+        self.unchanged = 0
+        self.bytes = 0
+        self.failed = []
+        self.cancelled = False
+
+def sync_folder(folder, backend, manifest=None, progress=None, cancel_event=None):
+    # progress(done_bytes, total_bytes, current path)
+    own_manifest = manifest is None
+    if own_manifest:
+        manifest = SyncManifest(manifest_path(folder, backend.key))
+    result = SyncResult()
+    root = remote_root(folder)
+    try:
+        # A backend that writes to a local directory must never read its own output back in
+        target = getattr(backend, 'local_root', None)
+        if target:
+            target = os.path.realpath(target)
+            real = os.path.realpath(folder)
+            if real == target or real.startswith(target.rstrip(os.sep) + os.sep):
+                raise SyncError(f"{folder} is inside the backup folder {target}")
+        manifest.bind(root)
+        delta = compute_delta(scan_folder(folder, target), manifest.entries())
+        result.unchanged = delta.unchanged
+        done = 0
+        uploads = delta.uploads
+        if hasattr(backend, 'upload_batch'):
+            small = [u for u in uploads if u[1] <= SMALL_FILE_LIMIT]
+            uploads = [u for u in uploads if u[1] > SMALL_FILE_LIMIT]
+            done = upload_small_files(folder, root, small, backend, manifest, result, delta.upload_bytes,
+                                      progress, cancel_event)
+        for path, size, mtime_ns, known_hash in uploads:
+            if result.cancelled or (cancel_event is not None and cancel_event.is_set()):
+                result.cancelled = True
+                break
+            local = os.path.join(folder, *path.split("/"))
+            try:
+                digest = content_hash(local, cancel_event)
+                if digest != known_hash:
+                    if progress:
+                        progress(done, delta.upload_bytes, path)
+                    sent = 0
+
+                    def on_chunk(n, path=path, base=done):
+                        nonlocal sent
+                        sent += n
+                        progress(base + sent, delta.upload_bytes, path)
+
+                    backend.upload(local, f"{root}/{path}", size, on_chunk if progress else None, cancel_event)
+                    result.uploaded += 1
+                    result.bytes += size
+                # Same content with a new mtime (touched, copied back) only needs the manifest updated
+                manifest.record(path, size, mtime_ns, digest)
+            except (SyncCancelled, TransferCancelled):
+                result.cancelled = True
+                break
+            except (OSError, SyncError) as e:
+                result.failed.append((path, str(e)))
+            done += size
+        for path in delta.deletes:
+            if result.cancelled or (cancel_event is not None and cancel_event.is_set()):
+                result.cancelled = True
+                break
+            try:
+                backend.delete(f"{root}/{path}")
+                manifest.remove(path)
+                result.deleted += 1
+            except (OSError, SyncError) as e:
+                result.failed.append((path, str(e)))
+        if progress:
+            progress(done, delta.upload_bytes, "")
+    finally:
+        if own_manifest:
+            manifest.close()
+    return result
+
+def upload_small_files(folder, root, uploads, backend, manifest, result, total_bytes, progress, cancel_event):
+    pending = {}
+    done = 0
+    for path, size, mtime_ns, known_hash in uploads:
+        if cancel_event is not None and cancel_event.is_set():
+            result.cancelled = True
+            return done
+        local = os.path.join(folder, *path.split("/"))
+        try:
+            digest = content_hash(local, cancel_event)
+        except SyncCancelled:
+            result.cancelled = True
+            return done
+        except OSError as e:
+            result.failed.append((path, str(e)))
+            continue
+        if digest == known_hash:
+            manifest.record(path, size, mtime_ns, digest)
+            done += size
+        else:
+            pending[local] = (path, size, mtime_ns, digest)
+
+    def on_done(item, error):
+        nonlocal done
+        path, size, mtime_ns, digest = pending[item[0]]
+        if error is None:
+            manifest.record(path, size, mtime_ns, digest)
+            result.uploaded += 1
+            result.bytes += size
+        else:
+            result.failed.append((path, error))
+        done += size
+        if progress:
+            progress(done, total_bytes, path)
+
+    try:
+        backend.upload_batch([(local, f"{root}/{entry[0]}") for local, entry in pending.items()], on_done, cancel_event)
+    except SyncCancelled:
+        result.cancelled = True
+    return done
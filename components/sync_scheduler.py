@@ -0,0 +1,159 @@
+import time
+import itertools
+import threading
+from collections import Counter
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from components.sync_engine import sync_folder
+
+INTERACTIVE = 0
+BACKGROUND = 1
+
+class SyncJob:
+    __slots__ = ('key', 'folder', 'backend', 'provider', 'priority', 'seq', 'cancel_event')
+
+    def __init__(self, key, folder, backend, priority, seq):
+        self.key = key
+        self.folder = folder
+        self.backend = backend
+        self.provider = backend.key.split(":", 1)[0]
+        self.priority = priority
+        self.seq = seq
+        self.cancel_event = threading.Event()
+
+class SyncScheduler(QObject):
+    # A fixed set of worker threads pulls folder syncs from one queue. At most one job per folder is queued or
+    # running; interactive jobs go first, then whichever folder has waited longest, subject to per-provider limits.
+    job_started = pyqtSignal(object)
+    job_progress = pyqtSignal(object, 'qint64', 'qint64')
+    # key, SyncResult (None on error), error message
+    job_finished = pyqtSignal(object, object, str)
+
+    MAX_WORKERS = 4
+    PROVIDER_LIMITS = {'dropbox': 2, 'local': 2}
+    PROGRESS_INTERVAL_MS = 150
+    # Workers stuck in a network call are abandoned after this; they are daemon threads
+    STOP_TIMEOUT = 3.0
+
+    def __init__(self, parent=None, max_workers=None, provider_limits=None):
+        super().__init__(parent)
+        self.max_workers = max_workers or self.MAX_WORKERS
+        self.provider_limits = dict(self.PROVIDER_LIMITS, **(provider_limits or {}))
+        self.cond = threading.Condition()
+        self.queued = {}
+        self.running = {}
+        self.provider_running = Counter()
+        self.rerun = set()
+        self.seq = itertools.count()
+        self.threads = []
+        self.stopping = False
+        # Latest progress per running job; workers overwrite, the GUI thread drains it on a timer
+        self.pending_progress = {}
+        self.progress_timer = QTimer(self)
+        self.progress_timer.setInterval(self.PROGRESS_INTERVAL_MS)
+        self.progress_timer.timeout.connect(self.flush_progress)
+
+    def submit(self, key, folder, backend, priority=BACKGROUND):
+        with self.cond:
+            if self.stopping:
+                return False
+            if key in self.running:
+                # Changes made during a running sync are picked up by one follow-up run, not a queue of them
+                if priority == INTERACTIVE:
+                    self.rerun.add(key)
+                return False
+            job = self.queued.get(key)
+            if job is not None:
+                job.priority = min(job.priority, priority)
+                return False
+            self.queued[key] = SyncJob(key, folder, backend, priority, next(self.seq))
+            if len(self.threads) < self.max_workers:
+                thread = threading.Thread(target=self.work, daemon=True)
+                self.threads.append(thread)
+                thread.start()
+            self.cond.notify()
+        self.progress_timer.start()
+        return True
+
+    def cancel(self, key):
+        with self.cond:
+            self.rerun.discard(key)
+            if self.queued.pop(key, None) is not None:
+                return True
+            job = self.running.get(key)
+            if job is not None:
+                job.cancel_event.set()
+            return job is not None
+
+    def is_busy(self, key):
+        with self.cond:
+            return key in self.queued or key in self.running
+
+    def next_job(self):
+        best = None
+        for job in self.queued.values():
+            if self.provider_running[job.provider] >= self.provider_limits.get(job.provider, self.max_workers):
+                continue
+            if best is None or (job.priority, job.seq) < (best.priority, best.seq):
+                best = job
+        return best
+
+    def work(self):
+        while True:
+            with self.cond:
+                while True:
+                    if self.stopping:
+                        return
+                    job = self.next_job()
+                    if job is not None:
+                        break
+                    self.cond.wait()
+                del self.queued[job.key]
+                self.running[job.key] = job
+                self.provider_running[job.provider] += 1
+            self.job_started.emit(job.key)
+            result, error = None, ""
+            try:
+                result = sync_folder(job.folder, job.backend, cancel_event=job.cancel_event,
+                                     progress=lambda done, total, path, key=job.key: self.report(key, done, total))
+            except Exception as e:
+                # Anything, including a malformed server response, must still free the slot and settle the row
+                error = str(e) or type(e).__name__
+            finally:
+                self.release(job)
+                if not self.stopping:
+                    self.job_finished.emit(job.key, result, error)
+
+    def report(self, key, done, total):
+        self.pending_progress[key] = (done, total)
+
+    def release(self, job):
+        with self.cond:
+            del self.running[job.key]
+            self.provider_running[job.provider] -= 1
+            self.pending_progress.pop(job.key, None)
+            if job.key in self.rerun and not self.stopping:
+                self.rerun.discard(job.key)
+                self.queued[job.key] = SyncJob(job.key, job.folder, job.backend, INTERACTIVE, next(self.seq))
+            self.cond.notify_all()
+
+    def flush_progress(self):
+        with self.cond:
+            updates = [(key, value) for key, value in self.pending_progress.items() if key in self.running]
+            self.pending_progress.clear()
+            idle = not self.queued and not self.running
+        for key, (done, total) in updates:
+            self.job_progress.emit(key, done, total)
+        if idle:
+            self.progress_timer.stop()
+
+    def stop(self):
+        with self.cond:
+            self.stopping = True
+            self.queued.clear()
+            for job in self.running.values():
+                job.cancel_event.set()
+            self.cond.notify_all()
+        deadline = time.monotonic() + self.STOP_TIMEOUT
+        for thread in self.threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
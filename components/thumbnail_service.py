@@ -0,0 +1,231 @@
+import os
+import hashlib
+import shutil
+import subprocess
+import threading
+import multiprocessing
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from PyQt5.QtCore import Qt, QObject, QThread, QTimer, pyqtSignal
+from PyQt5.QtGui import QImage, QImageReader, QPixmap
+
+from components.app_cache import cache_dir
+
+THUMB_SIZE = 128
+SOFTWARE = "AutoMate"
+VIDEO_EXTS = {'.mp4', '.mov', '.avi', '.mkv', '.webm', '.m4v'}
+IMAGE_EXTS = {'.' + bytes(f).decode() for f in QImageReader.supportedImageFormats()}
+FFMPEG = shutil.which('ffmpeg')
+
+def thumbnail_path(path):
+    # Same naming as the freedesktop thumbnail spec: md5 of the file URI, one PNG per size bucket
+    uri = Path(os.path.abspath(path)).as_uri()
+    return os.path.join(cache_dir('thumbnails', 'normal'), hashlib.md5(uri.encode()).hexdigest() + '.png')
+
+def failure_path(path):
+    return os.path.join(cache_dir('thumbnails', 'fail', SOFTWARE.lower()), os.path.basename(thumbnail_path(path)))
+
+def can_thumbnail(path):
+    ext = os.path.splitext(path)[1].lower()
+    return ext in IMAGE_EXTS or (ext in VIDEO_EXTS and FFMPEG is not None)
+
+def read_cached(path, mtime):
+    for candidate in (thumbnail_path(path), failure_path(path)):
+        image = QImage(candidate)
+        if not image.isNull() and image.text('Thumb::MTime') == str(int(mtime)):
+            return image, candidate != thumbnail_path(path)
+    return None, False
+
+def decode_video_frame(path):
+    try:
+        out = subprocess.run([FFMPEG or 'ffmpeg', '-v', 'quiet', '-ss', '1', '-i', path, '-frames:v', '1',
+                              '-vf', f'scale={THUMB_SIZE}:-2', '-f', 'image2pipe', '-vcodec', 'png', '-'],
+                             capture_output=True, timeout=20).stdout
+    except (OSError, subprocess.TimeoutExpired):
+        return QImage()
+    return QImage.fromData(out, 'PNG')
+
+def render_thumbnail(path, mtime):
+    # Runs in a pool process; writes the PNG (or a failure marker) and returns where it went
+    if os.path.splitext(path)[1].lower() in VIDEO_EXTS:
+        image = decode_video_frame(path)
+    else:
+        reader = QImageReader(path)
+        reader.setAutoTransform(True)
+        size = reader.size()
+        if size.isValid() and (size.width() > THUMB_SIZE or size.height() > THUMB_SIZE):
+            # Lets JPEG decode at a reduced scale instead of decoding full size and shrinking
+            reader.setScaledSize(size.scaled(THUMB_SIZE, THUMB_SIZE, Qt.KeepAspectRatio))
+        image = reader.read()
+    failed = image.isNull()
+    if failed:
+        image = QImage(1, 1, QImage.Format_ARGB32)
+        image.fill(0)
+    elif image.width() > THUMB_SIZE or image.height() > THUMB_SIZE:
+        image = image.scaled(THUMB_SIZE, THUMB_SIZE, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    image.setText('Thumb::URI', Path(os.path.abspath(path)).as_uri())
+    image.setText('Thumb::MTime', str(int(mtime)))
+    image.setText('Software', SOFTWARE)
+    target = failure_path(path) if failed else thumbnail_path(path)
+    tmp = f"{target}.{os.getpid()}.tmp"
+    if image.save(tmp, 'PNG'):
+        os.replace(tmp, target)
+    return None if failed else target
+
+class ThumbnailLoader(QThread):
+    # A null image means the file could not be thumbnailed
+    loaded = pyqtSignal(str, float, QImage)
+
+    MAX_PENDING = 256
+
+    def __init__(self, workers):
+        super().__init__()
+        self.workers = workers
+        self.pool = None
+        # Requests that were in flight when a pool died; each is retried alone to find the file that crashed it
+        self.suspects = deque()
+        self.suspected = set()
+        self.pending = OrderedDict()
+        self.cond = threading.Condition()
+        self.stopping = False
+
+    def request(self, path, mtime):
+        with self.cond:
+            self.pending[path] = mtime
+            self.pending.move_to_end(path)
+            # Rows scrolled past long ago are not worth decoding any more
+            while len(self.pending) > self.MAX_PENDING:
+                self.pending.popitem(last=False)
+            self.cond.notify()
+
+    def stop(self):
+        with self.cond:
+            self.stopping = True
+            self.pending.clear()
+            self.cond.notify()
+        self.wait()
+
+    def next_request(self, block):
+        with self.cond:
+            while block and not self.pending and not self.stopping:
+                self.cond.wait()
+            if self.stopping or not self.pending:
+                return None
+            # Newest first: whatever is on screen now
+            return self.pending.popitem(last=True)
+
+    def run(self):
+        in_flight = {}
+        try:
+            while True:
+                if self.stopping:
+                    return
+                isolating = any(key in self.suspected for key in in_flight.values())
+                if isolating or len(in_flight) >= 2 * self.workers or (self.suspects and in_flight):
+                    self.collect(in_flight)
+                    continue
+                if self.suspects:
+                    self.submit(in_flight, *self.suspects.popleft())
+                    continue
+                request = self.next_request(block=not in_flight)
+                if self.stopping:
+                    return
+                if request is None:
+                    self.collect(in_flight)
+                    continue
+                path, mtime = request
+                if (path, mtime) in in_flight.values():
+                    continue
+                image, failed = read_cached(path, mtime)
+                if image is not None:
+                    self.loaded.emit(path, mtime, QImage() if failed else image)
+                    continue
+                self.submit(in_flight, path, mtime)
+        finally:
+            self.reset_pool()
+
+    def submit(self, in_flight, path, mtime):
+        for _ in range(2):
+            if self.pool is None:
+                self.pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'))
+            try:
+                in_flight[self.pool.submit(render_thumbnail, path, mtime)] = (path, mtime)
+                return
+            except BrokenProcessPool:
+                # A decoder crashed on some file; retry this request on a fresh pool
+                self.reset_pool()
+
+    def reset_pool(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+
+    def collect(self, in_flight):
+        done, _ = wait(in_flight, timeout=0.05, return_when=FIRST_COMPLETED)
+        for fut in done:
+            path, mtime = in_flight.pop(fut)
+            try:
+                target = fut.result()
+            except BrokenProcessPool:
+                # Every request in flight fails with the pool, not just the file that crashed it. Each one is
+                # retried alone on a new pool (submit replaces the broken one); a file that crashes it alone failed.
+                if (path, mtime) not in self.suspected:
+                    self.suspected.add((path, mtime))
+                    self.suspects.append((path, mtime))
+                    continue
+                target = None
+            except Exception:
+                target = None
+            self.suspected.discard((path, mtime))
+            self.loaded.emit(path, mtime, QImage(target) if target else QImage())
+
+class ThumbnailService(QObject):
+    thumbnails_ready = pyqtSignal()
+
+    MEMORY_ITEMS = 600
+    NOTIFY_MS = 30
+
+    def __init__(self, display_size, parent=None, workers=None):
+        super().__init__(parent)
+        self.display_size = display_size
+        self.pixmaps = OrderedDict()
+        self.failed = set()
+        self.loader = ThumbnailLoader(workers or max(1, min(4, (os.cpu_count() or 2) - 1)))
+        self.loader.loaded.connect(self.on_loaded)
+        self.loader.start()
+        # Coalesce a burst of finished thumbnails into one repaint
+        self.notify_timer = QTimer(self)
+        self.notify_timer.setSingleShot(True)
+        self.notify_timer.setInterval(self.NOTIFY_MS)
+        self.notify_timer.timeout.connect(self.thumbnails_ready)
+
+    def thumbnail(self, path, mtime):
+        # Called from paint code: never blocks, returns None until the loader has something
+        key = (path, int(mtime))
+        pix = self.pixmaps.get(key)
+        if pix is not None:
+            self.pixmaps.move_to_end(key)
+            return pix
+        if key not in self.failed and can_thumbnail(path):
+            # Repeated paints re-request, which keeps rows that are still visible at the front of the queue
+            self.loader.request(path, mtime)
+        return None
+
+    def on_loaded(self, path, mtime, image):
+        key = (path, int(mtime))
+        if image.isNull():
+            self.failed.add(key)
+            return
+        # Scale once here so paint only ever blits
+        self.pixmaps[key] = QPixmap.fromImage(image.scaled(self.display_size, self.display_size,
+                                                           Qt.KeepAspectRatio, Qt.SmoothTransformation))
+        while len(self.pixmaps) > self.MEMORY_ITEMS:
+            self.pixmaps.popitem(last=False)
+        if not self.notify_timer.isActive():
+            self.notify_timer.start()
+
+    def shutdown(self):
+        self.notify_timer.stop()
+        self.loader.stop()
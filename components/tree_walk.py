@@ -0,0 +1,74 @@
+import os
+import re
+import time
+import fnmatch
+from PyQt5.QtCore import QThread, pyqtSignal
+
+def compile_globs(text):
+    # "*.jpg; *.png" -> one case-insensitive matcher, or None when nothing was entered
+    patterns = [p.strip() for p in re.split(r'[;,]', text) if p.strip()]
+    if not patterns:
+        return None
+    return re.compile('|'.join(fnmatch.translate(p) for p in patterns), re.IGNORECASE).match
+
+def walk_files(root, recursive=True, include=None, exclude=None):
+    # Yields (relative folder, sorted file names) one folder at a time, depth first in name order.
+    # include is matched against file names; exclude against names and relative paths of files and folders.
+    stack = [""]
+    while stack:
+        rel = stack.pop()
+        files, dirs = [], []
+        try:
+            with os.scandir(os.path.join(root, rel) if rel else root) as it:
+                for entry in it:
+                    try:
+                        if entry.is_file():
+                            files.append(entry.name)
+                        elif recursive and entry.is_dir(follow_symlinks=False):
+                            dirs.append(entry.name)
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+        prefix = rel + os.sep if rel else ""
+        if include:
+            files = [f for f in files if include(f)]
+        if exclude:
+            files = [f for f in files if not (exclude(f) or exclude(prefix + f))]
+            dirs = [d for d in dirs if not (exclude(d) or exclude(prefix + d))]
+        files.sort(key=str.lower)
+        yield rel, files
+        dirs.sort(key=str.lower, reverse=True)
+        stack.extend(prefix + d for d in dirs)
+
+class TreeWalkWorker(QThread):
+    # relative paths, and each file's position within its own folder
+    batch_ready = pyqtSignal(list, list)
+
+    BATCH_SIZE = 2000
+    FLUSH_INTERVAL = 0.1
+
+    def __init__(self, root, include=None, exclude=None, parent=None):
+        super().__init__(parent)
+        self.root = root
+        self.include = include
+        self.exclude = exclude
+
+    def run(self):
+        names, positions = [], []
+        last_flush = time.monotonic()
+        for rel, files in walk_files(self.root, True, self.include, self.exclude):
+            if self.isInterruptionRequested():
+                return
+            if rel:
+                prefix = rel + os.sep
+                names.extend(prefix + f for f in files)
+            else:
+                names.extend(files)
+            positions.extend(range(len(files)))
+            if len(names) >= self.BATCH_SIZE or (names and time.monotonic() - last_flush >= self.FLUSH_INTERVAL):
+                self.batch_ready.emit(names, positions)
+                names, positions = [], []
+                last_flush = time.monotonic()
+        if names:
+            self.batch_ready.emit(names, positions)
@@ -0,0 +1,87 @@
+import os
+import sqlite3
+import threading
+
+from components.app_cache import cache_path
+
+HEAD_SIZE = 512
+
+SIGNATURES = [
+    (0, b'%PDF-', '.pdf'),
+    (0, b'\x89PNG\r\n\x1a\n', '.png'),
+    (0, b'\xff\xd8\xff', '.jpg'),
+    (0, b'GIF87a', '.gif'),
+    (0, b'GIF89a', '.gif'),
+    (0, b'ID3', '.mp3'),
+    (0, b'fLaC', '.flac'),
+    (0, b'\x1aE\xdf\xa3', '.mkv'),
+    (0, b'Rar!\x1a\x07', '.rar'),
+    (0, b"7z\xbc\xaf'\x1c", '.7z'),
+    (0, b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1', '.doc'),
+    (257, b'ustar', '.tar'),
+]
+
+FTYP_BRANDS = {b'qt  ': '.mov', b'M4A ': '.m4a', b'M4B ': '.m4b', b'heic': '.heic', b'avif': '.avif'}
+
+OOXML_PARTS = [(b'word/', '.docx'), (b'xl/', '.xlsx'), (b'ppt/', '.pptx')]
+
+def sniff_bytes(head):
+    for offset, magic, ext in SIGNATURES:
+        if head[offset:offset + len(magic)] == magic:
+            return ext
+    if head[:4] == b'RIFF':
+        return {b'WAVE': '.wav', b'AVI ': '.avi'}.get(head[8:12])
+    if head[4:8] == b'ftyp':
+        return FTYP_BRANDS.get(head[8:12], '.mp4')
+    if head[:2] in (b'\xff\xfb', b'\xff\xf3', b'\xff\xf2'):
+        return '.mp3'
+    if head[:2] == b'BM' and len(head) >= 14 and head[6:10] == b'\0\0\0\0':
+        return '.bmp'
+    if head[:4] == b'PK\x03\x04':
+        # Office documents are zips; the first entries usually name their part folder
+        for marker, ext in OOXML_PARTS:
+            if marker in head:
+                return ext
+        return '.zip'
+    text = head.lstrip()[:256].lower()
+    if text.startswith(b'<!doctype html') or text.startswith(b'<html'):
+        return '.html'
+    if text.startswith(b'<svg') or (text.startswith(b'<?xml') and b'<svg' in text):
+        return '.svg'
+    if text.startswith(b'#!') and b'python' in text.split(b'\n', 1)[0]:
+        return '.py'
+    return None
+
+def sniff_file(path):
+    with open(path, 'rb') as f:
+        return sniff_bytes(f.read(HEAD_SIZE))
+
+class SignatureCache:
+    MISS = object()
+
+    def __init__(self, path=None):
+        self.conn = sqlite3.connect(path or cache_path('signatures.sqlite3'), check_same_thread=False)
+        self.lock = threading.Lock()
+        self.conn.execute("""CREATE TABLE IF NOT EXISTS signatures (
+            dev INTEGER, ino INTEGER, size INTEGER, mtime REAL, ext TEXT,
+            PRIMARY KEY (dev, ino))""")
+        self.conn.commit()
+
+    def get(self, dev, ino, size, mtime):
+        with self.lock:
+            row = self.conn.execute("SELECT size, mtime, ext FROM signatures WHERE dev = ? AND ino = ?",
+                                    (dev, ino)).fetchone()
+        if row is None or row[0] != size or row[1] != mtime:
+            return self.MISS
+        # An empty string records "sniffed, nothing recognised"
+        return row[2] or None
+
+    def put_many(self, rows):
+        with self.lock:
+            self.conn.executemany("INSERT OR REPLACE INTO signatures VALUES (?, ?, ?, ?, ?)",
+                                  [(dev, ino, size, mtime, ext or '') for dev, ino, size, mtime, ext in rows])
+            self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
@@ -6,7 +6,7 @@ from PyQt5.QtCore import Qt, QPropertyAnimation, QEasingCurve, QSize, QPoint
 from PyQt5.QtGui import QIcon, QPixmap, QFontDatabase, QFont
 
 from components.batch_rename_page import BatchRenameUI
-from components.cloud_sync_page import CloudSyncUI
+from components.cloud_sync_page import CloudSyncEngine
 from components.dashboard_page import DashboardPage
 from components.files_browser_page import FileBrowserUI
 from components.organize_download_page import OrganizeDownloadPage
@@ -48,7 +48,7 @@ class AutoMateUI(QWidget):
         self.stack.addWidget(OrganizeDownloadPage())
         self.batch_rename_page = BatchRenameUI()
         self.stack.addWidget(self.batch_rename_page)
-        self.stack.addWidget(CloudSyncUI())
+        self.stack.addWidget(CloudSyncEngine())
         
         self.content_layout.addWidget(self.stack)
         self.main_layout.addWidget(self.content_container)
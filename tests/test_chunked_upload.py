@@ -0,0 +1,117 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+import uuid
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from components.chunked_upload import ChunkedUploader, UploadSessionStore
+from components.cloud_backends import DropboxService, DropboxError
+
+CHUNK = 64 * 1024
+
+class FakeDropbox:
+    # Just enough of the upload-session API; like the real one, a closed session rejects further appends
+    def __init__(self):
+        self.sessions = {}
+        self.files = {}
+        self.appends = 0
+        self.fail_after = None
+        self.lock = threading.Lock()
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def reply(self, status, payload):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                data = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                arg = json.loads(self.headers.get('Dropbox-API-Arg') or data or b'{}')
+                path = self.path.split('/2', 1)[1]
+                if path == '/files/upload_session/start':
+                    session_id = uuid.uuid4().hex
+                    fake.sessions[session_id] = {'chunks': {}, 'closed': False}
+                    return self.reply(200, {'session_id': session_id})
+                if path == '/files/upload_session/append_v2':
+                    # Bigger chunks take longer, so a small final chunk overtakes the others unless the client waits
+                    time.sleep(0.02 * len(data) / CHUNK)
+                    with fake.lock:
+                        fake.appends += 1
+                        if fake.fail_after is not None and fake.appends > fake.fail_after:
+                            return self.reply(409, {'error_summary': 'internal_failure/'})
+                        session = fake.sessions.get(arg['cursor']['session_id'])
+                        if session is None:
+                            return self.reply(409, {'error_summary': 'lookup_failed/not_found/'})
+                        if session['closed']:
+                            return self.reply(409, {'error_summary': 'lookup_failed/closed/'})
+                        session['chunks'][arg['cursor']['offset']] = data
+                        session['closed'] = arg.get('close', False)
+                    return self.reply(200, None)
+                if path == '/files/upload_session/finish':
+                    session = fake.sessions.pop(arg['cursor']['session_id'])
+                    fake.files[arg['commit']['path']] = b''.join(session['chunks'][k] for k in sorted(session['chunks']))
+                    return self.reply(200, {'path_display': arg['commit']['path']})
+                self.reply(404, {'error_summary': 'unknown'})
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/2"
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+class ChunkedUploadTest(unittest.TestCase):
+    def setUp(self):
+        self.fake = FakeDropbox()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.api = DropboxService("test-token", content_url=self.fake.url, api_url=self.fake.url)
+        self.store = UploadSessionStore(self.tmp.name)
+        self.uploader = ChunkedUploader(self.api, CHUNK, workers=4, store=self.store)
+        self.local = os.path.join(self.tmp.name, 'video.bin')
+        self.data = os.urandom(CHUNK * 10 + 123)
+        with open(self.local, 'wb') as f:
+            f.write(self.data)
+
+    def tearDown(self):
+        self.uploader.shutdown()
+        self.fake.close()
+        self.tmp.cleanup()
+
+    def upload(self):
+        st = os.stat(self.local)
+        return self.uploader.upload(self.local, 'video.bin', st.st_size, st.st_mtime_ns, 'video', None, None)
+
+    def test_parallel_upload_closes_session_last(self):
+        self.upload()
+        self.assertEqual(self.fake.files['/AutoMate/video.bin'], self.data)
+        self.assertEqual(self.fake.appends, 11)
+        self.assertIsNone(self.store.load('video'))
+
+    def test_interrupted_upload_resumes_from_acknowledged_chunks(self):
+        self.fake.fail_after = 4
+        with self.assertRaises(DropboxError):
+            self.upload()
+        acked = len(self.store.load('video')['acked'])
+        self.assertGreaterEqual(acked, 1)
+        self.fake.fail_after = None
+        self.fake.appends = 0
+        self.upload()
+        self.assertEqual(self.fake.files['/AutoMate/video.bin'], self.data)
+        self.assertEqual(self.fake.appends, 11 - acked)
+
+if __name__ == '__main__':
+    unittest.main()